@@ -1,8 +1,12 @@
 import json
+from player_stream import iter_players, read_value
 
 # Load the existing all players
-with open('./all_players.json', 'r', encoding='utf-8') as f:
-    all_players = json.load(f)
+all_players = {"players": dict(iter_players('./all_players.json'))}
+for key in ("valid_team_ids", "date"):
+    value = read_value('./all_players.json', key)
+    if value is not None:
+        all_players[key] = value
 
 # Kiel players data
 kiel_players = [
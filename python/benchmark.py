@@ -0,0 +1,370 @@
+"""
+Offline benchmark suite for the data-processing pipeline.
+
+Runs every stage against the checked-in data (detailed_players.json and
+pointsAnalysis/data/player_7226) at scale 1, and against synthetic leagues
+from synthetic_data.py at larger scales: `scale` times as many players as
+the checked-in file, and `scale` players with their own generated events
+for the event stages. Synthetic inputs are generated once per scale and
+cached under synthetic/benchmark/. No network access is needed. Each stage
+records its median wall time over --repeat runs (short stages are looped so
+one run lasts at least MIN_RUN_SECONDS) and its peak traced memory
+(tracemalloc, in a separate run).
+
+Wall times depend on the machine, so every run is paired with a fixed
+reference workload timed right before it, and the median of those ratios is
+the stage's relative time; their spread is its noise. benchmark_baselines.json
+keeps relative times, noise and peak memory. Stages more than --threshold plus
+their noise slower (relative), or more than --threshold larger, than their
+baseline are flagged, but only with at least MIN_REPEAT timed runs; fewer are
+too noisy to compare.
+
+Usage:
+    python benchmark.py                           # compare with the baselines
+    python benchmark.py --scales 1,10 --repeat 9
+    python benchmark.py --save-baseline           # record new baselines
+    python benchmark.py --fail-on-regression      # exit 1 on a regression (CI)
+"""
+
+import argparse
+import contextlib
+import gc
+import glob
+import hashlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import synthetic_data
+from player_stream import read_player_ids
+from process_players import process_players_data
+from pointsAnalysis import data_storage
+from pointsAnalysis.analysis import analyze_days_range
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PLAYERS_FILE = os.path.join(BASE_DIR, 'detailed_players.json')
+EVENTS_DIR = os.path.join(BASE_DIR, 'pointsAnalysis', 'data', 'player_7226')
+BASELINE_FILE = os.path.join(BASE_DIR, 'benchmark_baselines.json')
+SYNTHETIC_CACHE_DIR = os.path.join(synthetic_data.DEFAULT_OUTPUT_DIR, 'benchmark')
+DEFAULT_SCALES = (1, 10, 100)
+DEFAULT_THRESHOLD = 0.25  # 25% slower or larger than the baseline counts as a regression
+MIN_REPEAT = 5  # timed runs needed before results are compared or saved
+MIN_RUN_SECONDS = 0.2  # short stages are looped until one timed run lasts this long
+SEASON_DAYS = 34
+
+
+def load_event_days(events_dir=EVENTS_DIR):
+    """Player 7226's days in the all_days shape, from the per-day JSON files."""
+    days = {}
+    for filename in os.listdir(events_dir):
+        if filename.startswith('day_') and filename.endswith('.json'):
+            with open(os.path.join(events_dir, filename), 'r', encoding='utf-8') as f:
+                days[filename[len('day_'):-len('.json')]] = json.load(f)
+    return {'days': days}
+
+
+def _generator_version():
+    """Short hash of synthetic_data.py, so cached inputs are rebuilt when the generator changes."""
+    with open(synthetic_data.__file__, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:8]
+
+
+def synthetic_inputs(players, event_players, seed=0):
+    """A synthetic league of `players` and the events of `event_players` more, generated once.
+
+    Args:
+        players (int): Players in the generated detailed_players.json
+        event_players (int): Players whose matchday payloads are generated
+        seed (int): Generator seed
+
+    Returns:
+        tuple: (path of detailed_players.json, {player_id: {"days": {day: payload}}})
+    """
+    cache_dir = os.path.join(SYNTHETIC_CACHE_DIR,
+                             f"{players}p_{event_players}e_seed{seed}_{_generator_version()}")
+    players_dir = os.path.join(cache_dir, 'players')
+    events_dir = os.path.join(cache_dir, 'events')
+    complete_marker = os.path.join(cache_dir, 'complete')
+    if not os.path.exists(complete_marker):
+        print(f"  generating synthetic inputs in {cache_dir} ...", file=sys.stderr)
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        synthetic_data.generate(players, SEASON_DAYS, 1, players_dir, events='none', seed=seed)
+        synthetic_data.generate(event_players, SEASON_DAYS, 1, events_dir, events='json', seed=seed + 1)
+        open(complete_marker, 'w').close()
+
+    event_days = {}
+    for path in sorted(glob.glob(os.path.join(events_dir, 'season_1', 'events', 'player_*', 'day_*.json'))):
+        player_id = os.path.basename(os.path.dirname(path))[len('player_'):]
+        day = os.path.basename(path)[len('day_'):-len('.json')]
+        with open(path, 'r', encoding='utf-8') as f:
+            event_days.setdefault(player_id, {'days': {}})['days'][day] = json.load(f)
+    return os.path.join(players_dir, 'season_1', 'detailed_players.json'), event_days
+
+
+class Workload:
+    """Input files and data for one scale; outputs and the event store go to a scratch directory.
+
+    Scale 1 uses the checked-in data; larger scales use synthetic_inputs().
+    """
+
+    def __init__(self, scale, work_dir, seed=0):
+        self.scale = scale
+        self.work_dir = work_dir
+        if scale == 1:
+            self.players_file = PLAYERS_FILE
+            self.event_days = {'7226': load_event_days()}
+        else:
+            self.players_file, self.event_days = synthetic_inputs(
+                len(read_player_ids(PLAYERS_FILE)) * scale, scale, seed)
+        with open(self.players_file, 'r', encoding='utf-8') as f:
+            self.players = json.load(f)['players']
+        self.event_player_ids = sorted(self.event_days)
+        self.event_records = [(player_id, int(day), data)
+                              for player_id in self.event_player_ids
+                              for day, data in self.event_days[player_id]['days'].items()]
+        self.output_dir = os.path.join(work_dir, 'out')
+        os.makedirs(self.output_dir, exist_ok=True)
+        data_storage.set_database_path(os.path.join(work_dir, 'events.sqlite'))
+        data_storage.save_player_events_batch(self.event_records)
+
+
+def _stage_json_load(workload):
+    with open(workload.players_file, 'r', encoding='utf-8') as f:
+        json.load(f)
+
+
+def _stage_json_save(workload):
+    path = os.path.join(workload.output_dir, 'saved.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'players': workload.players}, f, ensure_ascii=False, indent=2)
+
+
+def _stage_stream_ids(workload):
+    read_player_ids(workload.players_file)
+
+
+def _stage_process_players(workload):
+    process_players_data(workload.players_file, workload.output_dir)
+
+
+def _stage_analyze_days_range(workload):
+    for player_id in workload.event_player_ids:
+        analyze_days_range(workload.event_days[player_id], 1, SEASON_DAYS)
+
+
+def _stage_save_events(workload):
+    data_storage.save_player_events_batch(workload.event_records)
+
+
+def _stage_aggregate_player_stats(workload):
+    for player_id in workload.event_player_ids:
+        data_storage.aggregate_player_stats(player_id, 1, SEASON_DAYS)
+
+
+STAGES = {
+    'json_load': _stage_json_load,
+    'json_save': _stage_json_save,
+    'stream_ids': _stage_stream_ids,
+    'process_players': _stage_process_players,
+    'analyze_days_range': _stage_analyze_days_range,
+    'save_events': _stage_save_events,
+    'aggregate_player_stats': _stage_aggregate_player_stats,
+}
+
+
+def _loops_per_run(function):
+    """Calls per timed run so that one run lasts at least MIN_RUN_SECONDS (like timeit's autorange)."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        if time.perf_counter() - start >= MIN_RUN_SECONDS:
+            return loops
+        loops *= 2
+
+
+def _time_per_call(function, loops):
+    gc.collect()
+    start = time.perf_counter()
+    for _ in range(loops):
+        function()
+    return (time.perf_counter() - start) / loops
+
+
+def _reference_workload():
+    """Fixed mix of JSON round trips, sorting and dict work, used as the unit of time."""
+    records = [{'i': str(index), 'p': index % 97, 'n': f"player {index}"} for index in range(20_000)]
+    decoded = json.loads(json.dumps(records))
+    decoded.sort(key=lambda record: (record['p'], record['i']))
+    return {record['i']: record['n'] for record in decoded}
+
+
+def _paired_times(function, repeat):
+    """(seconds per call, reference seconds per call) for each of `repeat` runs.
+
+    The reference workload is timed right before every run, so a machine that
+    slows down or speeds up during the benchmark moves both halves of a pair.
+    """
+    loops = _loops_per_run(function)
+    reference_loops = _loops_per_run(_reference_workload)
+    pairs = []
+    for _ in range(repeat):
+        reference = _time_per_call(_reference_workload, reference_loops)
+        pairs.append((_time_per_call(function, loops), reference))
+    return pairs
+
+
+def _noise(values):
+    """Interquartile range of `values` as a fraction of their median (0 for a single value)."""
+    if len(values) < 2:
+        return 0.0
+    lower, _, upper = statistics.quantiles(values, n=4)
+    return (upper - lower) / statistics.median(values)
+
+
+def measure(stage, workload, repeat):
+    """Median wall and relative time over `repeat` runs and peak traced memory of one extra run."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        return _measure(stage, workload, repeat)
+
+
+def _measure(stage, workload, repeat):
+    pairs = _paired_times(lambda: stage(workload), repeat)
+    ratios = [seconds / reference for seconds, reference in pairs]
+
+    gc.collect()
+    tracemalloc.start()
+    stage(workload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'seconds': round(statistics.median(seconds for seconds, _ in pairs), 5),
+            'relative': round(statistics.median(ratios), 4), 'noise': round(_noise(ratios), 3),
+            'peak_mb': round(peak / 1e6, 3), 'repeat': repeat}
+
+
+def run_benchmarks(scales=DEFAULT_SCALES, stages=None, repeat=MIN_REPEAT, seed=0):
+    """Runs the selected stages at every scale.
+
+    Returns:
+        dict: {"<stage>@<scale>x": {"seconds", "relative", "noise", "peak_mb", "repeat"}}, where
+        relative is the median of each run's time divided by the reference workload timed just
+        before it, and noise is the interquartile range of those ratios over their median
+    """
+    results = {}
+    for scale in scales:
+        work_dir = tempfile.mkdtemp(prefix=f'benchmark_{scale}x_')
+        try:
+            workload = Workload(scale, work_dir, seed)
+            for name in stages or STAGES:
+                key = f"{name}@{scale}x"
+                results[key] = measure(STAGES[name], workload, repeat)
+                print(f"  {key}: {results[key]}", file=sys.stderr)
+        finally:
+            data_storage.set_database_path()
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def compare(results, baselines, threshold=DEFAULT_THRESHOLD):
+    """Rows of (key, result, baseline, time ratio, memory ratio, regressed).
+
+    The time ratio compares relative times, so baselines from another machine
+    still apply. A time ratio only counts as a regression above
+    1 + threshold + the larger noise of the result and the baseline, so a
+    stage whose runs already spread widely needs a bigger slowdown to be
+    flagged. Results with fewer than MIN_REPEAT timed runs are never flagged.
+    """
+    rows = []
+    for key, result in results.items():
+        baseline = baselines.get(key)
+        if baseline is None:
+            rows.append((key, result, None, None, None, False))
+            continue
+        time_ratio = result['relative'] / baseline['relative'] if baseline['relative'] else None
+        memory_ratio = result['peak_mb'] / baseline['peak_mb'] if baseline['peak_mb'] else None
+        time_limit = 1 + threshold + max(result.get('noise', 0), baseline.get('noise', 0))
+        regressed = result['repeat'] >= MIN_REPEAT and (
+            (time_ratio is not None and time_ratio > time_limit)
+            or (memory_ratio is not None and memory_ratio > 1 + threshold))
+        rows.append((key, result, baseline, time_ratio, memory_ratio, regressed))
+    return rows
+
+
+def load_baselines(path=BASELINE_FILE):
+    """Stored baselines; entries without a relative time (absolute-only format) are ignored."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        results = json.load(f).get('results', {})
+    return {key: baseline for key, baseline in results.items() if 'relative' in baseline}
+
+
+def save_baselines(results, path=BASELINE_FILE):
+    """Merges `results` into the baseline file (other stages/scales are kept).
+
+    Raises:
+        ValueError: A result has fewer than MIN_REPEAT timed runs
+    """
+    too_few = sorted(key for key, result in results.items() if result['repeat'] < MIN_REPEAT)
+    if too_few:
+        raise ValueError(f"Baselines need at least {MIN_REPEAT} timed runs: {', '.join(too_few)}")
+    stored = {key: {field: result[field] for field in ('relative', 'noise', 'peak_mb', 'repeat')}
+              for key, result in results.items()}
+    merged = {**load_baselines(path), **stored}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'python': platform.python_version(), 'min_repeat': MIN_REPEAT,
+                   'results': dict(sorted(merged.items()))}, f, indent=2)
+
+
+def _ratio(value):
+    return f"{value:.2f}x" if value is not None else "-"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline benchmarks of the data-processing pipeline")
+    parser.add_argument("--scales", type=str, default=','.join(map(str, DEFAULT_SCALES)),
+                        help="Comma-separated data scale factors (default: 1,10,100)")
+    parser.add_argument("--stage", action="append", choices=list(STAGES), help="Only run this stage (repeatable)")
+    parser.add_argument("--repeat", type=int, default=MIN_REPEAT,
+                        help=f"Timed runs per stage; the median is kept "
+                             f"(default and minimum for comparing: {MIN_REPEAT})")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown/growth over the baseline; times also get their measured noise "
+                             "on top (default: 0.25)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baselines")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on a regression")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic inputs")
+    parser.add_argument("--json", type=str, default=None, help="Also write the results to this file")
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    if args.repeat < MIN_REPEAT and (args.save_baseline or args.fail_on_regression):
+        parser.error(f"--save-baseline and --fail-on-regression need --repeat {MIN_REPEAT} or more")
+
+    results = run_benchmarks([int(scale) for scale in args.scales.split(',')], args.stage, args.repeat, args.seed)
+    rows = compare(results, load_baselines(), args.threshold)
+
+    print(f"{'stage':<32} {'seconds':>10} {'relative':>10} {'noise':>7} {'peak MB':>10} {'time':>8} {'memory':>8}")
+    for key, result, baseline, time_ratio, memory_ratio, regressed in rows:
+        flag = "  ⚠️ regression" if regressed else ""
+        print(f"{key:<32} {result['seconds']:>10.4f} {result['relative']:>10.2f} "
+              f"{result['noise']:>7.0%} {result['peak_mb']:>10.2f} "
+              f"{_ratio(time_ratio):>8} {_ratio(memory_ratio):>8}{flag}")
+    if args.repeat < MIN_REPEAT:
+        print(f"ℹ️ Fewer than {MIN_REPEAT} timed runs per stage: ratios are shown but not flagged")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        save_baselines(results)
+        print(f"✅ Baselines saved to {BASELINE_FILE}")
+    if args.fail_on_regression and any(row[-1] for row in rows):
+        sys.exit(1)
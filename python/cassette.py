@@ -0,0 +1,161 @@
+"""
+Record/replay store for raw Kickbase API responses.
+
+With a cassette in record mode, kickbase_client stores every final GET
+response (status, content type and zlib-compressed body) in a SQLite file
+keyed by method, path and sorted query parameters. In replay mode the
+client answers from that file instead of the network: no rate limiting,
+no login and no credentials, so a frozen crawl can be re-run at disk speed.
+
+Only GETs are recorded, so the login response (a live token) never ends
+up in a cassette; request headers are not stored either. 401, 429 and 5xx
+responses are not recorded, as they say nothing about the data. Keys use
+the URL path only, so a cassette recorded against the mock API
+(KICKBASE_API_URL) replays against the real base URL and vice versa.
+
+Usage:
+    python getDetailedPlayers.py --record              # crawl and fill kickbase.cassette.sqlite
+    python getDetailedPlayers.py --replay              # same run, offline
+    python -m pointsAnalysis.getAllPlayersEvents --all-players --replay
+    python cassette.py stats kickbase.cassette.sqlite
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import sqlite3
+import threading
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+
+DEFAULT_CASSETTE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'kickbase.cassette.sqlite')
+RECORD, REPLAY = 'record', 'replay'
+RECORDED_METHODS = {'GET'}
+UNRECORDED_STATUSES = {401, 429}  # and every 5xx
+MISSING_STATUS = 404
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT NOT NULL PRIMARY KEY,
+    status INTEGER NOT NULL,
+    content_type TEXT,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    recorded_at TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def request_key(method, url, params=None):
+    """'GET /v4/path?a=1&b=2': method, URL path and all query parameters, sorted."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    query += [(str(name), str(value)) for name, value in (params or {}).items()]
+    return f"{method.upper()} {parts.path}?{urlencode(sorted(query))}"
+
+
+def _should_record(method, status):
+    return method.upper() in RECORDED_METHODS and status not in UNRECORDED_STATUSES and status < 500
+
+
+class Cassette:
+    """SQLite-backed response store shared by all client threads."""
+
+    def __init__(self, path=DEFAULT_CASSETTE, mode=REPLAY):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if mode == REPLAY and not os.path.exists(path):
+            raise FileNotFoundError(f"No cassette at {path}; record one with --record first")
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self.hits = self.misses = self.recorded = 0
+
+    def record(self, method, url, params, response):
+        """Stores `response` unless it is a POST, an auth/rate-limit failure or a 5xx."""
+        if not _should_record(method, response.status_code):
+            return False
+        body = response.content
+        row = (request_key(method, url, params), response.status_code,
+               response.headers.get('Content-Type'), zlib.compress(body), len(body),
+               datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'))
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)", row)
+            self.recorded += 1
+        return True
+
+    def replay(self, method, url, params=None):
+        """The recorded response for this request, or a 404 saying it was never recorded."""
+        key = request_key(method, url, params)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, content_type, body FROM responses WHERE key = ?", (key,)).fetchone()
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        response = requests.Response()
+        response.url = url
+        response.encoding = 'utf-8'
+        if row is None:
+            logging.warning(f"Not in cassette {self.path}: {key}")
+            response.status_code = MISSING_STATUS
+            response._content = json.dumps({'err': 'not in cassette', 'key': key}).encode('utf-8')
+            response.headers['Content-Type'] = 'application/json'
+            return response
+        status, content_type, body = row
+        response.status_code = status
+        response._content = zlib.decompress(body)
+        if content_type:
+            response.headers['Content-Type'] = content_type
+        return response
+
+    def stats(self):
+        """Entry count, raw and stored body bytes."""
+        with self._lock:
+            count, raw, stored = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(body)), 0) FROM responses").fetchone()
+        return {'responses': count, 'raw_bytes': raw, 'stored_bytes': stored}
+
+    def recorded_date(self):
+        """Day (YYYY-MM-DD) of the newest recorded response, or None for an empty cassette."""
+        with self._lock:
+            (newest,) = self._conn.execute("SELECT MAX(recorded_at) FROM responses").fetchone()
+        return newest[:10] if newest else None
+
+    def keys(self):
+        with self._lock:
+            return [key for (key,) in self._conn.execute("SELECT key FROM responses ORDER BY key")]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect a Kickbase response cassette")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    stats_parser = subparsers.add_parser("stats", help="Number of responses and their size")
+    stats_parser.add_argument("path", nargs="?", default=DEFAULT_CASSETTE)
+    keys_parser = subparsers.add_parser("keys", help="List the recorded request keys")
+    keys_parser.add_argument("path", nargs="?", default=DEFAULT_CASSETTE)
+    args = parser.parse_args()
+
+    cassette = Cassette(args.path, REPLAY)
+    if args.command == "stats":
+        stats = cassette.stats()
+        ratio = stats['raw_bytes'] / stats['stored_bytes'] if stats['stored_bytes'] else 0
+        print(f"📼 {args.path}: {stats['responses']} responses, {stats['raw_bytes'] / 1e6:.1f} MB raw, "
+              f"{stats['stored_bytes'] / 1e6:.1f} MB stored ({ratio:.1f}x)")
+    else:
+        for key in cassette.keys():
+            print(key)
+    cassette.close()
@@ -0,0 +1,72 @@
+"""
+Content-hash change detection for detailed player snapshots.
+
+Each player record gets a stable hash over its fields except the volatile
+ones (`ts` changes on every fetch). Comparing the hashes of a new crawl with
+the current detailed_players.json tells which players were added, removed
+or really changed, so unchanged snapshots need not be rewritten or
+committed. The result is published as a small change manifest:
+
+    {"date": "...", "has_changes": true, "added": [...], "removed": [...],
+     "changed": [...], "unchanged": 420}
+"""
+
+import hashlib
+import json
+import logging
+import os
+
+from player_stream import iter_players
+
+CHANGES_FILE = 'detailed_players.changes.json'
+
+# Fields that change without the player's data changing
+VOLATILE_FIELDS = frozenset({'ts'})
+
+
+def player_hash(player):
+    """Stable hash of one player record, ignoring VOLATILE_FIELDS and key order."""
+    stable = {key: value for key, value in player.items() if key not in VOLATILE_FIELDS}
+    encoded = json.dumps(stable, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:16]
+
+
+def snapshot_hashes(players):
+    """Hashes of all players, keyed by player ID."""
+    return {str(player_id): player_hash(player) for player_id, player in players.items()}
+
+
+def load_snapshot_hashes(path):
+    """Hashes of the players in a saved snapshot, streamed; empty if the file is missing or unreadable."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        return {player_id: player_hash(player) for player_id, player in iter_players(path)}
+    except (ValueError, OSError) as e:
+        logging.warning(f"Could not read previous snapshot {path}: {e}")
+        return {}
+
+
+def diff_hashes(old_hashes, new_hashes):
+    """Compares two hash maps.
+
+    Returns:
+        dict: has_changes, added/removed/changed player IDs (sorted) and the unchanged count
+    """
+    added = sorted(new_hashes.keys() - old_hashes.keys())
+    removed = sorted(old_hashes.keys() - new_hashes.keys())
+    changed = sorted(player_id for player_id in new_hashes.keys() & old_hashes.keys()
+                     if new_hashes[player_id] != old_hashes[player_id])
+    return {
+        'has_changes': bool(added or removed or changed),
+        'added': added,
+        'removed': removed,
+        'changed': changed,
+        'unchanged': len(new_hashes) - len(added) - len(changed),
+    }
+
+
+def write_change_manifest(changes, date, path=CHANGES_FILE):
+    """Writes the change manifest for this run."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'date': date, **changes}, f, indent=2)
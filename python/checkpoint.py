@@ -0,0 +1,104 @@
+"""
+Append-only checkpoint journal for long-running crawls.
+
+Each fetched record is appended as one JSON line the moment it arrives, so a
+crash loses at most the line being written. The journal is read back on the
+next start to resume, and deleted once the final output has been compacted.
+
+The first line is a header naming the run the journal belongs to (e.g. the
+crawl date and a hash of its input). A journal from another run, or one
+without a header, is discarded instead of resumed, so records of an old or
+different crawl never leak into the output.
+"""
+
+import hashlib
+import json
+import logging
+import os
+
+HEADER_KEY = 'journal'
+
+
+def run_key(date, ids):
+    """'<date>:<hash of ids>': identifies a crawl of `ids` on `date`."""
+    digest = hashlib.sha256('\n'.join(str(record_id) for record_id in ids).encode('utf-8')).hexdigest()
+    return f"{date}:{digest[:16]}"
+
+
+class CheckpointJournal:
+    """JSON Lines journal: a `{"journal": run}` header, then `{"id": ..., "data": ...}` records."""
+
+    def __init__(self, path, run=None):
+        self.path = path
+        self.run = run
+        self._file = None
+
+    def load(self):
+        """Reads all complete records from a previous, interrupted run of the same crawl.
+
+        A journal whose header names another run (or that has no header) is
+        deleted and nothing is resumed.
+
+        Returns:
+            dict: Records keyed by id, later lines overriding earlier ones
+        """
+        records = {}
+        if not os.path.exists(self.path):
+            return records
+
+        # errors='replace' turns a half-written multibyte character into an unparsable line
+        with open(self.path, 'r', encoding='utf-8', errors='replace') as f:
+            header = None
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A partially written last line is expected after a crash
+                    logging.warning(f"Skipping unreadable journal line {line_number} in {self.path}")
+                    continue
+                if header is None:
+                    header = entry.get(HEADER_KEY) if HEADER_KEY in entry else ''
+                    if header != self.run:
+                        break
+                    continue
+                records[entry['id']] = entry['data']
+
+        if header is not None and header != self.run:
+            logging.warning(f"Discarding journal {self.path} of run {header or 'unknown'!r}, "
+                            f"this run is {self.run!r}")
+            self.remove()
+            return {}
+        return records
+
+    def append(self, record_id, data):
+        """Appends one record and flushes it to disk (a new journal starts with its header)."""
+        if self._file is None:
+            is_new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            needs_newline = False
+            if not is_new:
+                # Start on a fresh line if the previous run died mid-write
+                with open(self.path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    needs_newline = f.read(1) != b'\n'
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if needs_newline:
+                self._file.write('\n')
+            if is_new:
+                self._file.write(json.dumps({HEADER_KEY: self.run}, ensure_ascii=False) + '\n')
+        self._file.write(json.dumps({"id": record_id, "data": data}, ensure_ascii=False))
+        self._file.write('\n')
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        """Deletes the journal after its records were compacted into the final output."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,128 @@
+"""
+Columnar (Parquet) snapshot of the detailed player data.
+
+Writes the same data as detailed_players.json as three tables so analyses
+can read only the columns they need:
+
+- players.parquet: one row per player with all scalar fields
+- player_ph.parquet: `ph` (points history) exploded, one row per entry
+- player_mdsum.parquet: `mdsum` (upcoming matchdays) exploded, one row per fixture
+
+Child tables are keyed by `player_id` (the player's `i`). Other nested fields
+(`stl`, `opl`, ...) are kept as JSON strings in the players table. A column
+whose values have mixed types across rows (e.g. an int in some players and a
+string in others) is stored as strings.
+
+Requires pyarrow; without it the snapshot is skipped.
+"""
+
+import json
+import logging
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = None
+    pq = None
+
+SNAPSHOT_DIR = 'snapshot'
+PLAYERS_TABLE = 'players'
+PH_TABLE = 'player_ph'
+MDSUM_TABLE = 'player_mdsum'
+
+
+def _as_string(value):
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _column(name, values):
+    """Arrow array of one column; mixed-type columns are stored as strings."""
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        logging.warning(f"Column '{name}' has mixed types, storing it as strings")
+        return pa.array([_as_string(value) for value in values], pa.string())
+
+
+def _table_from_rows(rows):
+    """Builds a table over the union of all row keys, missing values as nulls."""
+    columns = {}
+    for row in rows:
+        for key in row:
+            columns.setdefault(key, None)
+    return pa.table({key: _column(key, [row.get(key) for row in rows]) for key in columns})
+
+
+def _flatten(player_id, player):
+    row = {'player_id': player_id}
+    ph_rows, mdsum_rows = [], []
+    for key, value in player.items():
+        if key == 'ph':
+            for idx, entry in enumerate(value or []):
+                ph_rows.append({'player_id': player_id, 'idx': idx, **entry})
+        elif key == 'mdsum':
+            for idx, entry in enumerate(value or []):
+                mdsum_rows.append({'player_id': player_id, 'idx': idx, **entry})
+        elif isinstance(value, (list, dict)):
+            row[key] = json.dumps(value, ensure_ascii=False)
+        else:
+            row[key] = value
+    return row, ph_rows, mdsum_rows
+
+
+def write_snapshot(players, snapshot_dir=SNAPSHOT_DIR, date=None):
+    """Writes the columnar snapshot of `players`.
+
+    Args:
+        players (dict): Player records keyed by player ID, as in detailed_players.json
+        snapshot_dir (str): Output directory
+        date (str, optional): Snapshot date stored in the file metadata
+
+    Returns:
+        bool: True if the snapshot was written, False if pyarrow is unavailable
+    """
+    if pa is None:
+        logging.warning("pyarrow not installed, skipping columnar snapshot")
+        return False
+
+    player_rows, ph_rows, mdsum_rows = [], [], []
+    for player_id, player in players.items():
+        row, ph, mdsum = _flatten(str(player_id), player)
+        player_rows.append(row)
+        ph_rows.extend(ph)
+        mdsum_rows.extend(mdsum)
+
+    os.makedirs(snapshot_dir, exist_ok=True)
+    metadata = {b'date': (date or '').encode(), b'count': str(len(player_rows)).encode()}
+    for name, rows in ((PLAYERS_TABLE, player_rows), (PH_TABLE, ph_rows), (MDSUM_TABLE, mdsum_rows)):
+        table = _table_from_rows(rows) if rows else pa.table({'player_id': pa.array([], pa.string())})
+        table = table.replace_schema_metadata(metadata)
+        path = os.path.join(snapshot_dir, f"{name}.parquet")
+        # Write next to the target and rename so readers never see a partial file
+        pq.write_table(table, path + '.tmp', compression='zstd')
+        os.replace(path + '.tmp', path)
+
+    logging.info(f"Columnar snapshot written to {snapshot_dir} "
+                 f"({len(player_rows)} players, {len(ph_rows)} ph rows, {len(mdsum_rows)} mdsum rows)")
+    return True
+
+
+def load_table(name=PLAYERS_TABLE, columns=None, snapshot_dir=SNAPSHOT_DIR):
+    """Reads one snapshot table, optionally only some columns, via a memory map.
+
+    Args:
+        name (str): PLAYERS_TABLE, PH_TABLE or MDSUM_TABLE
+        columns (list, optional): Columns to read; all if None
+        snapshot_dir (str): Snapshot directory
+
+    Returns:
+        pyarrow.Table: The requested table (use `.to_pandas()` for a DataFrame)
+    """
+    if pq is None:
+        raise ImportError("pyarrow is required to read the columnar snapshot")
+    path = os.path.join(snapshot_dir, f"{name}.parquet")
+    return pq.read_table(path, columns=columns, memory_map=True)
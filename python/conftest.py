@@ -0,0 +1,3 @@
+# test_workflow.py and test_getDetailedPlayers.py are manual smoke tests that
+# log in with real credentials (and exit when there are none); run them directly.
+collect_ignore = ['test_workflow.py', 'test_getDetailedPlayers.py']
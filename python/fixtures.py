@@ -0,0 +1,150 @@
+"""
+Fixture deduplication for detailed player snapshots.
+
+Every player record embeds its team's `mdsum` (the surrounding matchdays),
+so each fixture is repeated for every player of both teams. The normalised
+snapshot stores each match once and each team's fixture list once:
+
+- matches: {"<day>:<t1>:<t2>": fixture} with the original fixture fields
+- team_fixtures: {tid: [match keys]} in mdsum order
+- players: records with `mdsum` replaced by `"mdref": tid`
+
+A player's `mdsum` is only replaced when it is exactly its team's list;
+anything else stays inline, and the whole result is checked to rehydrate
+to the input before it is returned.
+
+`python/spielplan.json` uses OpenLigaDB team IDs and a different record
+shape, so it is not merged into the match table.
+
+Usage:
+    python fixtures.py normalize ../public/detailed_players.json ../public/detailed_players.normalized.json
+    python fixtures.py rehydrate ../public/detailed_players.normalized.json detailed_players.json
+"""
+
+import argparse
+import json
+import os
+
+FIXTURES_KEY = 'mdsum'
+REFERENCE_KEY = 'mdref'
+
+
+def match_key(fixture):
+    """Identifies a match by matchday and both team IDs."""
+    return f"{fixture.get('day')}:{fixture.get('t1')}:{fixture.get('t2')}"
+
+
+def _replace_key(player, old_key, new_key, value):
+    """Copy of `player` with `old_key` swapped for `new_key`, keeping the key order."""
+    return {new_key if key == old_key else key: value if key == old_key else item
+            for key, item in player.items()}
+
+
+def normalize_players(players):
+    """Moves the fixtures out of the player records.
+
+    Args:
+        players (dict): Player records keyed by player ID
+
+    Returns:
+        dict: {'players', 'matches', 'team_fixtures'}
+
+    Raises:
+        ValueError: The normalised data does not rehydrate to `players`
+    """
+    matches, team_fixtures, normalized = {}, {}, {}
+    for player_id, player in players.items():
+        fixtures = player.get(FIXTURES_KEY)
+        tid = player.get('tid')
+        if not isinstance(fixtures, list) or tid is None:
+            normalized[player_id] = player
+            continue
+
+        keys = [match_key(fixture) for fixture in fixtures]
+        consistent = len(set(keys)) == len(keys) and all(
+            matches.setdefault(key, fixture) == fixture for key, fixture in zip(keys, fixtures))
+        if consistent and team_fixtures.setdefault(str(tid), keys) == keys:
+            normalized[player_id] = _replace_key(player, FIXTURES_KEY, REFERENCE_KEY, str(tid))
+        else:
+            # Differs from what its team (or another player) has: keep it inline
+            normalized[player_id] = player
+
+    # Drop matches only referenced by inline lists
+    referenced = {key for keys in team_fixtures.values() for key in keys}
+    result = {
+        'players': normalized,
+        'matches': {key: fixture for key, fixture in matches.items() if key in referenced},
+        'team_fixtures': team_fixtures,
+    }
+    if rehydrate_players(result) != players:
+        raise ValueError("Normalised fixtures do not rehydrate to the original players")
+    return result
+
+
+def player_fixtures(normalized, player_id):
+    """The `mdsum` of one player, rehydrated on demand."""
+    player = normalized['players'][player_id]
+    if REFERENCE_KEY not in player:
+        return player.get(FIXTURES_KEY)
+    return [dict(normalized['matches'][key]) for key in normalized['team_fixtures'][player[REFERENCE_KEY]]]
+
+
+def rehydrate_players(normalized):
+    """Restores the nested shape: every `mdref` becomes the team's full `mdsum` again."""
+    players = {}
+    for player_id, player in normalized['players'].items():
+        if REFERENCE_KEY in player:
+            player = _replace_key(player, REFERENCE_KEY, FIXTURES_KEY,
+                                  player_fixtures(normalized, player_id))
+        players[player_id] = player
+    return players
+
+
+def write_normalized(snapshot, path):
+    """Writes a detailed_players document ({'players', 'date', ...}) in normalised form."""
+    document = {**snapshot, **normalize_players(snapshot['players'])}
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(path + '.tmp', path)
+    return document
+
+
+def load_normalized(path, rehydrate=True):
+    """Loads a normalised snapshot.
+
+    Args:
+        path (str): File written by write_normalized
+        rehydrate (bool): Return the original nested shape; if False, return the
+            normalised document as is (use player_fixtures for single players)
+
+    Returns:
+        dict: The snapshot document
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        document = json.load(f)
+    if not rehydrate:
+        return document
+    players = rehydrate_players(document)
+    document = {key: value for key, value in document.items() if key not in ('matches', 'team_fixtures')}
+    document['players'] = players
+    return document
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deduplicate or restore the fixtures of a player snapshot")
+    parser.add_argument("command", choices=["normalize", "rehydrate"])
+    parser.add_argument("input")
+    parser.add_argument("output")
+    args = parser.parse_args()
+
+    if args.command == "normalize":
+        with open(args.input, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        document = write_normalized(snapshot, args.output)
+        inline = sum(REFERENCE_KEY not in player for player in document['players'].values())
+        print(f"✅ {len(document['matches'])} matches for {len(document['team_fixtures'])} teams, "
+              f"{inline} players kept inline: {os.path.getsize(args.input)} -> {os.path.getsize(args.output)} bytes")
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(load_normalized(args.input), f, ensure_ascii=False, indent=2)
+        print(f"✅ Rehydrated {args.input} to {args.output}")
@@ -0,0 +1,199 @@
+"""
+Sharded, content-hashed data bundle of detailed_players.json for the frontend.
+
+Writes, below `public/data/`:
+
+- manifest.json: snapshot date, one entry per shard and a small per-player
+  index (`tid`, `pos`, shard file), so a page can find what to load
+- team/<tid>.<hash>.json: all players of one team
+- position/<pos>.<hash>.json: all players of one position
+- player/<id>.<hash>.json: a single player record
+- fixtures/all.<hash>.json: every match once and each team's fixture list,
+  from fixtures.normalize_players. Player records in the shards carry
+  `"mdref": <tid>` instead of repeating their team's `mdsum`; a player whose
+  list differs from the team's keeps it inline
+
+Shard names contain a short hash of their players' change_detection hashes,
+which ignore the volatile `ts`, so they can be served with an immutable
+cache header; only the manifest has to be revalidated. A shard whose players
+did not really change keeps its name and its existing file (with the `ts`
+of the crawl that last changed it), so a weekly crawl only renames the
+shards that moved. Files of shards no longer in the manifest are deleted.
+
+GitHub Pages compresses responses itself and never serves precompressed
+files, so the bundle is plain JSON. For hosts that do serve them,
+--precompress also writes .gz and, if the `brotli` package is installed,
+.br variants.
+
+Usage:
+    python frontend_bundle.py ../public/detailed_players.json --out ../public/data
+    python frontend_bundle.py ../public/detailed_players.json --out dist/data --precompress
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+
+from change_detection import snapshot_hashes
+from fixtures import normalize_players
+from player_stream import iter_players, read_value
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+BUNDLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'public', 'data')
+MANIFEST_FILE = 'manifest.json'
+HASH_LENGTH = 12
+
+SHARD_KINDS = {
+    'team': 'tid',
+    'position': 'pos',
+}
+PLAYER_SHARD_KIND = 'player'
+FIXTURES_SHARD_KIND = 'fixtures'
+
+
+def _encode(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def content_hash(payload):
+    """Short SHA-256 of the uncompressed shard bytes."""
+    return hashlib.sha256(payload).hexdigest()[:HASH_LENGTH]
+
+
+def shard_hash(players):
+    """Short hash of a shard's players that ignores change_detection.VOLATILE_FIELDS.
+
+    Args:
+        players (dict): The shard's player records keyed by player ID
+    """
+    return content_hash(_encode(sorted(snapshot_hashes(players).items())))
+
+
+def _variants(path, precompress):
+    """Files written for `path`: itself, plus .gz and .br when precompressing."""
+    if not precompress:
+        return [path]
+    return [path, path + '.gz'] + ([path + '.br'] if brotli is not None else [])
+
+
+def write_precompressed(path, payload, precompress=True):
+    """Writes `payload` (plus its precompressed variants if `precompress`); returns their sizes."""
+    sizes = {'bytes': len(payload)}
+    variants = [(path, payload)]
+    if precompress:
+        variants.append((path + '.gz', gzip.compress(payload, compresslevel=9, mtime=0)))
+        if brotli is not None:
+            variants.append((path + '.br', brotli.compress(payload)))
+    for variant_path, data in variants:
+        if variant_path != path:
+            sizes[variant_path.rsplit('.', 1)[1]] = len(data)
+        tmp_path = variant_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, variant_path)
+    return sizes
+
+
+def _write_shard(bundle_dir, kind, key, digest, data, written, precompress=False):
+    name = f"{kind}/{key}.{digest}.json"
+    path = os.path.join(bundle_dir, name)
+    variants = _variants(path, precompress)
+    written.update(os.path.relpath(variant, bundle_dir).replace(os.sep, '/') for variant in variants)
+    # Same name means same content: an unchanged shard is never rewritten, not even for a new `ts`
+    if all(os.path.exists(variant) for variant in variants):
+        return name, {('bytes' if variant == path else variant.rsplit('.', 1)[1]): os.path.getsize(variant)
+                      for variant in variants}
+    return name, write_precompressed(path, _encode(data), precompress)
+
+
+def _prune(bundle_dir, written):
+    """Deletes every shard file not written for this manifest (old shards, unwanted variants, .tmp)."""
+    removed = 0
+    for kind in (*SHARD_KINDS, PLAYER_SHARD_KIND, FIXTURES_SHARD_KIND):
+        kind_dir = os.path.join(bundle_dir, kind)
+        if not os.path.isdir(kind_dir):
+            continue
+        for filename in os.listdir(kind_dir):
+            if f"{kind}/{filename}" not in written:
+                os.remove(os.path.join(kind_dir, filename))
+                removed += 1
+    return removed
+
+
+def write_bundle(players, bundle_dir=BUNDLE_DIR, date=None, precompress=False):
+    """Writes all shards and the manifest for `players`.
+
+    Args:
+        players (dict): Player records keyed by player ID, as in detailed_players.json
+        bundle_dir (str): Output directory (served as /AdvancedManager/data/)
+        date (str, optional): Snapshot date recorded in the manifest
+        precompress (bool): Also write .gz/.br variants (not for GitHub Pages)
+
+    Returns:
+        dict: The manifest that was written
+    """
+    for kind in (*SHARD_KINDS, PLAYER_SHARD_KIND, FIXTURES_SHARD_KIND):
+        os.makedirs(os.path.join(bundle_dir, kind), exist_ok=True)
+
+    written = set()
+    encodings = (['gzip'] + (['br'] if brotli else [])) if precompress else []
+    manifest = {'date': date, 'count': len(players), 'encodings': encodings, 'shards': {}, 'players': {}}
+
+    normalized = normalize_players(players)
+    fixtures = {'matches': normalized['matches'], 'team_fixtures': normalized['team_fixtures']}
+    name, sizes = _write_shard(bundle_dir, FIXTURES_SHARD_KIND, 'all', content_hash(_encode(fixtures)), fixtures,
+                               written, precompress)
+    manifest['fixtures'] = {'file': name, 'matches': len(fixtures['matches']), **sizes}
+    players = normalized['players']
+
+    for kind, field in SHARD_KINDS.items():
+        groups = {}
+        for player_id, player in players.items():
+            groups.setdefault(str(player.get(field, '')), {})[player_id] = player
+        manifest['shards'][kind] = {}
+        for key, group in groups.items():
+            name, sizes = _write_shard(bundle_dir, kind, key, shard_hash(group), {'players': group}, written,
+                                       precompress)
+            manifest['shards'][kind][key] = {'file': name, 'count': len(group), **sizes}
+
+    for player_id, player in players.items():
+        name, _ = _write_shard(bundle_dir, PLAYER_SHARD_KIND, player_id, shard_hash({player_id: player}), player,
+                               written, precompress)
+        manifest['players'][player_id] = {'tid': player.get('tid'), 'pos': player.get('pos'), 'file': name}
+
+    manifest_path = os.path.join(bundle_dir, MANIFEST_FILE)
+    write_precompressed(manifest_path, _encode(manifest), precompress)
+    for suffix in ('.gz', '.br'):
+        if not os.path.exists(manifest_path + suffix) or manifest_path + suffix in _variants(manifest_path, precompress):
+            continue
+        os.remove(manifest_path + suffix)
+    removed = _prune(bundle_dir, written)
+    logging.info(f"Frontend bundle written to {bundle_dir}: {len(written)} shard files, {removed} stale files removed")
+    return manifest
+
+
+def write_bundle_from_file(path, bundle_dir=BUNDLE_DIR, precompress=False):
+    """Builds the bundle from a detailed_players JSON file."""
+    return write_bundle(dict(iter_players(path)), bundle_dir, read_value(path, 'date'), precompress)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write the sharded frontend bundle of detailed players")
+    parser.add_argument("input", nargs="?", default=os.path.join('..', 'public', 'detailed_players.json'))
+    parser.add_argument("--out", default=BUNDLE_DIR, help="Output directory (default: public/data)")
+    parser.add_argument("--precompress", action="store_true",
+                        help="Also write .gz/.br variants, for hosts that serve them (GitHub Pages does not)")
+    args = parser.parse_args()
+
+    manifest = write_bundle_from_file(args.input, args.out, args.precompress)
+    manifest_size = os.path.getsize(os.path.join(args.out, MANIFEST_FILE))
+    print(f"✅ Bundle for {manifest['count']} players written to {args.out} "
+          f"({len(manifest['shards']['team'])} team and {len(manifest['shards']['position'])} position shards, "
+          f"manifest {manifest_size} bytes)")
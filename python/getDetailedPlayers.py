@@ -1,13 +1,23 @@
+import argparse
 import datetime
 import requests
 import json
-import time
 import logging
-import random
 import os
 import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from login import login_to_kickbase
+from cassette import DEFAULT_CASSETTE, RECORD, REPLAY
+from change_detection import CHANGES_FILE, diff_hashes, load_snapshot_hashes, snapshot_hashes, write_change_manifest
+from checkpoint import CheckpointJournal, run_key
+from columnar_snapshot import SNAPSHOT_DIR, write_snapshot
+from history_store import append_snapshot
+from player_stream import read_player_ids
+import kickbase_client
+import telemetry
+from refresh import DEFAULT_MAX_AGE_HOURS, load_baseline, plan_refresh
+from token_cache import get_token, refresh_token
 
 # Load environment variables from .env file
 load_dotenv()
@@ -16,46 +26,46 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # Constants
-BASE_URL = "https://api.kickbase.com/v4/competitions/1/players/{}?leagueId=5378755"
+BASE_URL = kickbase_client.API_URL + "/competitions/1/players/{}?leagueId=5378755"
+DEFAULT_CONCURRENCY = 1  # 1 keeps the original sequential behaviour
+OUTPUT_FILE = 'detailed_players.json'
+JOURNAL_FILE = 'detailed_players.journal.jsonl'  # Per-player checkpoint of the current run
 
-# Try to get BEARER_TOKEN from environment, if not present, attempt login
-BEARER_TOKEN = os.getenv('BEARER_TOKEN')
+def authenticate():
+    """Obtains a bearer token from the environment, the token cache or a fresh login."""
+    print(f"🔍 Environment validation:")
+    print(f"BEARER_TOKEN exists: {'Yes' if os.getenv('BEARER_TOKEN') else 'No'}")
 
-# Enhanced environment variable validation
-print(f"🔍 Environment validation:")
-print(f"BEARER_TOKEN exists: {'Yes' if BEARER_TOKEN else 'No'}")
-
-if not BEARER_TOKEN:
-    print("⚠️  BEARER_TOKEN not found in environment, attempting login...")
-    BEARER_TOKEN = login_to_kickbase()
-    
-    if BEARER_TOKEN:
-        print("✅ Successfully obtained token via login")
-        os.environ['BEARER_TOKEN'] = BEARER_TOKEN
-    else:
+    token = get_token()
+    if not token:
         print("❌ Failed to obtain BEARER_TOKEN")
         print("Make sure KICKBASE_EMAIL and KICKBASE_PASSWORD are set")
         sys.exit(1)
 
-print(f"BEARER_TOKEN length: {len(BEARER_TOKEN)}")
-print(f"BEARER_TOKEN starts with: {BEARER_TOKEN[:10]}...")
+    print(f"BEARER_TOKEN length: {len(token)}")
+    print(f"BEARER_TOKEN starts with: {token[:10]}...")
+    return token
 
-HEADERS = {
-    "Authorization": f"Bearer {BEARER_TOKEN}",
-    "Content-Type": "application/json"
-}
+def auth_headers(token):
+    return {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json"
+    }
 
 def fetch_player_details(player_id):
     url = BASE_URL.format(player_id)
     logging.info(f"Fetching detailed data for player ID: {player_id}")
 
-    # Add random delay between 0.01 and 0.1 seconds
-    delay = random.uniform(0.001, 0.01)
-    logging.debug(f"Waiting {delay:.2f} seconds before request")
-    time.sleep(delay)
-    
     try:
-        response = requests.get(url, headers=HEADERS, timeout=30)
+        # Paced by the shared rate limiter; 429s are retried inside the client
+        token = get_token()
+        response = kickbase_client.get(url, headers=auth_headers(token))
+
+        if response.status_code == 401:
+            # Token expired mid-run: log in again once and retry this player
+            new_token = refresh_token(token)
+            if new_token:
+                response = kickbase_client.get(url, headers=auth_headers(new_token))
         
         if response.status_code == 200:
             logging.info(f"Successfully fetched data for player ID: {player_id}")
@@ -70,11 +80,11 @@ def fetch_player_details(player_id):
             print(error_msg)
             logging.error(error_msg)
             return None
-        elif response.status_code == 429:  # Too Many Requests
-            print(f"⚠️ Rate limit hit for player {player_id}. Waiting 60 seconds...")
-            logging.warning("Rate limit hit. Waiting 60 seconds...")
-            time.sleep(60)  # Wait a minute if we hit rate limit
-            return fetch_player_details(player_id)  # Retry the request
+        elif response.status_code == 429:
+            error_msg = f"❌ Still rate limited for player {player_id} after all retries"
+            print(error_msg)
+            logging.error(error_msg)
+            return None
         else:
             error_msg = f"❌ Failed to fetch data for player {player_id}. Status code: {response.status_code}, Response: {response.text[:200]}"
             print(error_msg)
@@ -97,14 +107,63 @@ def fetch_player_details(player_id):
         logging.error(error_msg)
         return None
 
-def save_detailed_data(all_player_details):
+def _fetch_player_safely(player_id):
+    """Wraps fetch_player_details so one failing player never aborts a worker pool."""
+    try:
+        return fetch_player_details(player_id)
+    except Exception as e:
+        error_msg = f"❌ Error processing player {player_id}: {e}"
+        print(error_msg)
+        logging.error(error_msg)
+        return None
+
+def fetch_players(player_ids, concurrency=DEFAULT_CONCURRENCY):
+    """Fetches details for all `player_ids`, up to `concurrency` requests at a time.
+
+    Args:
+        player_ids (list): Player IDs to fetch
+        concurrency (int): Maximum number of requests in flight
+
+    Yields:
+        tuple: (player_id, player_data) in the same order as `player_ids`;
+        player_data is None when the fetch failed
+    """
+    if concurrency <= 1:
+        for player_id in player_ids:
+            yield player_id, _fetch_player_safely(player_id)
+        return
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        # executor.map keeps input order, so results match the sequential path
+        yield from zip(player_ids, executor.map(_fetch_player_safely, player_ids))
+
+def save_detailed_data(all_player_details, date=None):
+    """Writes detailed_players.json unless no player changed (ignoring volatile fields).
+
+    Args:
+        all_player_details (dict): Player records by ID
+        date (str, optional): Crawl date stored in the file (default: today)
+
+    Returns:
+        bool: True if the file was written
+    """
     logging.info("Saving detailed player data to JSON file")
     print(f"💾 Saving {len(all_player_details)} player records...")
     
     try:
+        date = date or datetime.datetime.today().strftime('%Y-%m-%d')
+        changes = diff_hashes(load_snapshot_hashes(OUTPUT_FILE), snapshot_hashes(all_player_details))
+        write_change_manifest(changes, date, CHANGES_FILE)
+        print(f"🔍 Changes: {len(changes['added'])} added, {len(changes['removed'])} removed, "
+              f"{len(changes['changed'])} changed, {changes['unchanged']} unchanged")
+        if not changes['has_changes'] and os.path.exists(OUTPUT_FILE):
+            print(f"ℹ️ No player data changed, keeping the existing {OUTPUT_FILE}")
+            logging.info("No meaningful changes, skipped writing detailed data")
+            return False
+
         data = {
             "players": all_player_details,
-            "date": datetime.datetime.today().strftime('%Y-%m-%d'),
+            "date": date,
             "count": len(all_player_details)
         }
         
@@ -115,10 +174,11 @@ def save_detailed_data(all_player_details):
         
         # If temp file was written successfully, replace the main file
         import shutil
-        shutil.move(temp_filename, 'detailed_players.json')
+        shutil.move(temp_filename, OUTPUT_FILE)
         
         print(f"✅ Successfully saved {len(all_player_details)} player records")
         logging.info("Detailed data saved successfully")
+        return True
         
     except Exception as e:
         error_msg = f"❌ Error saving data: {e}"
@@ -126,9 +186,64 @@ def save_detailed_data(all_player_details):
         logging.error(error_msg)
         raise
 
-def main():
+def save_columnar_snapshot(all_player_details, snapshot_date):
+    """Writes the Parquet snapshot next to the JSON; failures never fail the run."""
+    try:
+        if write_snapshot(all_player_details, SNAPSHOT_DIR, snapshot_date):
+            print(f"✅ Columnar snapshot written to {SNAPSHOT_DIR}/")
+    except Exception as e:
+        error_msg = f"⚠️ Could not write columnar snapshot: {e}"
+        print(error_msg)
+        logging.warning(error_msg)
+
+def save_history_snapshot(all_player_details, snapshot_date):
+    """Appends this run to the snapshot history; failures never fail the run."""
+    try:
+        count = append_snapshot(all_player_details, snapshot_date)
+        print(f"✅ Added {count} players to the snapshot history for {snapshot_date}")
+    except Exception as e:
+        error_msg = f"⚠️ Could not update snapshot history: {e}"
+        print(error_msg)
+        logging.warning(error_msg)
+
+def write_metrics(path=telemetry.METRICS_FILE):
+    """Writes the crawl metrics as JSON to `path` and as Markdown next to it."""
+    try:
+        report = telemetry.write_report(path, os.path.splitext(path)[0] + '.md')
+        print(f"📡 {report['requests']} requests ({report['retries']} retries), "
+              f"p50 {report['latency']['p50_ms']} ms, p99 {report['latency']['p99_ms']} ms; "
+              f"metrics written to {path}")
+    except OSError as e:
+        logging.warning(f"Could not write crawl metrics to {path}: {e}")
+
+def use_cassette(record=None, replay=None):
+    """Switches the client to recording into or replaying from a cassette file.
+
+    Returns:
+        Cassette: The active cassette, or None when talking to the API directly
+    """
+    if replay:
+        cassette = kickbase_client.use_cassette(replay, REPLAY)
+        print(f"📼 Replaying API responses from {replay} (no network, no credentials)")
+        return cassette
+    if record:
+        cassette = kickbase_client.use_cassette(record, RECORD)
+        print(f"📼 Recording API responses to {record}")
+        return cassette
+    return None
+
+def main(concurrency=DEFAULT_CONCURRENCY, resume=True, refresh=False, priority_ids=(),
+         max_age_hours=DEFAULT_MAX_AGE_HOURS, max_players=None, http2=False, record=None, replay=None):
     print("🚀 Starting to collect detailed player data")
     logging.info("Starting to collect detailed player data")
+    print(f"⚙️  Concurrency: {concurrency}")
+    cassette = use_cassette(record, replay)
+    # A replayed crawl keeps the date it was recorded on
+    crawl_date = (cassette.recorded_date() if replay else None) or datetime.datetime.today().strftime('%Y-%m-%d')
+    authenticate()
+    # Keep one pooled connection per worker alive for the whole crawl
+    kickbase_client.configure(pool_size=max(concurrency, kickbase_client.DEFAULT_POOL_SIZE),
+                              http2=http2 or kickbase_client.DEFAULT_HTTP2)
     
     # Print current working directory for debugging
     current_dir = os.getcwd()
@@ -156,31 +271,59 @@ def main():
         print("Please ensure all_players.json exists or run the data collection notebook first.")
         sys.exit(1)
     
-    # First, load the existing player IDs from all_players.json
+    # First, stream the existing player IDs from all_players.json
     try:
-        with open(all_players_file, 'r', encoding='utf-8') as f:
-            basic_data = json.load(f)
-            player_ids = list(basic_data['players'].keys())
-            total_players = len(player_ids)
-            print(f"📊 Found {total_players} players to process")
-            logging.info(f"Found {total_players} players to process")
+        player_ids = read_player_ids(all_players_file)
+        total_players = len(player_ids)
+        print(f"📊 Found {total_players} players to process")
+        logging.info(f"Found {total_players} players to process")
     except FileNotFoundError as e:
         error_msg = f"❌ {all_players_file} not found. Please run worthIt.ipynb first."
         print(error_msg)
         logging.error(error_msg)
         sys.exit(1)
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         error_msg = f"❌ Error parsing {all_players_file}: {e}"
         print(error_msg)
         logging.error(error_msg)
         sys.exit(1)
 
-    all_player_details = {}
+    # Only a journal of the same crawl date and player list is resumed
+    journal = CheckpointJournal(JOURNAL_FILE, run_key(crawl_date, player_ids))
+    if resume:
+        journaled = journal.load()
+        if journaled:
+            print(f"♻️  Resuming from checkpoint journal with {len(journaled)} players already fetched")
+    else:
+        journal.remove()
+        journaled = {}
+
+    if refresh:
+        # Keep the previous snapshot as baseline and only re-fetch stale players
+        baseline = load_baseline(OUTPUT_FILE)
+        fetch_ids, deferred_ids, reasons = plan_refresh(
+            player_ids, baseline, priority_ids=priority_ids,
+            max_age_hours=max_age_hours, max_players=max_players)
+        reason_counts = Counter(reasons[player_id] for player_id in fetch_ids)
+        print(f"🔄 Refresh mode: {len(fetch_ids)} stale players to fetch, "
+              f"{len(deferred_ids)} deferred, {total_players - len(reasons)} up to date")
+        for reason, count in reason_counts.items():
+            print(f"  - {reason}: {count}")
+    else:
+        baseline, fetch_ids = {}, player_ids
+
+    all_player_details = {player_id: baseline[player_id] for player_id in player_ids if player_id in baseline}
+    all_player_details.update(journaled)
+
+    pending_ids = [player_id for player_id in fetch_ids if player_id not in journaled]
+    total_players = len(fetch_ids)
+    done_count = total_players - len(pending_ids)
     
-    # Test the API with the first player to ensure everything works
-    if player_ids:
-        print(f"🧪 Testing API with first player ID: {player_ids[0]}")
-        test_data = fetch_player_details(player_ids[0])
+    # Test the API with the first pending player to ensure everything works
+    if pending_ids:
+        print(f"🧪 Testing API with first player ID: {pending_ids[0]}")
+        with telemetry.stage('fetch'):
+            test_data = fetch_player_details(pending_ids[0])
         if not test_data:
             error_msg = "❌ Failed to fetch test player data. Check authentication and API availability."
             print(error_msg)
@@ -188,30 +331,40 @@ def main():
             sys.exit(1)
         else:
             print("✅ API test successful")
-            all_player_details[player_ids[0]] = test_data
+            all_player_details[pending_ids[0]] = test_data
+            with telemetry.stage('checkpoint_save'):
+                journal.append(pending_ids[0], test_data)
     
-    for idx, player_id in enumerate(player_ids[1:], 2):  # Start from 2 since we already processed the first
-        try:
-            player_data = fetch_player_details(player_id)
-            if player_data:
-                all_player_details[player_id] = player_data
-                # Save after every 10 successful fetches to prevent data loss
-                if idx % 10 == 0:
-                    save_detailed_data(all_player_details)
-                    print(f"💾 Intermediate save completed at {idx} players")
-            
-            if idx % 50 == 0:  # More frequent progress updates
-                print(f"📈 Progress: {idx}/{total_players} players processed ({(idx/total_players)*100:.1f}%)")
-            logging.info(f"Progress: {idx}/{total_players} players processed ({(idx/total_players)*100:.1f}%)")
-        except Exception as e:
-            error_msg = f"❌ Error processing player {player_id}: {e}"
-            print(error_msg)
-            logging.error(error_msg)
-            continue
+    # Continue after the resumed players and the test player
+    with telemetry.stage('fetch'):  # checkpoint_save below is reported separately
+        for idx, (player_id, player_data) in enumerate(fetch_players(pending_ids[1:], concurrency), done_count + 2):
+            try:
+                if player_data:
+                    all_player_details[player_id] = player_data
+                    # Journal every player as it arrives so an interrupted run can resume
+                    with telemetry.stage('checkpoint_save'):
+                        journal.append(player_id, player_data)
 
-    # Final save
+                if idx % 50 == 0:  # More frequent progress updates
+                    print(f"📈 Progress: {idx}/{total_players} players processed ({(idx/total_players)*100:.1f}%)")
+                logging.info(f"Progress: {idx}/{total_players} players processed ({(idx/total_players)*100:.1f}%)")
+            except Exception as e:
+                error_msg = f"❌ Error processing player {player_id}: {e}"
+                print(error_msg)
+                logging.error(error_msg)
+                continue
+
+    journal.close()
+
+    # Final save: compact the journal into detailed_players.json once, in all_players.json order
     try:
-        save_detailed_data(all_player_details)
+        all_player_details = {
+            player_id: all_player_details[player_id]
+            for player_id in player_ids if player_id in all_player_details
+        }
+        with telemetry.stage('final_save'):
+            saved = save_detailed_data(all_player_details, crawl_date)
+        journal.remove()
         print(f"✅ Final save completed with {len(all_player_details)} players")
         logging.info(f"Total number of detailed player records collected: {len(all_player_details)}")
         print("🎉 Script execution completed successfully")
@@ -222,13 +375,58 @@ def main():
         logging.error(error_msg)
         sys.exit(1)
 
+    # Derived snapshots only move when the player data did. A replay is not a new
+    # observation, so it never adds to the Parquet snapshots or the history.
+    if saved and replay:
+        print("📼 Replay: skipping the columnar snapshot and the snapshot history")
+    elif saved:
+        with telemetry.stage('snapshots'):
+            save_columnar_snapshot(all_player_details, crawl_date)
+            save_history_snapshot(all_player_details, crawl_date)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Collect detailed Kickbase player data")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Number of players fetched in parallel (default: 1, sequential)")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Discard an existing checkpoint journal and start from the first player")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Only re-fetch stale players, keeping the rest from the existing detailed_players.json")
+    parser.add_argument("--priority", type=str, default="",
+                        help="Comma-separated player IDs that --refresh always fetches first")
+    parser.add_argument("--max-age-hours", type=float, default=DEFAULT_MAX_AGE_HOURS,
+                        help=f"With --refresh, re-fetch players whose 'ts' is older than this (default: {DEFAULT_MAX_AGE_HOURS})")
+    parser.add_argument("--max-players", type=int, default=None,
+                        help="With --refresh, fetch at most this many stale players and defer the rest")
+    parser.add_argument("--http2", action="store_true",
+                        help="Use HTTP/2 for the shared connection pool (needs httpx[http2])")
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument("--record", nargs="?", const=DEFAULT_CASSETTE, default=None, metavar="CASSETTE",
+                                help="Store every API response in a cassette (default: kickbase.cassette.sqlite)")
+    cassette_group.add_argument("--replay", nargs="?", const=DEFAULT_CASSETTE, default=None, metavar="CASSETTE",
+                                help="Answer every API request from a cassette, without network or credentials")
+    parser.add_argument("--metrics", type=str, default=telemetry.METRICS_FILE,
+                        help=f"Where to write the request/stage metrics report (default: {telemetry.METRICS_FILE}, "
+                             "plus a Markdown summary next to it)")
+    args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    return args
+
 if __name__ == "__main__":
+    args = parse_args()
     try:
-        main()
+        main(concurrency=args.concurrency, resume=not args.no_resume, refresh=args.refresh,
+             priority_ids=[player_id.strip() for player_id in args.priority.split(',') if player_id.strip()],
+             max_age_hours=args.max_age_hours, max_players=args.max_players,
+             http2=args.http2, record=args.record, replay=args.replay)
     except KeyboardInterrupt:
         print("\n❌ Script interrupted by user")
         sys.exit(1)
     except Exception as e:
         print(f"\n❌ Unexpected error: {e}")
         logging.error(f"Unexpected error: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+    finally:
+        # Also after a failed run, where the metrics explain most
+        write_metrics(args.metrics)
\ No newline at end of file
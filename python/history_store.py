@@ -0,0 +1,166 @@
+"""
+Append-only history of detailed player snapshots.
+
+Every run of getDetailedPlayers.py adds one row per player to a SQLite
+database keyed by (player_id, snapshot_date). The most queried values
+(market value, points, ...) are real columns; the full record is kept as
+zlib-compressed JSON so any field can still be recovered later.
+
+The database is not committed: the weekly workflow restores it from the
+previous run's `player-history` artifact, appends the new snapshot and
+uploads it again. To query it locally, download that artifact into this
+directory (see LOCAL_TESTING.md).
+
+Usage:
+    python history_store.py import ../public/detailed_players2425.json
+    python history_store.py history 173 --last 10
+    python history_store.py at 2025-08-11
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sqlite3
+import zlib
+
+HISTORY_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'player_history.sqlite')
+
+# Scalar fields stored as columns for fast range queries
+HISTORY_COLUMNS = ['tid', 'pos', 'st', 'mv', 'tfhmvt', 'tp', 'ap', 'day']
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS snapshots (
+    player_id TEXT NOT NULL,
+    snapshot_date TEXT NOT NULL,
+    {', '.join(f'{column} INTEGER' for column in HISTORY_COLUMNS)},
+    data BLOB NOT NULL,
+    PRIMARY KEY (player_id, snapshot_date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_snapshots_date ON snapshots (snapshot_date);
+"""
+
+
+def connect(db_path=HISTORY_DB):
+    """Opens the history database, creating the schema on first use.
+
+    The caller owns the connection; `with connect() as conn` only commits, so
+    wrap it in contextlib.closing().
+    """
+    conn = sqlite3.connect(db_path)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _int_or_none(value):
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def append_snapshot(players, snapshot_date, db_path=HISTORY_DB):
+    """Stores one snapshot of all players; re-running for the same date replaces it.
+
+    Args:
+        players (dict): Player records keyed by player ID
+        snapshot_date (str): Date of the snapshot, 'YYYY-MM-DD'
+        db_path (str): SQLite database path
+
+    Returns:
+        int: Number of rows written
+    """
+    rows = [
+        (str(player_id), snapshot_date,
+         *(_int_or_none(player.get(column)) for column in HISTORY_COLUMNS),
+         zlib.compress(json.dumps(player, ensure_ascii=False, separators=(',', ':')).encode('utf-8')))
+        for player_id, player in players.items()
+    ]
+    placeholders = ', '.join('?' * (len(HISTORY_COLUMNS) + 3))
+    with contextlib.closing(connect(db_path)) as conn, conn:
+        conn.executemany(f"INSERT OR REPLACE INTO snapshots VALUES ({placeholders})", rows)
+    return len(rows)
+
+
+def import_snapshot_file(path, db_path=HISTORY_DB):
+    """Backfills the history from a saved detailed_players JSON file (uses its 'date')."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return append_snapshot(data['players'], data['date'], db_path)
+
+
+def snapshot_dates(db_path=HISTORY_DB):
+    """Returns all stored snapshot dates, oldest first."""
+    with contextlib.closing(connect(db_path)) as conn:
+        return [row[0] for row in conn.execute(
+            "SELECT DISTINCT snapshot_date FROM snapshots ORDER BY snapshot_date")]
+
+
+def market_value_history(player_id, last_n=None, db_path=HISTORY_DB):
+    """Market value of one player over the most recent snapshots.
+
+    Args:
+        player_id (str): The player's ID
+        last_n (int, optional): Only the last N snapshots; all if None
+
+    Returns:
+        list: (snapshot_date, mv, tfhmvt) tuples, oldest first
+    """
+    query = "SELECT snapshot_date, mv, tfhmvt FROM snapshots WHERE player_id = ? ORDER BY snapshot_date DESC"
+    params = [str(player_id)]
+    if last_n is not None:
+        query += " LIMIT ?"
+        params.append(last_n)
+    with contextlib.closing(connect(db_path)) as conn:
+        return list(reversed(conn.execute(query, params).fetchall()))
+
+
+def field_history(player_id, columns=HISTORY_COLUMNS, db_path=HISTORY_DB):
+    """All stored column values of one player, as dicts ordered by date."""
+    unknown = set(columns) - set(HISTORY_COLUMNS)
+    if unknown:
+        raise ValueError(f"Not a history column: {', '.join(sorted(unknown))}")
+    with contextlib.closing(connect(db_path)) as conn:
+        rows = conn.execute(
+            f"SELECT snapshot_date, {', '.join(columns)} FROM snapshots "
+            "WHERE player_id = ? ORDER BY snapshot_date", [str(player_id)])
+        return [dict(zip(['snapshot_date', *columns], row)) for row in rows]
+
+
+def players_at(date, db_path=HISTORY_DB):
+    """Full player records of the latest snapshot taken on or before `date`.
+
+    Returns:
+        tuple: (snapshot_date, players dict), or (None, {}) if there is no such snapshot
+    """
+    with contextlib.closing(connect(db_path)) as conn:
+        snapshot_date = conn.execute(
+            "SELECT MAX(snapshot_date) FROM snapshots WHERE snapshot_date <= ?", [date]).fetchone()[0]
+        if snapshot_date is None:
+            return None, {}
+        rows = conn.execute(
+            "SELECT player_id, data FROM snapshots WHERE snapshot_date = ?", [snapshot_date])
+        return snapshot_date, {player_id: json.loads(zlib.decompress(data)) for player_id, data in rows}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query or backfill the player snapshot history")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser("import", help="Import detailed_players JSON files")
+    import_parser.add_argument("files", nargs="+")
+    history_parser = subparsers.add_parser("history", help="Market value history of one player")
+    history_parser.add_argument("player")
+    history_parser.add_argument("--last", type=int, default=None)
+    at_parser = subparsers.add_parser("at", help="Number of players in the snapshot at a date")
+    at_parser.add_argument("date")
+    args = parser.parse_args()
+
+    if args.command == "import":
+        for path in args.files:
+            print(f"✅ Imported {import_snapshot_file(path)} players from {path}")
+    elif args.command == "history":
+        for snapshot_date, mv, tfhmvt in market_value_history(args.player, args.last):
+            print(f"{snapshot_date}: {mv} ({tfhmvt:+d})" if tfhmvt is not None else f"{snapshot_date}: {mv}")
+    elif args.command == "at":
+        snapshot_date, players = players_at(args.date)
+        print(f"{snapshot_date}: {len(players)} players" if snapshot_date else f"No snapshot on or before {args.date}")
@@ -0,0 +1,188 @@
+"""
+Shared HTTP client for every Kickbase API caller.
+
+All requests go through one pooled session with HTTP keep-alive, so a crawl
+pays the TCP+TLS handshake once per connection instead of once per request.
+Requests are paced by the shared rate limiter and 429s are retried here.
+
+HTTP/2 is used when enabled and `httpx` (with `h2`) is installed; otherwise
+the client falls back to a `requests` session.
+
+With use_cassette() responses are also recorded to, or answered from, a
+cassette file instead of the network (see cassette.py).
+"""
+
+import logging
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import telemetry
+from rate_limiter import MAX_RETRIES, kickbase_limiter, parse_retry_after
+
+# Overridable to point every client at a local mock (see mock_kickbase.py)
+API_URL = os.getenv('KICKBASE_API_URL', 'https://api.kickbase.com/v4').rstrip('/')
+DEFAULT_POOL_SIZE = int(os.getenv('KICKBASE_POOL_SIZE', '10'))
+DEFAULT_HTTP2 = os.getenv('KICKBASE_HTTP2', '').lower() in ('1', 'true', 'yes')
+DEFAULT_TIMEOUT = 30
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36"
+
+_session = None
+_session_lock = threading.Lock()
+_cassette = None  # cassette.Cassette while recording or replaying
+
+
+def _create_requests_session(pool_size):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(pool_size, 1))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _create_httpx_client(pool_size):
+    try:
+        import httpx
+        import h2  # noqa: F401 - httpx needs it for http2=True
+    except ImportError:
+        logging.warning("HTTP/2 requested but httpx[http2] is not installed, using requests")
+        return None
+    limits = httpx.Limits(max_connections=max(pool_size, 1),
+                          max_keepalive_connections=max(pool_size, 1))
+    return httpx.Client(http2=True, limits=limits, timeout=DEFAULT_TIMEOUT)
+
+
+def configure(pool_size=DEFAULT_POOL_SIZE, http2=DEFAULT_HTTP2):
+    """(Re)creates the shared session.
+
+    Args:
+        pool_size (int): Connections kept alive, should match the crawl concurrency
+        http2 (bool): Use HTTP/2 via httpx when available
+    """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = (_create_httpx_client(pool_size) if http2 else None) or _create_requests_session(pool_size)
+    protocol = 'HTTP/1.1' if isinstance(_session, requests.Session) else 'HTTP/2'
+    logging.info(f"Kickbase client: pool size {pool_size}, {protocol}")
+
+
+def get_session():
+    """Returns the shared session, creating it with the defaults on first use."""
+    if _session is None:
+        configure()
+    return _session
+
+
+def use_cassette(path=None, mode=None):
+    """Records responses to, or replays them from, the cassette at `path`.
+
+    Args:
+        path (str, optional): Cassette file (default: cassette.DEFAULT_CASSETTE)
+        mode (str, optional): 'record', 'replay', or None to go back to the network only
+
+    Raises:
+        FileNotFoundError: When replaying a cassette that does not exist
+    """
+    global _cassette
+    from cassette import DEFAULT_CASSETTE, Cassette
+    if _cassette is not None:
+        _cassette.close()
+        _cassette = None
+    if mode:
+        _cassette = Cassette(path or DEFAULT_CASSETTE, mode)
+        logging.info(f"Kickbase client: {mode} cassette {_cassette.path}")
+    return _cassette
+
+
+def replaying():
+    """True while requests are answered from a cassette instead of the network."""
+    return _cassette is not None and _cassette.mode == 'replay'
+
+
+def _send(method, url, **kwargs):
+    session = get_session()
+    if isinstance(session, requests.Session):
+        return session.request(method, url, **kwargs)
+
+    # Map httpx onto the requests API so callers only handle one exception family
+    import httpx
+    kwargs.pop('verify', None)
+    try:
+        return session.request(method, url, **kwargs)
+    except httpx.TimeoutException as e:
+        raise requests.exceptions.Timeout(str(e)) from e
+    except httpx.HTTPError as e:
+        raise requests.exceptions.ConnectionError(str(e)) from e
+
+
+def _timed_send(method, url, **kwargs):
+    """_send, reporting status, latency and body size of the attempt to telemetry."""
+    start = time.perf_counter()
+    try:
+        response = _send(method, url, **kwargs)
+    except requests.exceptions.RequestException as e:
+        telemetry.record_attempt(method, url, type(e).__name__, time.perf_counter() - start)
+        raise
+    # Non-streamed responses are fully read here, so the latency includes the body
+    telemetry.record_attempt(method, url, response.status_code, time.perf_counter() - start,
+                             len(response.content))
+    return response
+
+
+def request(method, url, **kwargs):
+    """Sends a rate-limited request through the shared session.
+
+    429 responses are retried up to MAX_RETRIES times, waiting as long as
+    the shared rate limiter decides (honouring Retry-After).
+
+    While replaying a cassette the response comes from the cassette, without
+    rate limiting; while recording, the final response is stored in it.
+    Every attempt, retry and rate-limiter wait is reported to telemetry.
+
+    Returns:
+        Response: The final response; still a 429 if every retry was rate limited
+
+    Raises:
+        requests.exceptions.RequestException: On network errors and timeouts
+    """
+    if replaying():
+        start = time.perf_counter()
+        response = _cassette.replay(method, url, kwargs.get('params'))
+        telemetry.record_attempt(method, url, response.status_code, time.perf_counter() - start,
+                                 len(response.content))
+        return response
+
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    for attempt in range(1, MAX_RETRIES + 1):
+        if attempt > 1:
+            telemetry.record_retry()
+        # After a 429 the limiter's wait is the backoff pause, otherwise it is pacing
+        waited = kickbase_limiter.acquire()
+        telemetry.record_sleep(telemetry.SLEEP_BACKOFF if attempt > 1 else telemetry.SLEEP_PACING, waited)
+        response = _timed_send(method, url, **kwargs)
+        if response.status_code != 429:
+            kickbase_limiter.on_success()
+            if _cassette is not None:
+                _cassette.record(method, url, kwargs.get('params'), response)
+            return response
+
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        delay = kickbase_limiter.on_rate_limited(retry_after)
+        print(f"⚠️ Rate limit hit for {url} (attempt {attempt}/{MAX_RETRIES}). Backing off {delay:.1f} seconds...")
+
+    logging.error(f"Giving up on {url} after {MAX_RETRIES} rate-limited attempts")
+    return response
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
@@ -0,0 +1,155 @@
+"""
+Load test of the crawlers against the local mock Kickbase API.
+
+Starts mock_kickbase.MockKickbaseServer in-process, points the clients at
+it (KICKBASE_API_URL, a mock token and a throwaway token cache, so no real
+credentials are used) and runs a full crawl once per concurrency setting:
+
+- players: getDetailedPlayers.fetch_player_details for every player in all_players.json
+- events: pointsAnalysis.kickbase_api.get_player_events for a players x days grid
+
+Reports wall time, requests/sec seen by the server, p50/p99 latency per
+fetched item (including client retries and rate-limiter waits), the
+client's retries and sleep time (from telemetry) and the status codes served.
+
+Usage:
+    python load_test.py --concurrency 1,4,8,16 --latency-ms 50 --rate-429 0.02 --error-rate 0.01
+    python load_test.py --target events --players 20 --days 34 --rate 0   # no client-side pacing
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import telemetry
+from mock_kickbase import MOCK_TOKEN, MockKickbaseServer
+from player_stream import read_player_ids
+from telemetry import percentile
+
+ALL_PLAYERS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'all_players.json')
+UNLIMITED_RATE = 1e9
+
+
+def _point_clients_at(server):
+    """Configures the environment for the mock; must run before importing the clients."""
+    os.environ['KICKBASE_API_URL'] = server.api_url
+    os.environ['BEARER_TOKEN'] = MOCK_TOKEN
+    os.environ['KICKBASE_EMAIL'] = 'load-test@example.com'
+    os.environ['KICKBASE_PASSWORD'] = 'mock'
+    os.environ['KICKBASE_TOKEN_CACHE'] = os.path.join(tempfile.mkdtemp(), 'token.json')
+
+
+def run_crawl(fetch, items, concurrency):
+    """Fetches every item with `concurrency` workers.
+
+    Returns:
+        tuple: (wall seconds, per-item latencies in seconds, successful items)
+    """
+    def timed(item):
+        start = time.perf_counter()
+        result = fetch(*item)
+        return time.perf_counter() - start, result is not None
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(timed, items))
+    wall = time.perf_counter() - start
+    return wall, [latency for latency, _ in outcomes], sum(ok for _, ok in outcomes)
+
+
+def load_test(server, target, items, concurrency_levels, rate):
+    """Runs the crawl at each concurrency level and returns one result row per level."""
+    import kickbase_client
+    from rate_limiter import RateLimiter
+    if target == 'players':
+        from getDetailedPlayers import fetch_player_details as fetch
+    else:
+        from pointsAnalysis.kickbase_api import get_player_events as fetch
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = []
+    for concurrency in concurrency_levels:
+        # Fresh pool and limiter so runs do not inherit each other's state
+        kickbase_client.configure(pool_size=max(concurrency, kickbase_client.DEFAULT_POOL_SIZE))
+        kickbase_client.kickbase_limiter = (
+            RateLimiter(rate=rate) if rate else
+            RateLimiter(rate=UNLIMITED_RATE, max_rate=UNLIMITED_RATE, burst=UNLIMITED_RATE))
+        server.status_counts.clear()
+        telemetry.reset()
+
+        # The crawlers print per request; keep the report readable
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            wall, latencies, ok = run_crawl(fetch, items, concurrency)
+
+        requests_served = sum(server.status_counts.values())
+        client = telemetry.build_report()
+        results.append({
+            'concurrency': concurrency,
+            'items': len(items),
+            'ok': ok,
+            'wall_s': round(wall, 3),
+            'requests': requests_served,
+            'requests_per_s': round(requests_served / wall, 1) if wall else None,
+            'p50_ms': round(percentile(latencies, 50) * 1000, 1) if latencies else None,
+            'p99_ms': round(percentile(latencies, 99) * 1000, 1) if latencies else None,
+            'retries': client['retries'],
+            'sleep_s': round(sum(client['sleep_seconds'].values()), 2),
+            'status_counts': {str(status): count for status, count in sorted(server.status_counts.items())},
+        })
+    return results
+
+
+def print_report(results):
+    print(f"{'conc':>5} {'items':>6} {'ok':>6} {'wall s':>8} {'req':>6} {'req/s':>8} "
+          f"{'p50 ms':>8} {'p99 ms':>8} {'retries':>8} {'sleep s':>8}  status")
+    for row in results:
+        print(f"{row['concurrency']:>5} {row['items']:>6} {row['ok']:>6} {row['wall_s']:>8} "
+              f"{row['requests']:>6} {row['requests_per_s']:>8} {row['p50_ms']:>8} {row['p99_ms']:>8} "
+              f"{row['retries']:>8} {row['sleep_s']:>8}  {row['status_counts']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the crawlers against a local mock API")
+    parser.add_argument("--target", choices=["players", "events"], default="players")
+    parser.add_argument("--concurrency", type=str, default="1,4,8",
+                        help="Comma-separated concurrency levels")
+    parser.add_argument("--players", type=int, default=None, help="Limit the number of players")
+    parser.add_argument("--days", type=int, default=34, help="Matchdays per player for --target events")
+    parser.add_argument("--rate", type=float, default=0,
+                        help="Client rate limit in requests/s (default 0: unlimited)")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=str, default=None, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    server = MockKickbaseServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                                rate_429=args.rate_429, error_rate=args.error_rate,
+                                retry_after=args.retry_after, seed=args.seed).start()
+    _point_clients_at(server)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    player_ids = read_player_ids(ALL_PLAYERS_FILE)[:args.players]
+    if args.target == 'players':
+        items = [(player_id,) for player_id in player_ids]
+    else:
+        items = [(player_id, day, '1') for player_id in player_ids for day in range(1, args.days + 1)]
+
+    print(f"🧪 {args.target} crawl of {len(items)} items against {server.api_url} "
+          f"(latency {args.latency_ms}±{args.jitter_ms} ms, 429 rate {args.rate_429}, error rate {args.error_rate})")
+    results = load_test(server, args.target, items,
+                        [int(level) for level in args.concurrency.split(',')], args.rate)
+    server.stop()
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'target': args.target, 'settings': vars(args), 'results': results}, f, indent=2)
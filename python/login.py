@@ -9,12 +9,13 @@ import json
 import os
 import sys
 from dotenv import load_dotenv
+import kickbase_client
 
 # Load environment variables
 load_dotenv()
 
 # Kickbase API endpoints
-LOGIN_URL = "https://api.kickbase.com/v4/user/login"
+LOGIN_URL = f"{kickbase_client.API_URL}/user/login"
 
 def login_to_kickbase(email=None, password=None):
     """
@@ -27,6 +28,21 @@ def login_to_kickbase(email=None, password=None):
     Returns:
         str: Bearer token if successful, None otherwise
     """
+    token, _ = login_with_expiry(email, password)
+    return token
+
+def login_with_expiry(email=None, password=None):
+    """
+    Login to Kickbase API and return the bearer token with its expiry
+    
+    Args:
+        email: Kickbase account email (defaults to KICKBASE_EMAIL env var)
+        password: Kickbase account password (defaults to KICKBASE_PASSWORD env var)
+    
+    Returns:
+        tuple: (token, expiry) where expiry is the raw 'tknex' value or None;
+        (None, None) if the login failed
+    """
     # Get credentials from parameters or environment
     email = email or os.getenv('KICKBASE_EMAIL')
     password = password or os.getenv('KICKBASE_PASSWORD')
@@ -34,7 +50,7 @@ def login_to_kickbase(email=None, password=None):
     if not email or not password:
         print("❌ Email or password not provided")
         print("Set KICKBASE_EMAIL and KICKBASE_PASSWORD environment variables")
-        return None
+        return None, None
     
     print(f"🔐 Attempting to login with email: {email[:3]}***{email[-10:]}")
     
@@ -50,11 +66,11 @@ def login_to_kickbase(email=None, password=None):
     headers = {
         "Content-Type": "application/json",
         "Accept": "application/json",
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36"
+        "User-Agent": kickbase_client.USER_AGENT
     }
     
     try:
-        response = requests.post(LOGIN_URL, json=payload, headers=headers, timeout=30)
+        response = kickbase_client.post(LOGIN_URL, json=payload, headers=headers, timeout=30)
         
         if response.status_code == 200:
             data = response.json()
@@ -66,25 +82,25 @@ def login_to_kickbase(email=None, password=None):
                 print(f"Token preview: {token[:20]}...")
                 
                 # Print token expiry if available
-                expiry = data.get('tknex', 'Unknown')
-                print(f"Token expires at: {expiry}")
+                expiry = data.get('tknex')
+                print(f"Token expires at: {expiry or 'Unknown'}")
                 
-                return token
+                return token, expiry
             else:
                 print("❌ Login successful but no token in response")
                 print(f"Response: {json.dumps(data, indent=2)}")
-                return None
+                return None, None
         else:
             print(f"❌ Login failed with status code: {response.status_code}")
             print(f"Response: {response.text}")
-            return None
+            return None, None
             
     except requests.exceptions.RequestException as e:
         print(f"❌ Network error during login: {e}")
-        return None
+        return None, None
     except Exception as e:
         print(f"❌ Unexpected error during login: {e}")
-        return None
+        return None, None
 
 def save_token_to_env(token):
     """
@@ -0,0 +1,188 @@
+"""
+Local stand-in for the parts of the Kickbase API the crawlers use.
+
+Serves, below /v4:
+
+- POST /user/login: returns a mock `tkn` with a `tknex` one day ahead
+- GET /competitions/{cid}/players/{pid}: the player's record from
+  detailed_players.json (unknown IDs get a copy of the first record)
+- GET /competitions/{cid}/playercenter/{pid}?dayNumber=N: the events of
+  pointsAnalysis/data/player_7226/day_N.json for every player
+
+Every request can be delayed, answered with 429 (with Retry-After) or with
+a 500, at configurable rates. Requests without a bearer token get 401.
+Point the clients at it with KICKBASE_API_URL=http://127.0.0.1:<port>/v4.
+
+Usage:
+    python mock_kickbase.py --port 8765 --latency-ms 80 --rate-429 0.02 --error-rate 0.01
+"""
+
+import argparse
+import datetime
+import glob
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PLAYERS_FILE = os.path.join(BASE_DIR, 'detailed_players.json')
+EVENTS_DIR = os.path.join(BASE_DIR, 'pointsAnalysis', 'data', 'player_7226')
+MOCK_TOKEN = 'mock-token'
+
+_PLAYER_PATH = re.compile(r'^/v4/competitions/[^/]+/players/([^/]+)$')
+_PLAYERCENTER_PATH = re.compile(r'^/v4/competitions/[^/]+/playercenter/([^/]+)$')
+_LOGIN_PATH = '/v4/user/login'
+
+
+def load_seed_data(players_file=PLAYERS_FILE, events_dir=EVENTS_DIR):
+    """Player records keyed by ID and event payloads keyed by day number."""
+    with open(players_file, 'r', encoding='utf-8') as f:
+        players = json.load(f)['players']
+    days = {}
+    for path in glob.glob(os.path.join(events_dir, 'day_*.json')):
+        day = os.path.basename(path)[len('day_'):-len('.json')]
+        with open(path, 'r', encoding='utf-8') as f:
+            days[day] = json.load(f)
+    return players, days
+
+
+class MockKickbaseServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the seed data, fault settings and request counts."""
+
+    daemon_threads = True
+
+    def __init__(self, address=('127.0.0.1', 0), latency_ms=0.0, jitter_ms=0.0,
+                 rate_429=0.0, error_rate=0.0, retry_after=1, seed=None,
+                 players_file=PLAYERS_FILE, events_dir=EVENTS_DIR):
+        super().__init__(address, _Handler)
+        self.players, self.days = load_seed_data(players_file, events_dir)
+        self._template = next(iter(self.players.values()))
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.status_counts = Counter()
+
+    @property
+    def api_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v4"
+
+    def start(self):
+        """Serves in a background thread; returns self."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def draw_fault(self):
+        """Delay in seconds and an injected status code (or None) for one request."""
+        with self._lock:
+            delay = max(0.0, self._random.gauss(self.latency_ms, self.jitter_ms)) / 1000 if self.jitter_ms \
+                else self.latency_ms / 1000
+            roll = self._random.random()
+        if roll < self.rate_429:
+            return delay, 429
+        if roll < self.rate_429 + self.error_rate:
+            return delay, 500
+        return delay, None
+
+    def player(self, player_id):
+        if player_id in self.players:
+            return self.players[player_id]
+        return {**self._template, 'i': player_id}
+
+    def count(self, status):
+        with self._lock:
+            self.status_counts[status] += 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real API
+    disable_nagle_algorithm = True  # headers and body are separate writes
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body=None, headers=None):
+        payload = json.dumps(body if body is not None else {}).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+        self.server.count(status)
+
+    def _handle(self, method):
+        url = urlparse(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+
+        delay, fault = self.server.draw_fault()
+        if delay:
+            time.sleep(delay)
+        if fault == 429:
+            return self._reply(429, {'err': 'rate limited'}, {'Retry-After': str(self.server.retry_after)})
+        if fault == 500:
+            return self._reply(500, {'err': 'injected error'})
+
+        if method == 'POST' and url.path == _LOGIN_PATH:
+            expiry = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=1)
+            return self._reply(200, {'tkn': MOCK_TOKEN, 'tknex': expiry.isoformat().replace('+00:00', 'Z')})
+
+        if not self.headers.get('Authorization', '').startswith('Bearer '):
+            return self._reply(401, {'err': 'unauthorized'})
+
+        match = _PLAYER_PATH.match(url.path)
+        if method == 'GET' and match:
+            return self._reply(200, self.server.player(match.group(1)))
+
+        match = _PLAYERCENTER_PATH.match(url.path)
+        if method == 'GET' and match:
+            day = parse_qs(url.query).get('dayNumber', [''])[0]
+            if day in self.server.days:
+                return self._reply(200, self.server.days[day])
+            return self._reply(404, {'err': f'no data for day {day}'})
+
+        return self._reply(404, {'err': 'not found'})
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local mock of the Kickbase API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean delay per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Standard deviation of the delay")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 500")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429s")
+    args = parser.parse_args()
+
+    server = MockKickbaseServer(('127.0.0.1', args.port), args.latency_ms, args.jitter_ms,
+                                args.rate_429, args.error_rate, args.retry_after)
+    print(f"🧪 Mock Kickbase API on {server.api_url} "
+          f"({len(server.players)} players, {len(server.days)} event days)")
+    print(f"   export KICKBASE_API_URL={server.api_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
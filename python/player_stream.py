@@ -0,0 +1,164 @@
+"""
+Streaming reader for player JSON files (all_players.json, detailed_players.json).
+
+Yields `(player_id, player)` pairs from the top-level "players" object one
+at a time instead of loading the whole document, so peak memory stays
+around one player record. Iteration stops reading the file as soon as the
+caller stops iterating (e.g. `break` or `itertools.islice`).
+
+Uses ijson (C backend when available) if installed; otherwise a small
+incremental parser built on `json.JSONDecoder.raw_decode`.
+
+Usage:
+    for player_id, player in iter_players('detailed_players.json', fields=('i', 'pos', 'mv')):
+        ...
+"""
+
+import json
+
+try:
+    import ijson
+except ImportError:  # optional dependency
+    ijson = None
+
+PLAYERS_KEY = 'players'
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\r\n'
+_decoder = json.JSONDecoder()
+
+
+class _IncrementalReader:
+    """Decodes JSON tokens and values from a text file read in chunks."""
+
+    def __init__(self, f):
+        self._file = f
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        chunk = self._file.read(CHUNK_SIZE)
+        if not chunk:
+            self._eof = True
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+
+    def peek(self):
+        """Returns the next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf) or self._eof:
+                return self._buf[self._pos:self._pos + 1]
+            self._fill()
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self._buf, self._pos)
+        self._pos += 1
+
+    def value(self):
+        """Decodes the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                self._fill()
+                continue
+            # A number touching the end of the buffer may continue in the next chunk
+            if end == len(self._buf) and not self._eof:
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+    def members(self):
+        """Yields (key, value) pairs of the object starting at the current position."""
+        self.expect('{')
+        if self.peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            separator = self.peek()
+            self._pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise json.JSONDecodeError("Expecting ',' delimiter", self._buf, self._pos - 1)
+
+
+def _project(player, fields):
+    if fields is None:
+        return player
+    return {field: player[field] for field in fields if field in player}
+
+
+def _iter_fallback(path, key, fields):
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _IncrementalReader(f)
+        for name in reader.members():
+            if name != key:
+                reader.value()
+                continue
+            for player_id in reader.members():
+                yield player_id, _project(reader.value(), fields)
+            return
+
+
+def _iter_ijson(path, key, fields):
+    with open(path, 'rb') as f:
+        try:
+            for player_id, player in ijson.kvitems(f, key, use_float=True):
+                yield player_id, _project(player, fields)
+        except ijson.JSONError as e:
+            raise ValueError(f"Invalid JSON in {path}: {e}") from e
+
+
+def iter_players(path, fields=None, key=PLAYERS_KEY):
+    """Lazily yields the entries of the top-level "players" object.
+
+    Args:
+        path (str): JSON file path
+        fields (iterable, optional): Only keep these keys of each player; all if None
+        key (str): Top-level key holding the players object
+
+    Yields:
+        tuple: (player_id, player dict), in file order
+
+    Raises:
+        ValueError: The file is not valid JSON (json.JSONDecodeError without ijson)
+    """
+    if fields is not None:
+        fields = tuple(fields)
+    if ijson is not None:
+        return _iter_ijson(path, key, fields)
+    return _iter_fallback(path, key, fields)
+
+
+def read_player_ids(path, key=PLAYERS_KEY):
+    """Returns all player IDs of a players file, in file order."""
+    return [player_id for player_id, _ in iter_players(path, fields=(), key=key)]
+
+
+def read_value(path, key, default=None):
+    """Reads a single top-level value (e.g. 'valid_team_ids') without keeping the rest."""
+    if ijson is not None:
+        with open(path, 'rb') as f:
+            try:
+                return next(ijson.items(f, key, use_float=True), default)
+            except ijson.JSONError as e:
+                raise ValueError(f"Invalid JSON in {path}: {e}") from e
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _IncrementalReader(f)
+        for name in reader.members():
+            value = reader.value()
+            if name == key:
+                return value
+    return default
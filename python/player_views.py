@@ -0,0 +1,158 @@
+"""
+Slim, named projections of detailed_players.json.
+
+Each view declares the fields it keeps (with their types; nested lists of
+objects declare the keys kept in each entry) and a size budget in bytes per
+player. Views are built from one snapshot and written to `public/views/`
+as compact JSON, precompressed like the frontend bundle:
+
+- market: prices and trends for market/transfer pages
+- card: what a player card shows, including the points history `ph`
+- fixtures: the team's upcoming and past matchdays (`mdsum`) without images
+
+Usage:
+    python player_views.py ../public/detailed_players.json --out ../public/views
+    python player_views.py --strict   # exit 1 when a view is over budget or dropped fields
+
+A field whose type does not match its view's schema (say the API starts
+sending `mv` as a string) is logged and left out of that record, so a
+schema drift never stops the weekly workflow.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+from frontend_bundle import write_precompressed
+from player_stream import iter_players, read_value
+
+VIEWS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'public', 'views')
+
+FIXTURE_SCHEMA = {'t1': str, 't2': str, 't1g': int, 't2g': int, 'day': int, 'md': str, 'cur': bool, 'mdst': int}
+
+VIEWS = {
+    'market': {
+        'schema': {'i': str, 'fn': str, 'ln': str, 'tid': str, 'pos': int, 'st': int,
+                   'mv': int, 'tfhmvt': int, 'mvt': int, 'ap': int, 'tp': int},
+        'max_bytes_per_player': 160,
+    },
+    'card': {
+        'schema': {'i': str, 'fn': str, 'ln': str, 'tid': str, 'tn': str, 'pos': int, 'st': int,
+                   'stxt': str, 'tp': int, 'ap': int, 'mv': int, 'g': int, 'a': int,
+                   'ph': [{'hp': bool, 'p': int}]},
+        'max_bytes_per_player': 300,
+    },
+    'fixtures': {
+        'schema': {'i': str, 'tid': str, 'mdsum': [FIXTURE_SCHEMA]},
+        'max_bytes_per_player': 400,
+    },
+}
+
+
+_DROPPED = object()
+
+
+def _drop(path, expected, value, dropped):
+    logging.warning(f"{path}: expected {expected}, got {type(value).__name__}; dropped")
+    dropped.append(path)
+    return _DROPPED
+
+
+def _project(value, schema, path, dropped):
+    """Keeps the schema's keys of `value`; values of another type are dropped (None is allowed)."""
+    if value is None:
+        return None
+    if isinstance(schema, list):
+        if not isinstance(value, list):
+            return _drop(path, 'a list', value, dropped)
+        entries = (_project(entry, schema[0], f"{path}[]", dropped) for entry in value)
+        return [entry for entry in entries if entry is not _DROPPED]
+    if isinstance(schema, dict):
+        if not isinstance(value, dict):
+            return _drop(path, 'an object', value, dropped)
+        fields = ((key, _project(value[key], key_schema, f"{path}.{key}", dropped))
+                  for key, key_schema in schema.items() if key in value)
+        return {key: field for key, field in fields if field is not _DROPPED}
+    if not isinstance(value, schema):
+        return _drop(path, schema.__name__, value, dropped)
+    return value
+
+
+def project_player(player, view, dropped=None):
+    """One player's record in the given view.
+
+    Args:
+        dropped (list, optional): Collects the paths of fields left out
+            because their type does not match the schema
+    """
+    record = _project(player, VIEWS[view]['schema'], f"{view}:{player.get('i')}",
+                      dropped if dropped is not None else [])
+    return {} if record is _DROPPED else record
+
+
+def build_view(players, view, date=None, dropped=None):
+    """The view document for all players: {'view', 'date', 'players': [records]}."""
+    return {'view': view, 'date': date,
+            'players': [project_player(player, view, dropped) for player in players.values()]}
+
+
+def write_views(players, views_dir=VIEWS_DIR, date=None, views=None):
+    """Writes the named views and checks each against its size budget.
+
+    Args:
+        players (dict): Player records keyed by player ID
+        views_dir (str): Output directory
+        date (str, optional): Snapshot date recorded in each view
+        views (iterable, optional): View names to write; all if None
+
+    Returns:
+        dict: Per view: bytes, budget_bytes, over_budget, dropped_fields (values
+        left out for a type mismatch) and parse_ms (time to json.loads the
+        written file)
+    """
+    os.makedirs(views_dir, exist_ok=True)
+    report = {}
+    for view in views or VIEWS:
+        dropped = []
+        payload = json.dumps(build_view(players, view, date, dropped), ensure_ascii=False,
+                             separators=(',', ':')).encode('utf-8')
+        sizes = write_precompressed(os.path.join(views_dir, f"{view}.json"), payload)
+        start = time.perf_counter()
+        json.loads(payload)
+        budget = VIEWS[view]['max_bytes_per_player'] * max(len(players), 1)
+        report[view] = {**sizes, 'budget_bytes': budget, 'over_budget': len(payload) > budget,
+                        'dropped_fields': len(dropped),
+                        'parse_ms': round((time.perf_counter() - start) * 1000, 2)}
+        if report[view]['over_budget']:
+            logging.warning(f"View '{view}' is {len(payload)} bytes, over its budget of {budget}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write slim projections of detailed players")
+    parser.add_argument("input", nargs="?", default=os.path.join('..', 'public', 'detailed_players.json'))
+    parser.add_argument("--out", default=VIEWS_DIR, help="Output directory (default: public/views)")
+    parser.add_argument("--view", action="append", choices=sorted(VIEWS), help="Only write this view (repeatable)")
+    parser.add_argument("--strict", action="store_true",
+                        help="Exit with status 1 if a view is over budget or had to drop mistyped fields")
+    args = parser.parse_args()
+
+    players = dict(iter_players(args.input))
+    start = time.perf_counter()
+    with open(args.input, 'rb') as f:
+        json.loads(f.read())
+    print(f"📦 {args.input}: {os.path.getsize(args.input)} bytes, "
+          f"parse {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    report = write_views(players, args.out, read_value(args.input, 'date'), args.view)
+    for view, info in report.items():
+        status = "⚠️ over budget" if info['over_budget'] else "✅"
+        print(f"{status} {view}: {info['bytes']} bytes ({info['gz']} gzipped), "
+              f"budget {info['budget_bytes']}, parse {info['parse_ms']} ms")
+        if info['dropped_fields']:
+            print(f"⚠️ {view}: dropped {info['dropped_fields']} fields with an unexpected type")
+    if args.strict and any(info['over_budget'] or info['dropped_fields'] for info in report.values()):
+        sys.exit(1)
@@ -0,0 +1,15 @@
+"""
+Point event crawling and analysis for Kickbase players.
+
+The crawler building blocks this package uses (kickbase_client, token_cache,
+telemetry, cassette, player_stream) are top-level modules in python/, next
+to this package, not part of it. python/ is put on sys.path here, once, so
+`import kickbase_client` resolves from any working directory, for example
+when the package is imported from a notebook elsewhere in the repository.
+"""
+import os
+import sys
+
+_PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PYTHON_DIR not in sys.path:
+    sys.path.insert(0, _PYTHON_DIR)
@@ -1,49 +1,53 @@
+import logging
 from collections import Counter, defaultdict
+import numpy as np
+import pandas as pd
+from .config import DAY_END, DAY_START
 from .mappings import EVENT_ID_TO_NAME
+from .results import DaysRangeAnalysis, EventAnalysis
+from .taxonomy import CATEGORY_NAMES, UNKNOWN_CATEGORY, categorize, category_names
 
+logger = logging.getLogger(__name__)
 
-def analyze_events(data):
-    """Analyzes the event data, counts events, and returns counts."""
-    if not data or 'events' not in data or not isinstance(data['events'], list):
-        print("Error: Invalid or missing 'events' data in the response.")
-        return None
 
-    # Corrected key: Use 'eti' instead of 'eventId'
-    event_ids = [event.get('eti') for event in data['events']
-                 if event.get('eti') is not None]
+def _event_name(event_id):
+    return EVENT_ID_TO_NAME.get(event_id, f"Unknown Event ({event_id})")
 
-    if not event_ids:
-        print("No event type IDs ('eti') found in the data.")
-        return Counter()
 
-    event_names = [EVENT_ID_TO_NAME.get(
-        eid, f"Unknown Event ({eid})") for eid in event_ids]
-    event_counts = Counter(event_names)
+def analyze_events(data):
+    """Counts events and sums their points per event name.
 
-    print("\n--- Event Analysis ---")
-    for name, count in event_counts.items():
-        print(f"- {name}: {count}")
-    print("--------------------\n")
+    Args:
+        data (dict): One day's playercenter response
 
-    # Calculate total points for each event type
+    Returns:
+        EventAnalysis: Counts and points per event name, or None if the
+        data has no valid 'events' list
+    """
+    if not data or 'events' not in data or not isinstance(data['events'], list):
+        logger.warning("Invalid or missing 'events' data in the response.")
+        return None
+
+    # Single pass; each distinct 'eti' is resolved to its name once
+    names = {}
+    event_counts = Counter()
     event_points = defaultdict(int)
     for event in data['events']:
         event_id = event.get('eti')
-        points = event.get('p', 0)
-        if event_id is not None:
-            event_name = EVENT_ID_TO_NAME.get(
-                event_id, f"Unknown Event ({event_id})")
-            event_points[event_name] += points
+        if event_id is None:
+            continue
+        name = names.get(event_id)
+        if name is None:
+            name = names[event_id] = _event_name(event_id)
+        event_counts[name] += 1
+        event_points[name] += event.get('p', 0)
 
-    print("\n--- Event Points Analysis ---")
-    for name, total_points in event_points.items():
-        print(f"- {name}: {total_points} points")
-    print("-----------------------------\n")
+    if not event_counts:
+        logger.debug("No event type IDs ('eti') found in the data.")
+    return EventAnalysis(counts=dict(event_counts), points=dict(event_points))
 
-    return dict(event_points)
 
-
-def analyze_days_range(all_days_data, day_start=1, day_end=30):
+def analyze_days_range(all_days_data, day_start=DAY_START, day_end=DAY_END):
     """Analyzes events across multiple days from the all_days_data structure.
 
     Args:
@@ -52,36 +56,129 @@ def analyze_days_range(all_days_data, day_start=1, day_end=30):
         day_end (int): Last day to include in analysis
 
     Returns:
-        dict: Aggregated event points
+        DaysRangeAnalysis: Points per day and in total, or None if no day
+        in the range has data
     """
     if not all_days_data or "days" not in all_days_data:
-        print("Error: Invalid or missing days data")
+        logger.warning("Invalid or missing days data")
         return None
 
+    result = DaysRangeAnalysis(day_start=day_start, day_end=day_end)
     total_event_points = defaultdict(int)
-    events_by_day = {}
 
     for day in range(day_start, day_end + 1):
-        day_str = str(day)
-        if day_str in all_days_data["days"]:
-            day_data = all_days_data["days"][day_str]
-            # Analyze this day's data
-            day_points = analyze_events(day_data)
-            if day_points:
-                events_by_day[day] = day_points
-                # Accumulate points
-                for event_name, points in day_points.items():
-                    total_event_points[event_name] += points
-
-    if not events_by_day:
-        print(f"No data found for days {day_start}-{day_end}")
+        day_data = all_days_data["days"].get(str(day))
+        if day_data is None:
+            continue
+        day_analysis = analyze_events(day_data)
+        if day_analysis and day_analysis.points:
+            result.points_by_day[day] = day_analysis.points
+            for event_name, points in day_analysis.points.items():
+                total_event_points[event_name] += points
+
+    if not result.points_by_day:
+        logger.info(f"No data found for days {day_start}-{day_end}")
         return None
 
-    # Print summary of all days
-    print("\n=== Summary Across All Days ===")
-    for event_name, total_points in sorted(total_event_points.items(),
-                                           key=lambda x: x[1], reverse=True):
-        print(f"- {event_name}: {total_points} points")
-    print("=============================\n")
+    result.total_points = dict(total_event_points)
+    return result
+
+
+def format_points_table(title, event_points, sort=False):
+    """Renders event points as the text table the CLI prints."""
+    items = event_points.items()
+    if sort:
+        items = sorted(items, key=lambda x: x[1], reverse=True)
+    lines = [f"\n--- {title} ---"]
+    lines += [f"- {name}: {points} points" for name, points in items]
+    lines.append("-" * (len(title) + 8) + "\n")
+    return "\n".join(lines)
 
-    return dict(total_event_points)
+
+def events_frame_from_days(all_days_data, player_id=None):
+    """Converts an all_days structure into the typed frame used by aggregate_events.
+
+    Args:
+        all_days_data (dict): The all_days data loaded from storage
+        player_id (str, optional): Player ID to put in the player_id column
+
+    Returns:
+        pandas.DataFrame: Columns player_id, day, eti, p, one row per event
+    """
+    days, etis, points = [], [], []
+    for day_str, day_data in (all_days_data or {}).get("days", {}).items():
+        for event in day_data.get("events") or []:
+            if event.get("eti") is not None:
+                days.append(int(day_str))
+                etis.append(event["eti"])
+                points.append(event.get("p", 0))
+    return pd.DataFrame({
+        "player_id": pd.Categorical([str(player_id)] * len(days)),
+        "day": np.array(days, dtype=np.int16),
+        "eti": np.array(etis, dtype=np.int32),
+        "p": np.array(points, dtype=np.int32),
+    })
+
+
+def aggregate_events(events, by=("player_id", "day")):
+    """Counts events and sums points per group and event type, without printing.
+
+    Event codes are mapped to integer categories through the compiled
+    taxonomy, each (group, category) pair is packed into one integer key and
+    the reduction is a single `np.bincount`. Names are attached at the end;
+    codes missing from the mapping keep their "Unknown Event (<eti>)" label.
+
+    Args:
+        events (pandas.DataFrame): Frame from load_events_frame or events_frame_from_days
+        by (tuple): Grouping columns besides the event, e.g. ("player_id",) for
+            season totals or () for league-wide totals
+
+    Returns:
+        pandas.DataFrame: Indexed by (*by, "event"), columns count and points
+    """
+    by = list(by)
+    categories = categorize(events["eti"].to_numpy())
+    known = categories != UNKNOWN_CATEGORY
+
+    # Pack the group columns and the category into one integer key
+    key = np.zeros(int(known.sum()), dtype=np.int64)
+    uniques = []
+    for column in by:
+        codes, values = pd.factorize(events[column].to_numpy()[known])
+        key = key * len(values) + codes
+        uniques.append(values)
+    key = key * len(CATEGORY_NAMES) + categories[known]
+
+    keys, inverse = np.unique(key, return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(keys))
+    points = np.bincount(inverse, weights=events["p"].to_numpy()[known],
+                         minlength=len(keys))
+
+    keys, category = np.divmod(keys, len(CATEGORY_NAMES))
+    columns = {}
+    for column, values in reversed(list(zip(by, uniques))):
+        keys, codes = np.divmod(keys, len(values))
+        columns[column] = values[codes]
+    result = pd.DataFrame({**{column: columns[column] for column in by},
+                           "event": category_names(category),
+                           "count": counts.astype("int64"),
+                           "points": points.astype("int64")})
+
+    unknown = events[~known]
+    if not unknown.empty:
+        unknown_part = (unknown.groupby(by + ["eti"], observed=True)["p"]
+                        .agg(count="size", points="sum")
+                        .reset_index())
+        unknown_part["event"] = [f"Unknown Event ({eti})" for eti in unknown_part["eti"]]
+        result = pd.concat([result, unknown_part[by + ["event", "count", "points"]]],
+                           ignore_index=True)
+
+    return (result.astype({"count": "int64", "points": "int64"})
+            .set_index(by + ["event"])
+            .sort_index())
+
+
+def season_breakdown(events):
+    """Season totals per player and event type, highest points first."""
+    result = aggregate_events(events, by=("player_id",))
+    return result.sort_values("points", ascending=False)
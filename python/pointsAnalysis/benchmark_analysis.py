@@ -0,0 +1,92 @@
+"""
+Per-player cost of the analysis API, with and without console output.
+
+"printing" runs the frozen pre-change analyze_days_range from
+_legacy_analysis.py, which prints every day's event and point tables and the
+season summary. "quiet" is the current structured-return API.
+Output goes to a real stream: a pipe drained by a reader thread (default),
+a temporary file, or the terminal. Players are synthetic, so no event store
+is needed.
+
+Usage:
+    python -m pointsAnalysis.benchmark_analysis --players 500 --days 34
+    python -m pointsAnalysis.benchmark_analysis --output console   # print to the real terminal
+"""
+import argparse
+import contextlib
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from . import _legacy_analysis
+from .analysis import analyze_days_range
+from .mappings import EVENT_ID_TO_NAME
+
+OUTPUTS = ('pipe', 'file', 'console')
+
+
+def synthetic_player(days, events_per_day, rng):
+    """One player's all_days structure with random events."""
+    event_ids = list(EVENT_ID_TO_NAME)
+    return {"days": {
+        str(day): {"events": [{"eti": rng.choice(event_ids), "p": rng.randint(-50, 100)}
+                              for _ in range(events_per_day)]}
+        for day in range(1, days + 1)
+    }}
+
+
+@contextlib.contextmanager
+def output_stream(kind):
+    """A text stream for stdout: a drained pipe, a temporary file or the terminal."""
+    if kind == 'console':
+        yield sys.stdout
+    elif kind == 'file':
+        with tempfile.TemporaryFile('w+', encoding='utf-8') as f:
+            yield f
+    else:
+        read_fd, write_fd = os.pipe()
+        reader = threading.Thread(target=_drain, args=(read_fd,), daemon=True)
+        reader.start()
+        with open(write_fd, 'w', encoding='utf-8', buffering=1) as f:  # line-buffered, like a terminal
+            yield f
+        reader.join()
+
+
+def _drain(read_fd):
+    with open(read_fd, 'rb', buffering=0) as f:
+        while f.read(65536):
+            pass
+
+
+def run(label, analyze, players, days, output):
+    with output_stream(output) as out, contextlib.redirect_stdout(out):
+        start = time.perf_counter()
+        for all_days_data in players:
+            analyze(all_days_data, 1, days)
+        out.flush()
+        elapsed = time.perf_counter() - start
+    per_player_ms = elapsed / len(players) * 1000
+    print(f"{label:>9}: {elapsed:.3f}s total, {per_player_ms:.3f} ms/player", file=sys.stderr)
+    return per_player_ms
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the analysis API")
+    parser.add_argument("--players", type=int, default=200)
+    parser.add_argument("--days", type=int, default=34)
+    parser.add_argument("--events-per-day", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", choices=OUTPUTS, default='pipe',
+                        help="Where printed output goes (default: a pipe drained by a reader thread)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    players = [synthetic_player(args.days, args.events_per_day, rng) for _ in range(args.players)]
+    print(f"{args.players} players x {args.days} days x {args.events_per_day} events, output to {args.output}",
+          file=sys.stderr)
+    before = run("printing", _legacy_analysis.analyze_days_range, players, args.days, args.output)
+    after = run("quiet", analyze_days_range, players, args.days, args.output)
+    print(f"Speed-up: {before / after:.1f}x per player", file=sys.stderr)
@@ -1,8 +1,64 @@
+import atexit
 import json
-import os
-import sys
+import logging
+import sqlite3
+import threading
 from pathlib import Path
 from collections import defaultdict
+from .config import DAY_END, DAY_START
+from .mappings import EVENT_ID_TO_NAME
+from .results import PlayerStats
+
+logger = logging.getLogger(__name__)
+
+EVENTS_DB_NAME = "events.sqlite"
+
+# Event keys stored as columns; anything else (ke, cei, ddi, ...) goes to `extra`
+EVENT_COLUMNS = ["ei", "eti", "p", "mt", "att"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS days (
+    player_id TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (player_id, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS events (
+    player_id TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    ei TEXT,
+    eti INTEGER,
+    p INTEGER,
+    mt INTEGER,
+    att INTEGER,
+    extra TEXT,
+    PRIMARY KEY (player_id, day, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_events_eti ON events (player_id, eti);
+CREATE TABLE IF NOT EXISTS event_totals (
+    player_id TEXT NOT NULL,
+    eti INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    cum_count INTEGER NOT NULL,
+    cum_points INTEGER NOT NULL,
+    PRIMARY KEY (player_id, eti, day)
+) WITHOUT ROWID;
+"""
+
+# Day header `mst` once the match is over (0/1 before and during it)
+MATCH_FINISHED = 2
+
+# Bumped when event_totals has to be rebuilt from the raw events
+TOTALS_VERSION = 1
+
+_local = threading.local()
+_db_path = None  # set_database_path() override; None means data/events.sqlite
+_connections_lock = threading.Lock()
+_connections = []  # every open per-thread connection, so close() can reach them all
+_generation = 0  # bumped by close(); thread-local connections of older generations are stale
 
 
 def ensure_data_directory():
@@ -14,126 +70,366 @@ def ensure_data_directory():
     return data_dir
 
 
+def _connect():
+    """Returns this thread's connection to the event store, creating it on first use.
+
+    A new store is seeded from the legacy player_<id>/day_<n>.json files.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.generation == _generation:
+        return conn
+
+    db_path = Path(_db_path) if _db_path else ensure_data_directory() / EVENTS_DB_NAME
+    is_new = not db_path.exists()
+    # Only this thread uses the connection; check_same_thread=False lets close() run from any thread
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.executescript(_SCHEMA)
+    with _connections_lock:
+        _connections.append(conn)
+        _local.conn, _local.generation = conn, _generation
+    if is_new and not _db_path:
+        import_json_files()
+    if conn.execute("PRAGMA user_version").fetchone()[0] < TOTALS_VERSION:
+        rebuild_event_totals()
+    return conn
+
+
+def set_database_path(path=None):
+    """Uses another event store file (e.g. a scratch database for benchmarks).
+
+    Only the default store is seeded from legacy JSON files. Open
+    connections of all threads are closed; each thread reconnects on its
+    next call. Do not call while other threads are using the store.
+
+    Args:
+        path (str or Path, optional): SQLite file; None restores data/events.sqlite
+    """
+    global _db_path
+    close()
+    _db_path = path
+
+
+def close():
+    """Closes the event store connections of all threads (also run at exit).
+
+    Threads reconnect on their next call, so this is safe to call between runs.
+    """
+    global _generation
+    with _connections_lock:
+        connections = list(_connections)
+        _connections.clear()
+        _generation += 1
+    for conn in connections:
+        conn.close()
+
+
+atexit.register(close)
+
+
+def _event_row(player_id, day, seq, event):
+    extra = {key: value for key, value in event.items()
+             if key not in EVENT_COLUMNS}
+    return (str(player_id), day, seq,
+            *(event.get(key) for key in EVENT_COLUMNS),
+            json.dumps(extra) if extra else None)
+
+
+def _row_event(row):
+    event = {key: value for key, value in zip(EVENT_COLUMNS, row[:-1])
+             if value is not None}
+    if row[-1]:
+        event.update(json.loads(row[-1]))
+    return event
+
+
+def save_player_events_batch(records):
+    """Saves many (player_id, day_number, data) records in one transaction.
+
+    Re-saving a day replaces its previous events.
+
+    Args:
+        records (iterable): (player_id, day_number, data) tuples, where data
+            is the raw playercenter response for that day
+    """
+    conn = _connect()
+    day_rows, event_rows, keys = [], [], []
+    for player_id, day_number, data in records:
+        day = int(day_number)
+        keys.append((str(player_id), day))
+        header = {key: value for key, value in data.items() if key != "events"}
+        day_rows.append((str(player_id), day, json.dumps(header)))
+        event_rows.extend(_event_row(player_id, day, seq, event)
+                          for seq, event in enumerate(data.get("events") or []))
+
+    with conn:
+        conn.executemany(
+            "DELETE FROM events WHERE player_id = ? AND day = ?", keys)
+        conn.executemany(
+            "INSERT OR REPLACE INTO days VALUES (?, ?, ?)", day_rows)
+        conn.executemany(
+            "INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", event_rows)
+        for player_id, day in keys:
+            _fold_day_totals(conn, player_id, day)
+    return len(keys)
+
+
+def _fold_day_totals(conn, player_id, day):
+    """Brings event_totals up to date after one (player, day) was (re)written.
+
+    Only the difference to the previously stored day is applied: the day's
+    row is replaced and the running sums of all later days shift by it.
+    """
+    # `+eti` keeps SQLite on the primary key; otherwise it walks idx_events_eti
+    # through the player's whole history to avoid sorting one day's events
+    new = {eti: (count, points) for eti, count, points in conn.execute(
+        "SELECT eti, COUNT(*), SUM(COALESCE(p, 0)) FROM events "
+        "WHERE player_id = ? AND day = ? AND eti IS NOT NULL GROUP BY +eti", (player_id, day))}
+    old = {eti: (count, points) for eti, count, points in conn.execute(
+        "SELECT eti, count, points FROM event_totals WHERE player_id = ? AND day = ?",
+        (player_id, day))}
+
+    for eti in new.keys() | old.keys():
+        count, points = new.get(eti, (0, 0))
+        delta_count = count - old.get(eti, (0, 0))[0]
+        delta_points = points - old.get(eti, (0, 0))[1]
+        if eti not in old:
+            previous = conn.execute(
+                "SELECT cum_count, cum_points FROM event_totals "
+                "WHERE player_id = ? AND eti = ? AND day < ? ORDER BY day DESC LIMIT 1",
+                (player_id, eti, day)).fetchone() or (0, 0)
+            conn.execute(
+                "INSERT INTO event_totals VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (player_id, eti, day, count, points, previous[0], previous[1]))
+        else:
+            conn.execute(
+                "UPDATE event_totals SET count = ?, points = ? "
+                "WHERE player_id = ? AND eti = ? AND day = ?",
+                (count, points, player_id, eti, day))
+        if delta_count or delta_points:
+            conn.execute(
+                "UPDATE event_totals SET cum_count = cum_count + ?, cum_points = cum_points + ? "
+                "WHERE player_id = ? AND eti = ? AND day >= ?",
+                (delta_count, delta_points, player_id, eti, day))
+
+
+def rebuild_event_totals():
+    """Recomputes the whole event_totals cache from the raw events."""
+    conn = _connect()
+    with conn:
+        conn.execute("DELETE FROM event_totals")
+        conn.execute(
+            "INSERT INTO event_totals "
+            "SELECT player_id, eti, day, count, points, "
+            "SUM(count) OVER running, SUM(points) OVER running FROM ("
+            "  SELECT player_id, eti, day, COUNT(*) AS count, SUM(COALESCE(p, 0)) AS points"
+            "  FROM events WHERE eti IS NOT NULL GROUP BY player_id, eti, day) "
+            "WINDOW running AS (PARTITION BY player_id, eti ORDER BY day)")
+        conn.execute(f"PRAGMA user_version = {TOTALS_VERSION}")
+    logger.info(f"Rebuilt event totals cache in {EVENTS_DB_NAME}")
+
+
 def save_player_events(player_id, day_number, data):
-    """Saves player event data to a JSON file.
+    """Saves player event data to the event store.
 
     Args:
         player_id (str): The player's ID
         day_number (str or int): The day number of the event
         data (dict): The player event data to save
     """
-    data_dir = ensure_data_directory()
-    player_dir = data_dir / f"player_{player_id}"
-    player_dir.mkdir(exist_ok=True)
+    save_player_events_batch([(player_id, day_number, data)])
+    logger.debug(f"Data for player {player_id} on day {day_number} saved to {EVENTS_DB_NAME}")
 
-    # Save daily data
-    file_path = player_dir / f"day_{day_number}.json"
-    with open(file_path, 'w') as f:
-        json.dump(data, f, indent=2)
 
-    print(f"Data saved to {file_path}")
+def import_json_files(data_dir=None):
+    """Imports legacy player_<id>/day_<n>.json files into the event store.
 
-    # Update the all_days summary file
-    summary_file = player_dir / "all_days.json"
+    Args:
+        data_dir (Path, optional): Directory holding the player_<id> folders
 
-    if summary_file.exists():
-        # Load existing summary
-        with open(summary_file, 'r') as f:
-            all_data = json.load(f)
-    else:
-        # Create new summary structure
-        all_data = {"days": {}}
+    Returns:
+        int: Number of days imported
+    """
+    data_dir = Path(data_dir) if data_dir else ensure_data_directory()
+    records = []
+    for file_path in sorted(data_dir.glob("player_*/day_*.json")):
+        player_id = file_path.parent.name[len("player_"):]
+        day_number = file_path.stem[len("day_"):]
+        with open(file_path, 'r') as f:
+            records.append((player_id, day_number, json.load(f)))
+    if records:
+        save_player_events_batch(records)
+        logger.info(f"Imported {len(records)} days from JSON files into {EVENTS_DB_NAME}")
+    return len(records)
+
+
+def _load_days(conn, player_id, day_start=None, day_end=None):
+    query = "SELECT day, data FROM days WHERE player_id = ?"
+    params = [str(player_id)]
+    if day_start is not None:
+        query += " AND day BETWEEN ? AND ?"
+        params += [day_start, day_end]
+    days = {day: json.loads(data) for day, data in conn.execute(query + " ORDER BY day", params)}
+    if not days:
+        return days
+
+    query = f"SELECT day, {', '.join(EVENT_COLUMNS)}, extra FROM events WHERE player_id = ?"
+    for day in days:
+        days[day]["events"] = []
+    for row in conn.execute(query + (" AND day BETWEEN ? AND ?" if day_start is not None else "")
+                            + " ORDER BY day, seq", params):
+        days[row[0]]["events"].append(_row_event(row[1:]))
+    return days
+
+
+def stored_player_days(finished_only=False):
+    """Returns the set of (player_id, day) pairs already in the event store.
+
+    Args:
+        finished_only (bool): Only days whose match was over when they were
+            fetched (header `mst` == MATCH_FINISHED); payloads fetched before
+            or during the match are incomplete
+    """
+    query = "SELECT player_id, day FROM days"
+    if finished_only:
+        return set(_connect().execute(query + " WHERE json_extract(data, '$.mst') = ?", (MATCH_FINISHED,)))
+    return set(_connect().execute(query))
 
-    # Add or update the current day's data
-    all_data["days"][str(day_number)] = data
 
-    # Save updated summary
-    with open(summary_file, 'w') as f:
-        json.dump(all_data, f, indent=2)
+def load_events_frame(player_ids=None, day_start=DAY_START, day_end=DAY_END):
+    """Loads events of many players and days into one typed DataFrame.
 
-    print(f"Summary data updated in {summary_file}")
+    Args:
+        player_ids (list, optional): Players to load; all stored players if None
+        day_start (int): First day to include
+        day_end (int): Last day to include
+
+    Returns:
+        pandas.DataFrame: Columns player_id (category), day (int16),
+        eti (int32) and p (int32), one row per event
+    """
+    import numpy as np
+    import pandas as pd
+
+    query = ("SELECT player_id, day, eti, COALESCE(p, 0) FROM events "
+             "WHERE day BETWEEN ? AND ? AND eti IS NOT NULL")
+    params = [day_start, day_end]
+    if player_ids is not None:
+        player_ids = [str(player_id) for player_id in player_ids]
+        query += f" AND player_id IN ({', '.join('?' * len(player_ids))})"
+        params += player_ids
+
+    rows = _connect().execute(query, params).fetchall()
+    columns = list(zip(*rows)) if rows else [(), (), (), ()]
+    return pd.DataFrame({
+        "player_id": pd.Categorical(columns[0]),
+        "day": np.array(columns[1], dtype=np.int16),
+        "eti": np.array(columns[2], dtype=np.int32),
+        "p": np.array(columns[3], dtype=np.int32),
+    })
 
 
 def load_player_events(player_id, day_number=None):
-    """Loads player event data from a JSON file.
+    """Loads player event data from the event store.
 
     Args:
         player_id (str): The player's ID
         day_number (str or int, optional): The specific day to load. If None, loads all days.
 
     Returns:
-        dict: The player event data or None if file doesn't exist
+        dict: The player event data or None if there is no data
     """
-    data_dir = ensure_data_directory()
-    player_dir = data_dir / f"player_{player_id}"
-
-    if not player_dir.exists():
-        print(f"No data directory for player {player_id}")
-        return None
+    conn = _connect()
 
     if day_number is not None:
         # Load specific day
-        file_path = player_dir / f"day_{day_number}.json"
-        if not file_path.exists():
-            print(f"No data for player {player_id} on day {day_number}")
+        days = _load_days(conn, player_id, int(day_number), int(day_number))
+        if not days:
+            logger.debug(f"No data for player {player_id} on day {day_number}")
             return None
-
-        with open(file_path, 'r') as f:
-            return json.load(f)
+        return days[int(day_number)]
     else:
-        # Load all days summary
-        summary_file = player_dir / "all_days.json"
-        if not summary_file.exists():
-            print(f"No summary data for player {player_id}")
+        # Load all days, in the same shape as the former all_days.json
+        days = _load_days(conn, player_id)
+        if not days:
+            logger.debug(f"No data for player {player_id}")
             return None
+        return {"days": {str(day): data for day, data in days.items()}}
 
-        with open(summary_file, 'r') as f:
-            return json.load(f)
 
+def _running_totals(conn, player_id, day):
+    """Running (count, points) per eti of one player up to and including `day`."""
+    return {eti: (cum_count, cum_points) for eti, cum_count, cum_points in conn.execute(
+        "SELECT t.eti, t.cum_count, t.cum_points FROM event_totals t "
+        "WHERE t.player_id = ? AND t.day = ("
+        "  SELECT MAX(day) FROM event_totals "
+        "  WHERE player_id = t.player_id AND eti = t.eti AND day <= ?)",
+        (player_id, day))}
 
-def aggregate_player_stats(player_id, day_start=1, day_end=30):
-    """Aggregates player statistics across multiple days.
 
-    Args:
-        player_id (str): The player's ID
-        day_start (int): First day to include
-        day_end (int): Last day to include
+def event_totals_range(player_id, day_start=DAY_START, day_end=DAY_END):
+    """Count and points per event type of one player over a day range.
+
+    Answered from the running sums in event_totals: the totals up to
+    `day_end` minus the totals up to `day_start - 1`.
 
     Returns:
-        dict: Aggregated event points or None if no data found
+        dict: {eti: (count, points)} for event types that occurred in the range
     """
-    data = load_player_events(player_id)
-    if not data or "days" not in data:
-        return None
+    conn = _connect()
+    end = _running_totals(conn, str(player_id), day_end)
+    before = _running_totals(conn, str(player_id), day_start - 1)
+    totals = {}
+    for eti, (count, points) in end.items():
+        count -= before.get(eti, (0, 0))[0]
+        points -= before.get(eti, (0, 0))[1]
+        if count:
+            totals[eti] = (count, points)
+    return totals
 
-    # Initialize counters
-    total_event_points = defaultdict(int)
-    days_processed = []
 
-    # Process each day in the specified range
-    for day in range(day_start, day_end + 1):
-        day_str = str(day)
-        if day_str in data["days"]:
-            day_data = data["days"][day_str]
+def daily_player_points(player_id, day_start=DAY_START, day_end=DAY_END):
+    """Points per event name for each stored day of one player, from the totals cache.
+
+    Returns:
+        dict: {day: {event_name: points}}
+    """
+    points_by_day = defaultdict(lambda: defaultdict(int))
+    for day, eti, points in _connect().execute(
+            "SELECT day, eti, points FROM event_totals "
+            "WHERE player_id = ? AND day BETWEEN ? AND ? AND count > 0 ORDER BY day",
+            (str(player_id), day_start, day_end)):
+        points_by_day[day][EVENT_ID_TO_NAME.get(eti, f"Unknown Event ({eti})")] += points
+    return {day: dict(day_points) for day, day_points in points_by_day.items()}
+
 
-            # Process events for this day
-            if "events" in day_data:
-                for event in day_data["events"]:
-                    event_id = event.get("eti")
-                    points = event.get("p", 0)
+def aggregate_player_stats(player_id, day_start=DAY_START, day_end=DAY_END):
+    """Aggregates player statistics across multiple days.
 
-                    if event_id is not None:
-                        from .mappings import EVENT_ID_TO_NAME
-                        event_name = EVENT_ID_TO_NAME.get(
-                            event_id, f"Unknown Event ({event_id})")
-                        total_event_points[event_name] += points
+    Args:
+        player_id (str): The player's ID
+        day_start (int): First day to include
+        day_end (int): Last day to include
 
-            days_processed.append(day)
+    Returns:
+        PlayerStats: Days found and aggregated event points, or None if no data found
+    """
+    conn = _connect()
+    days_processed = [row[0] for row in conn.execute(
+        "SELECT day FROM days WHERE player_id = ? AND day BETWEEN ? AND ? ORDER BY day",
+        (str(player_id), day_start, day_end))]
 
     if not days_processed:
-        print(
+        logger.debug(
             f"No data found for player {player_id} in days {day_start}-{day_end}")
         return None
 
-    print(f"Processed data for player {player_id} from days: {days_processed}")
-    return dict(total_event_points)
+    # Event types that share a name are merged
+    total_event_points = defaultdict(int)
+    for event_id, (_, points) in event_totals_range(player_id, day_start, day_end).items():
+        event_name = EVENT_ID_TO_NAME.get(
+            event_id, f"Unknown Event ({event_id})")
+        total_event_points[event_name] += points
+
+    logger.debug(f"Processed data for player {player_id} from days: {days_processed}")
+    return PlayerStats(player_id=str(player_id), days_processed=days_processed,
+                       total_points=dict(total_event_points))
@@ -1,9 +1,20 @@
-from .config import PLAYER_ID, DAY_NUMBER, COMPETITION_ID, BASE_URL
-from .kickbase_api import get_player_events
-from .analysis import analyze_events, analyze_days_range
+from .config import PLAYER_ID, DAY_NUMBER, COMPETITION_ID, BASE_URL, DAY_START, DAY_END
+from .kickbase_api import MissingTokenError, get_player_events
+from .analysis import format_points_table, season_breakdown
 from .visualization import plot_event_counts
-from .data_storage import save_player_events, load_player_events, aggregate_player_stats
+from .data_storage import save_player_events_batch, aggregate_player_stats, daily_player_points, stored_player_days, load_events_frame
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 import argparse
+import sys
+import kickbase_client
+import telemetry
+from cassette import DEFAULT_CASSETTE, RECORD, REPLAY
+from player_stream import read_player_ids
+
+ALL_PLAYERS_FILE = Path(__file__).parent.parent / "all_players.json"
+DEFAULT_CONCURRENCY = 4
+SAVE_BATCH_SIZE = 50  # grid cells per batched insert
 
 
 def fetch_and_save_data(player_id, day_start, day_end, competition_id):
@@ -11,46 +22,123 @@ def fetch_and_save_data(player_id, day_start, day_end, competition_id):
     print(
         f"Fetching data for Player ID: {player_id}, Days: {day_start}-{day_end}...")
 
+    records = []
     for day in range(day_start, day_end + 1):
         print(f"Processing day {day}...")
 
         # Fetch data
-        player_data = get_player_events(player_id, day, competition_id)
+        with telemetry.stage('fetch'):
+            player_data = get_player_events(player_id, day, competition_id)
 
         if player_data:
-            # Save the data
-            save_player_events(player_id, day, player_data)
+            records.append((player_id, day, player_data))
         else:
             print(f"Failed to retrieve player data for day {day}, skipping.")
 
+    # One batched insert for all fetched days
+    with telemetry.stage('final_save'):
+        saved = save_player_events_batch(records)
+    print(f"Saved {saved} days for player {player_id}")
+
     print(f"Data fetching and saving complete for days {day_start}-{day_end}.")
 
 
+def load_league_player_ids(players_file=ALL_PLAYERS_FILE):
+    """Returns every player ID from all_players.json, streamed in file order."""
+    return read_player_ids(players_file)
+
+
+def fetch_league_events(player_ids, day_start, day_end, competition_id,
+                        concurrency=DEFAULT_CONCURRENCY):
+    """Fetches the whole (player x matchday) grid concurrently.
+
+    Cells stored after their match finished are skipped; cells stored
+    before or during the match are fetched again and replaced. Requests
+    share the client's rate limiter; results are saved from this thread in
+    batches.
+
+    Returns:
+        tuple: (saved, failed, skipped) cell counts
+    """
+    grid = [(player_id, day) for player_id in player_ids
+            for day in range(day_start, day_end + 1)]
+    finished = stored_player_days(finished_only=True)
+    unfinished = stored_player_days() - finished
+    pending = [cell for cell in grid if cell not in finished]
+    skipped = len(grid) - len(pending)
+    refetched = sum(cell in unfinished for cell in pending)
+    print(f"League crawl: {len(player_ids)} players x days {day_start}-{day_end} = "
+          f"{len(grid)} cells, {skipped} already complete, {len(pending)} to fetch "
+          f"({refetched} stored before their match finished)")
+
+    kickbase_client.configure(pool_size=max(concurrency, kickbase_client.DEFAULT_POOL_SIZE))
+    saved, failed, batch = 0, 0, []
+    with telemetry.stage('fetch'), ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(get_player_events, player_id, day, competition_id): (player_id, day)
+                   for player_id, day in pending}
+        for done, future in enumerate(as_completed(futures), 1):
+            player_id, day = futures[future]
+            try:
+                player_data = future.result()
+            except MissingTokenError:
+                # Every other cell would fail the same way
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            except Exception as e:
+                print(f"Error fetching player {player_id} day {day}: {e}")
+                player_data = None
+
+            if player_data:
+                batch.append((player_id, day, player_data))
+            else:
+                failed += 1
+
+            if len(batch) >= SAVE_BATCH_SIZE:
+                with telemetry.stage('checkpoint_save'):
+                    saved += save_player_events_batch(batch)
+                batch = []
+            if done % 100 == 0:
+                print(f"Progress: {done}/{len(pending)} cells fetched")
+
+    with telemetry.stage('final_save'):
+        saved += save_player_events_batch(batch)
+    print(f"League crawl complete: {saved} saved, {failed} failed, {skipped} skipped.")
+    return saved, failed, skipped
+
+
 def analyze_saved_data(player_id, day_start, day_end):
-    """Analyzes previously saved data."""
+    """Analyzes previously saved data from the event totals cache."""
     print(
         f"Analyzing data for Player ID: {player_id}, Days: {day_start}-{day_end}...")
 
-    # Load all days data
-    all_days_data = load_player_events(player_id)
+    stats = aggregate_player_stats(player_id, day_start, day_end)
 
-    if all_days_data:
-        # Use the more detailed analysis function
-        total_event_points = analyze_days_range(
-            all_days_data, day_start, day_end)
+    if stats and stats.total_points:
+        for day, day_points in daily_player_points(player_id, day_start, day_end).items():
+            print(format_points_table(f"Day {day} Event Points", day_points))
+        print(format_points_table("Summary Across All Days", stats.total_points, sort=True))
 
         # Visualize aggregated data
-        if total_event_points:
-            plot_event_counts(total_event_points, player_id,
-                              f"{day_start}-{day_end}")
-        else:
-            print("No data to analyze.")
+        plot_event_counts(stats.total_points, player_id,
+                          f"{day_start}-{day_end}")
+    elif stats:
+        print("No data to analyze.")
     else:
         print(f"No saved data found for player {player_id}")
 
     print("Analysis complete.")
 
 
+def analyze_league(player_ids, day_start, day_end, top=20):
+    """Prints the highest-scoring (player, event type) season totals for the league."""
+    events = load_events_frame(player_ids, day_start, day_end)
+    breakdown = season_breakdown(events)
+    print(f"League season breakdown, days {day_start}-{day_end}: "
+          f"{len(events)} events, {events['player_id'].nunique()} players")
+    print(breakdown.head(top).to_string())
+    return breakdown
+
+
 # --- Main Execution ---
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -61,23 +149,59 @@ if __name__ == "__main__":
                         help="Analyze saved player data")
     parser.add_argument("--player", type=str,
                         default=PLAYER_ID, help="Player ID to analyze")
-    parser.add_argument("--day-start", type=int, default=1,
+    parser.add_argument("--day-start", type=int, default=DAY_START,
                         help="Starting day number")
-    parser.add_argument("--day-end", type=int, default=30,
+    parser.add_argument("--day-end", type=int, default=DAY_END,
                         help="Ending day number")
     parser.add_argument("--competition", type=str,
                         default=COMPETITION_ID, help="Competition ID")
+    parser.add_argument("--all-players", action="store_true",
+                        help="Fetch every player in all_players.json (skips days already stored)")
+    parser.add_argument("--players-file", type=str, default=str(ALL_PLAYERS_FILE),
+                        help="Player list used by --all-players")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Parallel requests for --all-players")
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument("--record", nargs="?", const=DEFAULT_CASSETTE, default=None, metavar="CASSETTE",
+                                help="Store every API response in a cassette (default: kickbase.cassette.sqlite)")
+    cassette_group.add_argument("--replay", nargs="?", const=DEFAULT_CASSETTE, default=None, metavar="CASSETTE",
+                                help="Answer every API request from a cassette, without network or credentials")
+    parser.add_argument("--metrics", type=str, default=None,
+                        help="Write request/stage metrics as JSON to this file (Markdown next to it)")
 
     args = parser.parse_args()
 
+    if args.replay:
+        kickbase_client.use_cassette(args.replay, REPLAY)
+        print(f"Replaying API responses from {args.replay}")
+    elif args.record:
+        kickbase_client.use_cassette(args.record, RECORD)
+        print(f"Recording API responses to {args.record}")
+
     # If no specific action is specified, do both
     if not args.fetch and not args.analyze:
         args.fetch = True
         args.analyze = True
 
-    if args.fetch:
-        fetch_and_save_data(args.player, args.day_start,
-                            args.day_end, args.competition)
-
-    if args.analyze:
+    try:
+        if args.all_players:
+            league_player_ids = load_league_player_ids(args.players_file)
+            if args.fetch:
+                fetch_league_events(league_player_ids,
+                                    args.day_start, args.day_end, args.competition,
+                                    args.concurrency)
+            if args.analyze:
+                analyze_league(league_player_ids, args.day_start, args.day_end)
+        elif args.fetch:
+            fetch_and_save_data(args.player, args.day_start,
+                                args.day_end, args.competition)
+    except MissingTokenError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if args.analyze and not args.all_players:
         analyze_saved_data(args.player, args.day_start, args.day_end)
+
+    if args.metrics:
+        telemetry.write_report(args.metrics, str(Path(args.metrics).with_suffix('.md')))
+        print(f"Metrics written to {args.metrics}")
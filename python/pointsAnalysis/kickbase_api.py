@@ -1,29 +1,57 @@
 import requests
 import json
-from .config import BASE_URL, BEARER_TOKEN
+import logging
+# Top-level modules in python/; pointsAnalysis/__init__.py puts python/ on sys.path
+import kickbase_client
+from token_cache import get_token, refresh_token
+from .config import BASE_URL
 
-HEADERS = {
-    "Authorization": f"Bearer {BEARER_TOKEN}",
-    "Content-Type": "application/json",
-    "Accept": "application/json"  # Added Accept header for consistency
-}
+
+class MissingTokenError(RuntimeError):
+    """No bearer token could be obtained from the environment, the token cache or a login."""
+
+
+def _headers(token):
+    return {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json",
+        "Accept": "application/json"  # Added Accept header for consistency
+    }
 
 
 def get_player_events(player_id, day_number, competition_id):
-    """Fetches event history for a player on a specific day."""
+    """Fetches event history for a player on a specific day.
+
+    Raises:
+        MissingTokenError: No bearer token is available
+    """
     endpoint = f"/competitions/{competition_id}/playercenter/{player_id}"
     url = f"{BASE_URL}{endpoint}"
     params = {
         'dayNumber': day_number
     }
 
-    print(f"Fetching data from: {url} with params: {params}")
+    logging.debug(f"Fetching data from: {url} with params: {params}")
+
+    token = get_token()
+    if not token:
+        raise MissingTokenError("No Kickbase bearer token: set BEARER_TOKEN, or KICKBASE_EMAIL and "
+                                "KICKBASE_PASSWORD to log in")
 
     try:
-        response = requests.get(url, headers=HEADERS,
-                                params=params, verify=False)
-        response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
-        print("Request Successful!")
+        # Shared pooled session; 429s are retried inside the client
+        response = kickbase_client.get(url, headers=_headers(token),
+                                       params=params)
+        if response.status_code == 401:
+            new_token = refresh_token(token)
+            if new_token:
+                response = kickbase_client.get(url, headers=_headers(new_token),
+                                               params=params)
+        if response.status_code != 200:
+            # Checked explicitly so requests and httpx responses behave the same
+            print(f"Error during request: status code {response.status_code}")
+            print(f"Response Body: {response.text}")
+            return None
         return response.json()
     except requests.exceptions.RequestException as e:
         print(f"Error during request: {e}")
@@ -0,0 +1,31 @@
+"""Typed results returned by the analysis and storage functions."""
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+
+@dataclass
+class EventAnalysis:
+    """Counts and point totals per event name for one day."""
+    counts: Dict[str, int] = field(default_factory=dict)
+    points: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class DaysRangeAnalysis:
+    """Event points of one player over a range of days."""
+    day_start: int
+    day_end: int
+    points_by_day: Dict[int, Dict[str, int]] = field(default_factory=dict)
+    total_points: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def days(self) -> List[int]:
+        return sorted(self.points_by_day)
+
+
+@dataclass
+class PlayerStats:
+    """Aggregated event points of one player read from the event store."""
+    player_id: str
+    days_processed: List[int] = field(default_factory=list)
+    total_points: Dict[str, int] = field(default_factory=dict)
@@ -0,0 +1,87 @@
+"""Compiled, integer-keyed view of EVENT_ID_TO_NAME.
+
+Several raw `eti` codes share one label (e.g. 96-102 "Große Chance kreiert").
+This module assigns every distinct label a small integer category id and
+builds a dense lookup array from `eti` to category, so hot loops can
+aggregate with integer indexing (`np.bincount`) and only turn ids into
+strings when presenting results.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from .mappings import EVENT_ID_TO_NAME
+
+UNKNOWN_CATEGORY = 0
+UNKNOWN_NAME = "Unknown Event"
+
+# Labels that cost points, compared without game-mode variants like "3 Play".
+# Corrections show up as events with the opposite sign, so a label counts as
+# negative when most of its scored events are; test_taxonomy.py checks this
+# against the events in data/player_7226. "Foul im letzten Drittel" is a foul
+# suffered in the final third and scores +1.
+NEGATIVE_BASE_NAMES = {
+    '6-Sekunden-Regel (TW)', 'Abseits', 'Ballverlust', 'Eigentor',
+    'Elfmeter verschossen', 'Elfmeter verschossen (Elfmeterschießen)',
+    'Elfmeter verursacht', 'Falscher Einwurf', 'Fehler vor Schuss',
+    'Fehler vor Tor', 'Flanke nicht gefangen (TW)', 'Foul',
+    'Gefährliches Spiel', 'Gegentor',
+    'Gelb-Rote Karte', 'Gelbe Karte', 'Große Chance vergeben', 'Handspiel',
+    'Kopfballduell verloren', 'Rote Karte', 'Rückpass-Foul (TW)',
+    'Spiel verloren', 'Zeitstrafe', 'Zweikampf verloren', 'Überrannt',
+}
+
+
+def _base_name(name):
+    """Strips quoted game-mode variants: 'Eigentor "3 Play"' -> 'Eigentor'."""
+    return re.sub(r' "[^"]*"', '', name)
+
+
+# Category 0 is reserved for codes missing from EVENT_ID_TO_NAME
+CATEGORY_NAMES = (UNKNOWN_NAME,) + tuple(sorted(set(EVENT_ID_TO_NAME.values())))
+NAME_TO_CATEGORY = {name: category for category, name in enumerate(CATEGORY_NAMES)}
+CATEGORY_IS_NEGATIVE = np.array(
+    [_base_name(name) in NEGATIVE_BASE_NAMES for name in CATEGORY_NAMES], dtype=bool)
+
+# Negative codes (-1, -2, -17, ...) are shifted so the array index is never negative
+ETI_OFFSET = -min(min(EVENT_ID_TO_NAME), 0)
+ETI_TO_CATEGORY = np.full(max(EVENT_ID_TO_NAME) + ETI_OFFSET + 1, UNKNOWN_CATEGORY, dtype=np.int16)
+for _eti, _name in EVENT_ID_TO_NAME.items():
+    ETI_TO_CATEGORY[_eti + ETI_OFFSET] = NAME_TO_CATEGORY[_name]
+
+
+def categorize(eti):
+    """Maps an array of raw `eti` codes to category ids (UNKNOWN_CATEGORY if unmapped)."""
+    index = np.asarray(eti, dtype=np.int64) + ETI_OFFSET
+    in_range = (index >= 0) & (index < len(ETI_TO_CATEGORY))
+    return np.where(in_range, ETI_TO_CATEGORY[np.clip(index, 0, len(ETI_TO_CATEGORY) - 1)],
+                    UNKNOWN_CATEGORY).astype(np.int16)
+
+
+def category_names(categories):
+    """Turns category ids into display names (for presentation only)."""
+    return np.asarray(CATEGORY_NAMES, dtype=object)[np.asarray(categories)]
+
+
+def category_table():
+    """The category table: id, display name, negative flag and number of raw codes."""
+    codes_per_category = np.bincount(ETI_TO_CATEGORY, minlength=len(CATEGORY_NAMES))
+    codes_per_category[UNKNOWN_CATEGORY] = 0
+    return pd.DataFrame({
+        "name": CATEGORY_NAMES,
+        "is_negative": CATEGORY_IS_NEGATIVE,
+        "codes": codes_per_category,
+    }).rename_axis("category")
+
+
+def points_by_category(eti, points):
+    """Counts and point sums per category for one batch of events.
+
+    Returns:
+        tuple: (counts, points) arrays indexed by category id
+    """
+    categories = categorize(eti)
+    counts = np.bincount(categories, minlength=len(CATEGORY_NAMES))
+    sums = np.bincount(categories, weights=points, minlength=len(CATEGORY_NAMES))
+    return counts, sums.astype(np.int64)
@@ -1,87 +1,117 @@
 import json
+import numpy as np
 import pandas as pd
 from pathlib import Path
+from player_stream import iter_players
 
-def process_players_data():
-    # Read the detailed players JSON file
-    with open('../public/detailed_players.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    # Convert players data to list
-    players_list = []
-    for player_id, player in data['players'].items():
-        player_data = {
-            'id': player['i'],
-            'firstName': player['fn'],
-            'lastName': player['ln'],
-            'fullName': f"{player['fn']} {player['ln']}",
-            'team': player.get('tn', ''),
-            'position': player['pos'],
-            'status': player.get('st', 0),
-            'statusText': player.get('stxt', ''),
-            'totalPoints': player.get('tp', 0),
-            'averagePoints': player.get('ap', 0),
-            'marketValue': player.get('mv', 0),
-            'goals': player.get('g', 0),
-            'assists': player.get('a', 0),
-            'minutesPlayed': player.get('sec', 0) / 60,  # Convert seconds to minutes
-        }
-        
-        # Calculate additional metrics
-        if player_data['marketValue'] > 0:
-            player_data['pointsPerMillion'] = round(player_data['averagePoints'] / (player_data['marketValue'] / 1000000), 2)
-        else:
-            player_data['pointsPerMillion'] = 0
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+INPUT_FILE = '../public/detailed_players.json'
+OUTPUT_DIR = '../public'
+
+# Source field -> output column, read straight into columns
+COLUMN_FIELDS = {
+    'i': 'id', 'fn': 'firstName', 'ln': 'lastName', 'tn': 'team', 'pos': 'position',
+    'st': 'status', 'stxt': 'statusText', 'tp': 'totalPoints', 'ap': 'averagePoints',
+    'mv': 'marketValue', 'g': 'goals', 'a': 'assists', 'sec': 'seconds',
+}
+FIELD_DEFAULTS = {'fn': '', 'tn': '', 'st': 0, 'stxt': '', 'tp': 0, 'ap': 0, 'mv': 0, 'g': 0, 'a': 0, 'sec': 0}
+
+# Output record keys, in order
+RECORD_COLUMNS = [
+    'id', 'firstName', 'lastName', 'fullName', 'team', 'position', 'status', 'statusText',
+    'totalPoints', 'averagePoints', 'marketValue', 'goals', 'assists', 'minutesPlayed',
+    'pointsPerMillion', 'positionText', 'marketValueRange', 'performanceScore',
+]
+
+POSITION_NAMES = {1: 'Torwart', 2: 'Abwehr', 3: 'Mittelfeld', 4: 'Sturm'}
+MARKET_VALUE_LABELS = ['Very Low', 'Low', 'Medium', 'High', 'Very High']
+
+
+def load_player_columns(path=INPUT_FILE):
+    """Streams the snapshot straight into one list per output column."""
+    columns = {name: [] for name in COLUMN_FIELDS.values()}
+    appenders = [(field, FIELD_DEFAULTS.get(field), columns[name].append)
+                 for field, name in COLUMN_FIELDS.items()]
+    for _, player in iter_players(path, fields=COLUMN_FIELDS):
+        for field, default, append in appenders:
+            append(player.get(field, default))
+    return columns
+
+
+def market_value_ranges(market_values):
+    """Quintile labels of the market value; ties are split by order when edges collide."""
+    try:
+        return pd.qcut(market_values, q=5, labels=MARKET_VALUE_LABELS)
+    except ValueError:
+        # Many players share the minimum value, so quintile edges can coincide
+        return pd.qcut(market_values.rank(method='first'), q=5, labels=MARKET_VALUE_LABELS)
 
-        # Add position text
-        position_map = {1: 'Torwart', 2: 'Abwehr', 3: 'Mittelfeld', 4: 'Sturm'}
-        player_data['positionText'] = position_map.get(player_data['position'], '')
 
-        players_list.append(player_data)
+def build_players_frame(columns):
+    """Derives all computed columns with vectorised operations."""
+    df = pd.DataFrame(columns)
+    df['fullName'] = df['firstName'] + ' ' + df['lastName']
+    df['minutesPlayed'] = df.pop('seconds') / 60  # Convert seconds to minutes
 
-    # Convert to DataFrame for easier processing
-    df = pd.DataFrame(players_list)
+    market_value = df['marketValue'].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        points_per_million = np.round(df['averagePoints'].to_numpy() / (market_value / 1000000), 2)
+    df['pointsPerMillion'] = np.where(market_value > 0, points_per_million, 0.0)
+
+    df['positionText'] = df['position'].map(POSITION_NAMES).fillna('')
+    df['marketValueRange'] = market_value_ranges(df['marketValue'])
 
-    # Calculate market value ranges for better visualization
-    df['marketValueRange'] = pd.qcut(df['marketValue'], q=5, labels=['Very Low', 'Low', 'Medium', 'High', 'Very High'])
-    
     # Calculate performance score (normalized)
-    df['performanceScore'] = (
-        df['totalPoints'] * 0.4 +
-        df['averagePoints'] * 0.3 +
-        df['pointsPerMillion'] * 0.3
-    )
-    
-    # Normalize performance score
-    df['performanceScore'] = (df['performanceScore'] - df['performanceScore'].min()) / (df['performanceScore'].max() - df['performanceScore'].min())
+    score = df['totalPoints'] * 0.4 + df['averagePoints'] * 0.3 + df['pointsPerMillion'] * 0.3
+    df['performanceScore'] = (score - score.min()) / (score.max() - score.min())
+    return df[RECORD_COLUMNS]
+
+
+def frame_records(df):
+    """Rows as plain-Python dicts (faster than DataFrame.to_dict for this shape)."""
+    values = [df[column].astype(object).tolist() if column == 'marketValueRange'
+              else df[column].tolist() for column in RECORD_COLUMNS]
+    return [dict(zip(RECORD_COLUMNS, row)) for row in zip(*values)]
+
+
+def write_json(data, path):
+    """Writes compact JSON, with orjson when available."""
+    if orjson is not None:
+        Path(path).write_bytes(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def process_players_data(input_file=INPUT_FILE, output_dir=OUTPUT_DIR):
+    df = build_players_frame(load_player_columns(input_file))
+    records = frame_records(df)
 
     # Save processed data
     output = {
-        'players': df.to_dict(orient='records'),
+        'players': records,
         'metadata': {
             'totalPlayers': len(df),
-            'averageMarketValue': round(df['marketValue'].mean(), 2),
-            'averageTotalPoints': round(df['totalPoints'].mean(), 2),
-            'positionCounts': df['position'].value_counts().to_dict(),
-            'teamCounts': df['team'].value_counts().to_dict()
+            'averageMarketValue': round(float(df['marketValue'].mean()), 2),
+            'averageTotalPoints': round(float(df['totalPoints'].mean()), 2),
+            'positionCounts': {int(k): int(v) for k, v in df['position'].value_counts().items()},
+            'teamCounts': {str(k): int(v) for k, v in df['team'].value_counts().items()},
         }
     }
-
-    # Save to file
-    with open('../public/processed_players.json', 'w', encoding='utf-8') as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    write_json(output, Path(output_dir) / 'processed_players.json')
 
     print("Data processing completed. File saved as processed_players.json")
 
-    # Create position-specific files for better performance
-    for pos in df['position'].unique():
-        pos_data = {
-            'players': df[df['position'] == pos].to_dict(orient='records')
-        }
-        with open(f'../public/players_position_{pos}.json', 'w', encoding='utf-8') as f:
-            json.dump(pos_data, f, ensure_ascii=False, indent=2)
+    # Create position-specific files in one group-by pass over the records
+    for pos, rows in df.groupby('position', sort=False).indices.items():
+        write_json({'players': [records[row] for row in rows]},
+                   Path(output_dir) / f'players_position_{pos}.json')
 
     print("Position-specific files created")
 
 if __name__ == "__main__":
-    process_players_data() 
\ No newline at end of file
+    process_players_data()
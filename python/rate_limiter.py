@@ -0,0 +1,164 @@
+"""
+Adaptive rate limiter shared by all Kickbase API callers.
+
+A token bucket that starts at a moderate request rate, backs off
+multiplicatively whenever the API answers 429 (honouring Retry-After when
+present) and raises the rate again while responses stay healthy.
+
+An isolated 429 only trims the rate by RATE_DECREASE; every further 429
+without a healthy response in between cuts it by that factor once more
+(x0.75, then x0.56, x0.42, ...), so real overload still collapses the rate
+within a few bursts. Each HEALTHY_WINDOW successes add RATE_INCREASE.
+
+Steady state: if a fraction q of requests is answered with an isolated 429,
+the rate settles where one 429's cut equals the increase earned between two
+429s, r = RATE_INCREASE / (HEALTHY_WINDOW * q * (1 - RATE_DECREASE)), capped
+at MAX_RATE. For q = 2% that is 20 req/s (the cap); for q = 10%, 4 req/s.
+Against a hard server limit L the rate saws between 0.75 L and L.
+"""
+
+import email.utils
+import logging
+import random
+import threading
+import time
+
+DEFAULT_RATE = 5.0          # requests per second at start
+MIN_RATE = 1.0              # never slow down below this
+MAX_RATE = 20.0             # never speed up beyond this
+RATE_INCREASE = 1.0         # additive increase after a healthy window
+RATE_DECREASE = 0.75        # multiplicative decrease on an isolated 429
+HEALTHY_WINDOW = 10         # successful responses before raising the rate
+BASE_BACKOFF = 2.0          # seconds, first backoff without Retry-After
+MAX_BACKOFF = 60.0          # seconds, cap for the computed backoff (not for Retry-After)
+MAX_RETRIES = 5             # attempts per request before giving up on 429s
+
+
+def parse_retry_after(value):
+    """Parses a Retry-After header into seconds.
+
+    Args:
+        value (str): Header value, either delta-seconds or an HTTP date
+
+    Returns:
+        float: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RateLimiter:
+    """Thread-safe token bucket with AIMD rate adaptation.
+
+    Call `acquire()` before every request, then report the outcome with
+    `on_success()` or `on_rate_limited()`.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, min_rate=MIN_RATE, max_rate=MAX_RATE,
+                 burst=None, increase=RATE_INCREASE, decrease=RATE_DECREASE,
+                 healthy_window=HEALTHY_WINDOW, base_backoff=BASE_BACKOFF,
+                 max_backoff=MAX_BACKOFF):
+        self.rate = float(rate)
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate)
+        self.burst = float(burst) if burst else max(1.0, self.rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.healthy_window = healthy_window
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._tokens = self.burst
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._healthy_streak = 0
+        self._consecutive_limits = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+
+    def acquire(self):
+        """Blocks until a request may be sent.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._blocked_until:
+                    delay = self._blocked_until - now
+                elif self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return waited
+                else:
+                    delay = (1.0 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def on_success(self):
+        """Records a healthy response and raises the rate after a full window."""
+        with self._lock:
+            self._consecutive_limits = 0
+            self._healthy_streak += 1
+            if self._healthy_streak >= self.healthy_window and self.rate < self.max_rate:
+                self._healthy_streak = 0
+                self.rate = min(self.max_rate, self.rate + self.increase)
+                self.burst = max(1.0, self.rate)
+                logging.debug(f"Rate limiter: raised rate to {self.rate:.2f} req/s")
+
+    def on_rate_limited(self, retry_after=None):
+        """Records a 429, lowers the rate and pauses all callers.
+
+        Args:
+            retry_after (float, optional): Seconds requested by the server;
+                always honoured in full, even beyond max_backoff
+
+        Returns:
+            float: Seconds every caller will pause before the next request
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._healthy_streak = 0
+            self._tokens = 0.0
+            if now < self._blocked_until:
+                # Parallel workers report the same burst; only the first one lowers the rate
+                return self._blocked_until - now
+
+            self._consecutive_limits += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease ** self._consecutive_limits)
+            self.burst = max(1.0, self.rate)
+
+            if retry_after is not None:
+                delay = retry_after
+            else:
+                backoff = self.base_backoff * 2 ** (self._consecutive_limits - 1)
+                delay = min(self.max_backoff, backoff)
+            # Jitter so parallel workers do not retry in lockstep; never below what was asked
+            delay *= random.uniform(1.0, 1.25)
+
+            self._blocked_until = now + delay
+            logging.warning(
+                f"Rate limited: pausing {delay:.1f}s, rate lowered to {self.rate:.2f} req/s")
+            return delay
+
+
+# Shared instance so every Kickbase caller in a process respects one budget
+kickbase_limiter = RateLimiter()
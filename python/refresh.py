@@ -0,0 +1,109 @@
+"""
+Delta refresh planning for detailed player data.
+
+Uses the previous detailed_players.json as a baseline and decides which
+players actually need to be re-fetched, most urgent first, so scheduled runs
+only spend requests on players whose data is likely out of date.
+"""
+
+import datetime
+import logging
+import os
+
+from player_stream import iter_players
+
+DEFAULT_MAX_AGE_HOURS = 72  # players updated more recently than this are skipped
+
+# Reasons, in the order players are re-fetched
+REASON_PRIORITY = 'priority'
+REASON_NEW = 'new'
+REASON_DAY_BEHIND = 'day behind'
+REASON_NO_TIMESTAMP = 'no timestamp'
+REASON_OUTDATED = 'outdated'
+REASON_ORDER = [REASON_PRIORITY, REASON_NEW, REASON_DAY_BEHIND, REASON_NO_TIMESTAMP, REASON_OUTDATED]
+
+
+def load_baseline(path):
+    """Loads the players of a previous detailed_players.json run.
+
+    Returns:
+        dict: Player records keyed by id, empty if the file is missing or unreadable
+    """
+    if not os.path.exists(path):
+        return {}
+    try:
+        return dict(iter_players(path))
+    except (ValueError, OSError) as e:
+        logging.warning(f"Could not read baseline {path}: {e}")
+        return {}
+
+
+def _parse_ts(value):
+    if not value:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def _stale_reason(player_id, player, current_day, cutoff, priority_ids):
+    if player_id in priority_ids:
+        return REASON_PRIORITY
+    if player is None:
+        return REASON_NEW
+    if current_day is not None and (player.get('day') or 0) < current_day:
+        return REASON_DAY_BEHIND
+    ts = _parse_ts(player.get('ts'))
+    if ts is None:
+        return REASON_NO_TIMESTAMP
+    if ts < cutoff:
+        return REASON_OUTDATED
+    return None
+
+
+def plan_refresh(player_ids, baseline, priority_ids=(), max_age_hours=DEFAULT_MAX_AGE_HOURS,
+                 max_players=None, now=None):
+    """Orders the players that need re-fetching, most urgent first.
+
+    A player is stale when it is in the priority subset, missing from the
+    baseline, behind the latest matchday (`day`), has no `ts` or a `ts` older
+    than `max_age_hours`. Within each reason, players whose market value moves
+    fastest (`tfhmvt` relative to `mv`) come first, then the oldest `ts`.
+
+    Args:
+        player_ids (list): All player IDs from all_players.json
+        baseline (dict): Player records from the previous run
+        priority_ids (iterable): IDs that are always re-fetched first
+        max_age_hours (float): Age of `ts` after which a player counts as stale
+        max_players (int, optional): Upper bound on players to re-fetch; the rest is deferred
+        now (datetime, optional): Reference time, defaults to the current UTC time
+
+    Returns:
+        tuple: (to_fetch, deferred, reasons) where to_fetch and deferred are
+        lists of IDs and reasons maps every stale ID to its reason
+    """
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    cutoff = now - datetime.timedelta(hours=max_age_hours)
+    priority_ids = set(priority_ids)
+    days = [p.get('day') for p in baseline.values() if p.get('day') is not None]
+    current_day = max(days) if days else None
+
+    reasons = {}
+    for player_id in player_ids:
+        reason = _stale_reason(player_id, baseline.get(player_id), current_day, cutoff, priority_ids)
+        if reason:
+            reasons[player_id] = reason
+
+    def urgency(player_id):
+        player = baseline.get(player_id) or {}
+        market_value = player.get('mv') or 0
+        volatility = abs(player.get('tfhmvt') or 0) / market_value if market_value else 0
+        ts = _parse_ts(player.get('ts'))
+        age = (now - ts).total_seconds() if ts else float('inf')
+        return (REASON_ORDER.index(reasons[player_id]), -volatility, -age)
+
+    stale_ids = sorted(reasons, key=urgency)
+    if max_players is not None:
+        return stale_ids[:max_players], stale_ids[max_players:], reasons
+    return stale_ids, [], reasons
@@ -0,0 +1,426 @@
+"""
+Synthetic league-scale data for scale testing.
+
+Generates N players x M matchdays x K seasons in the real schemas, so every
+pipeline stage can be run at 10k+ players without touching the API:
+
+- detailed_players.json: player records with the real keys (`ph`, `mdsum`,
+  `tp`, `ap`, `mv`, ...); `mdsum` is shared by all players of a team
+- all_players.json: the {"players", "valid_team_ids", "date"} summary
+- playercenter payloads per player and matchday: the real day header
+  (`t1`, `t2`, `st`, `mt`, `md`, ...) and events with `ei`, `eti`, `p`,
+  `mt` and `att`, either loaded straight into an event store
+  (events.sqlite) or written as legacy player_<id>/day_<n>.json files
+
+Event codes are drawn from the codes of mappings.EVENT_ID_TO_NAME, weighted
+by how often they occur in pointsAnalysis/data/player_7226 (codes never seen
+there get a small floor weight); points per code are drawn from the values
+observed there, or a fixed amount signed by taxonomy.CATEGORY_IS_NEGATIVE.
+Totals in the player records (`tp`, `ap`, `smc`, `ph`) are computed from the
+generated events, so the files agree with each other. Output depends only
+on the arguments and --seed.
+
+Each season goes to <output>/season_<k>/; the same players play every
+season, with a share of them moving to another team in between.
+
+Usage:
+    python synthetic_data.py --players 10000 --days 34 --seasons 2 --output /tmp/synthetic
+    python synthetic_data.py --players 2000 --events json --seed 7
+"""
+
+import argparse
+import datetime
+import glob
+import hashlib
+import json
+import math
+import os
+from collections import defaultdict
+
+import numpy as np
+
+from pointsAnalysis import data_storage
+from pointsAnalysis.mappings import EVENT_ID_TO_NAME
+from pointsAnalysis.taxonomy import CATEGORY_IS_NEGATIVE, categorize
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+EVENTS_DIR = os.path.join(BASE_DIR, 'pointsAnalysis', 'data', 'player_7226')
+DEFAULT_OUTPUT_DIR = os.path.join(BASE_DIR, 'synthetic')
+PLAYERS_PER_TEAM = 25
+FIRST_SEASON = 2024
+EVENT_BATCH_PLAYERS = 250  # players per event-store transaction
+
+RARE_EVENT_WEIGHT = 0.02  # pseudo-count for codes that never occur in the sample
+RARE_EVENT_POINTS = 10
+TRANSFER_RATE = 0.1  # share of players that change team between seasons
+
+POSITION_SHARES = {1: 0.12, 2: 0.35, 3: 0.35, 4: 0.18}  # GK, DEF, MID, FWD
+POSITION_ACTIVITY = {1: 0.5, 2: 0.9, 3: 1.0, 4: 0.8}  # scoring events relative to the sample
+ACTIVITY_SCALE = 0.5  # the sample is a top striker; brings the median `ap` near the real ~60
+SKILL_SPREAD = 0.35
+MARKET_VALUE_MEDIAN = 4_000_000
+MARKET_VALUE_MIN = 500_000
+MARKET_VALUE_MAX = 70_000_000
+PRICE_HISTORY_DAYS = 5  # entries in `ph`
+FIXTURE_WINDOW = 3  # matchdays in `mdsum`
+
+# Day-level markers sent with every playercenter payload: (eti, ke, minute)
+MATCH_MARKERS = ((-9, 10, 0), (-10, 11, 45), (-11, 12, 45), (-12, 13, None))
+STATUS_PLAYED, STATUS_NOT_PLAYED = 5, 4
+
+FIRST_NAMES = ('Jonas', 'Leon', 'Luca', 'Felix', 'Noah', 'Elias', 'Paul', 'Ben', 'Finn', 'Max',
+               'Julian', 'Tim', 'Niklas', 'Jan', 'David', 'Lukas', 'Moritz', 'Emil', 'Anton', 'Samuel')
+LAST_NAMES = ('Müller', 'Schmidt', 'Schneider', 'Fischer', 'Weber', 'Meyer', 'Wagner', 'Becker',
+              'Schulz', 'Hoffmann', 'Koch', 'Richter', 'Klein', 'Wolf', 'Neumann', 'Schwarz',
+              'Zimmermann', 'Braun', 'Krüger', 'Hofmann', 'Hartmann', 'Lange', 'Werner', 'Krause')
+
+
+def _image(*parts):
+    """Stable fake asset path like the API's content/file/<hash>.svg."""
+    digest = hashlib.md5(':'.join(map(str, parts)).encode('utf-8')).hexdigest()
+    return f"content/file/{digest}.svg"
+
+
+def _iso(moment):
+    return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def load_event_profile(events_dir=EVENTS_DIR):
+    """Scoring-event codes, their weights and observed points.
+
+    Returns:
+        dict: codes (int array), weights (summing to 1), values (flat array
+            of observed points), offsets and lengths (slice of `values` per
+            code), counts_per_game (scoring events per played day) and
+            highlights (the played days' 'k' lists)
+    """
+    observed = defaultdict(list)
+    counts_per_game, highlights = [], []
+    for path in sorted(glob.glob(os.path.join(events_dir, 'day_*.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            day = json.load(f)
+        scoring = [event for event in day.get('events') or [] if event.get('eti', -1) >= 0]
+        for event in scoring:
+            observed[event['eti']].append(event.get('p', 0))
+        if day.get('st') == STATUS_PLAYED:
+            counts_per_game.append(len(scoring))
+            highlights.append(day.get('k') or [])
+
+    codes = np.array(sorted(eti for eti in EVENT_ID_TO_NAME if eti >= 0), dtype=np.int64)
+    weights = np.array([len(observed[eti]) or RARE_EVENT_WEIGHT for eti in codes], dtype=float)
+    negative = CATEGORY_IS_NEGATIVE[categorize(codes)]
+    values, offsets, lengths = [], [], []
+    for eti, is_negative in zip(codes.tolist(), negative):
+        points = observed[eti] or [-RARE_EVENT_POINTS if is_negative else RARE_EVENT_POINTS]
+        offsets.append(len(values))
+        lengths.append(len(points))
+        values.extend(points)
+    return {
+        'codes': codes,
+        'weights': weights / weights.sum(),
+        'values': np.array(values, dtype=np.int64),
+        'offsets': np.array(offsets, dtype=np.int64),
+        'lengths': np.array(lengths, dtype=np.int64),
+        'counts_per_game': np.array(counts_per_game or [60], dtype=np.int64),
+        'highlights': highlights or [[]],
+    }
+
+
+def round_robin(team_ids, days):
+    """Pairings for `days` matchdays: a double round robin (circle method), repeated.
+
+    With an odd number of teams one team has a bye each matchday and is
+    missing from that day's pairings.
+
+    Returns:
+        list: one list of (home, away) tuples per matchday
+    """
+    teams = list(team_ids) + ([None] if len(team_ids) % 2 else [])
+    rounds_per_leg = len(teams) - 1
+    schedule = []
+    for day in range(days):
+        leg, index = divmod(day % (2 * rounds_per_leg), rounds_per_leg)
+        rotated = [teams[0]] + teams[1:][-index:] + teams[1:][:-index] if index else teams
+        pairs = []
+        for slot in range(len(teams) // 2):
+            home, away = rotated[slot], rotated[-slot - 1]
+            if home is None or away is None:
+                continue
+            # Alternate the fixed team's home games; the second leg mirrors the first
+            if (slot == 0 and index % 2 == 1) != (leg == 1):
+                home, away = away, home
+            pairs.append((home, away))
+        schedule.append(pairs)
+    return schedule
+
+
+def build_fixtures(rng, team_ids, days, season):
+    """Fixture per (day, team) with the mdsum fields; kickoffs are weekly from late August.
+
+    Teams with a bye on a matchday have no entry for that day.
+    """
+    start = datetime.datetime(FIRST_SEASON + season - 1, 8, 23, 13, 30, tzinfo=datetime.timezone.utc)
+    fixtures = {}
+    for day, pairs in enumerate(round_robin(team_ids, days), start=1):
+        kickoff = start + datetime.timedelta(weeks=day - 1)
+        for home, away in pairs:
+            fixture = {
+                't1': home, 't2': away,
+                't1g': int(rng.poisson(1.6)), 't2g': int(rng.poisson(1.3)),
+                'day': day, 'md': _iso(kickoff), 'cur': day == days, 'mdst': 2,
+                'mdln': f"{day} Match Day", 't1im': _image('team', home), 't2im': _image('team', away),
+            }
+            fixtures[(day, home)] = fixtures[(day, away)] = fixture
+    return fixtures
+
+
+def create_players(rng, count, team_count):
+    """Season-independent player attributes: identity, position, team and skill."""
+    positions = rng.choice(list(POSITION_SHARES), size=count, p=list(POSITION_SHARES.values()))
+    skills = rng.normal(size=count)
+    players = []
+    for index in range(count):
+        players.append({
+            'i': str(10_000 + index),
+            'fn': FIRST_NAMES[rng.integers(len(FIRST_NAMES))],
+            'ln': f"{LAST_NAMES[rng.integers(len(LAST_NAMES))]}{index}",
+            'shn': int(rng.integers(1, 40)),
+            'tid': str(index % team_count + 1),
+            'pos': int(positions[index]),
+            'skill': float(skills[index]),
+            'play_rate': float(1 / (1 + math.exp(-(skills[index] + 0.8)))),
+        })
+    return players
+
+
+def transfer_players(rng, players, team_count):
+    """Moves about TRANSFER_RATE of the players to a random team."""
+    for player in players:
+        if rng.random() < TRANSFER_RATE:
+            player['tid'] = str(rng.integers(team_count) + 1)
+
+
+def _draw_events(rng, profile, count, activity):
+    """`count` scoring events as (eti, points) arrays."""
+    count = max(0, int(round(count * activity)))
+    picks = rng.choice(len(profile['codes']), size=count, p=profile['weights'])
+    slots = profile['offsets'][picks] + (rng.random(count) * profile['lengths'][picks]).astype(np.int64)
+    return profile['codes'][picks], profile['values'][slots]
+
+
+def player_day(rng, profile, player, fixture, day, event_ids):
+    """Playercenter payload of one player for one matchday."""
+    end_minute = int(rng.integers(92, 98))
+    header = {
+        'i': player['i'], 'tid': player['tid'], 'n': player['ln'],
+        't1': int(fixture['t1']), 't2': int(fixture['t2']),
+        't1g': fixture['t1g'], 't2g': fixture['t2g'],
+    }
+    events = [{'ei': str(next(event_ids)), 'eti': eti, 'p': 0, 'ke': ke,
+               'mt': end_minute if minute is None else minute}
+              for eti, ke, minute in MATCH_MARKERS]
+
+    played = rng.random() < player['play_rate']
+    points = None
+    highlights = []
+    if played:
+        starts = rng.random() < 0.8
+        on = 0 if starts else int(rng.integers(46, 85))
+        off = int(rng.integers(60, 90)) if starts and rng.random() < 0.3 else end_minute
+        events.append({'ei': str(next(event_ids)), 'eti': -8 if starts else -1, 'p': 0, 'mt': on})
+        if off < end_minute:
+            events.append({'ei': str(next(event_ids)), 'eti': -2, 'p': 0, 'mt': off})
+
+        base = rng.choice(profile['counts_per_game'])
+        activity = (ACTIVITY_SCALE * POSITION_ACTIVITY[player['pos']] * max(0.2, 1 + SKILL_SPREAD * player['skill'])
+                    * (off - on) / end_minute)
+        codes, values = _draw_events(rng, profile, base, activity)
+        minutes = rng.integers(on, off + 1, size=len(codes))
+        attempts = rng.integers(0, 4, size=len(codes))
+        events.extend({'ei': str(next(event_ids)), 'eti': int(eti), 'p': int(value), 'mt': int(minute),
+                       'att': int(att)}
+                      for eti, value, minute, att in zip(codes, values, minutes, attempts))
+        points = int(values.sum())
+        highlights = list(profile['highlights'][int(rng.integers(len(profile['highlights'])))])
+
+    # The API lists events newest first
+    events.sort(key=lambda event: (event['mt'], int(event['ei'])), reverse=True)
+    if points is not None:
+        header['p'] = points
+    header.update({
+        'st': STATUS_PLAYED if played else STATUS_NOT_PLAYED,
+        'mi': 7000 + day, 'mt': end_minute, 'mtd': '90', 'md': fixture['md'], 'mst': 2,
+        'k': highlights, 'pim': f"pool/playersbig/{player['i']}.png",
+        't1im': fixture['t1im'], 't2im': fixture['t2im'],
+        'events': events,
+    })
+    return header, played, points, (off - on if played else 0)
+
+
+def _counter(start):
+    value = start
+    while True:
+        yield value
+        value += 1
+
+
+def detailed_record(rng, player, team_names, fixtures, days, season_days, captured):
+    """Player record in the shape of getDetailedPlayers' output."""
+    played = [(day, points) for day, (is_played, points, _) in season_days.items() if is_played]
+    total = sum(points for _, points in played)
+    seconds = sum(minutes for _, _, minutes in season_days.values()) * 60
+    market_value = int(np.clip(MARKET_VALUE_MEDIAN * math.exp(1.1 * player['skill']),
+                               MARKET_VALUE_MIN, MARKET_VALUE_MAX))
+    history = []
+    for day in range(max(1, days - PRICE_HISTORY_DAYS + 1), days + 1):
+        is_played, points, _ = season_days[day]
+        history.append({'hp': True, 'p': points} if is_played else {'hp': False})
+
+    record = {
+        'i': player['i'], 'fn': player['fn'], 'ln': player['ln'], 'shn': player['shn'],
+        'tid': player['tid'], 'tn': team_names[player['tid']], 'oui': '0', 'st': 0, 'stl': [],
+        'pos': player['pos'], 'iposl': False,
+    }
+    if played:
+        games = len(played)
+        record.update({
+            'tp': total, 'ap': total // games, 'sec': seconds,
+            'g': int(rng.poisson(0.02 * player['pos'] ** 2 * games / 4)),
+            'a': int(rng.poisson(0.05 * games)), 'pes': 0, 'cs': int(rng.poisson(0.1 * games)),
+        })
+    record.update({
+        'ph': history, 'mv': market_value, 'cv': market_value // 100_000 * 100_000,
+        'tfhmvt': int(rng.integers(-200_000, 200_000)), 'mvt': int(rng.integers(0, 3)), 'day': days,
+        'mdsum': [fixtures[(day, player['tid'])]
+                  for day in range(max(1, days - FIXTURE_WINDOW + 1), days + 1)
+                  if (day, player['tid']) in fixtures],
+    })
+    if played:
+        record.update({'r': 0, 'y': int(rng.poisson(0.1 * len(played))),
+                       'smc': len(played), 'ismc': days, 'prob': int(rng.integers(1, 6))})
+    record.update({
+        'smdc': len(played), 'sl': True, 'plpt': 'Synthetic', 'plpurl': _image('provider'),
+        'opl': [], 'pim': _image('player', player['i']), 'tim': _image('team', player['tid']),
+        'ts': _iso(captured),
+    })
+    return record
+
+
+def generate_season(rng, profile, players, team_count, days, season, output_dir, events='sqlite'):
+    """Writes one season's files and events.
+
+    Args:
+        events (str): 'sqlite' (events.sqlite), 'json' (player_<id>/day_<n>.json
+            under events/) or 'none'
+
+    Returns:
+        dict: counts of players, teams, days and event payloads written
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    team_ids = [str(team) for team in range(1, team_count + 1)]
+    team_names = {tid: f"Team {tid}" for tid in team_ids}
+    fixtures = build_fixtures(rng, team_ids, days, season)
+    last_kickoff = max(fixture['md'] for fixture in fixtures.values())
+    captured = datetime.datetime.strptime(last_kickoff, '%Y-%m-%dT%H:%M:%SZ') + datetime.timedelta(days=2)
+    event_ids = _counter(10_000_000 * season)
+
+    if events == 'sqlite':
+        data_storage.set_database_path(os.path.join(output_dir, data_storage.EVENTS_DB_NAME))
+    detailed, batch, payloads = {}, [], 0
+    try:
+        for player in players:
+            season_days = {}
+            for day in range(1, days + 1):
+                fixture = fixtures.get((day, player['tid']))
+                if fixture is None:
+                    # Bye: no match, so no playercenter payload either
+                    season_days[day] = (False, None, 0)
+                    continue
+                payload, is_played, points, minutes = player_day(
+                    rng, profile, player, fixture, day, event_ids)
+                season_days[day] = (is_played, points, minutes)
+                if events == 'sqlite':
+                    batch.append((player['i'], day, payload))
+                elif events == 'json':
+                    player_dir = os.path.join(output_dir, 'events', f"player_{player['i']}")
+                    os.makedirs(player_dir, exist_ok=True)
+                    with open(os.path.join(player_dir, f"day_{day}.json"), 'w', encoding='utf-8') as f:
+                        json.dump(payload, f, ensure_ascii=False, indent=2)
+                payloads += events != 'none'
+            detailed[player['i']] = detailed_record(rng, player, team_names, fixtures, days, season_days, captured)
+            if len(batch) >= EVENT_BATCH_PLAYERS * days:
+                data_storage.save_player_events_batch(batch)
+                batch = []
+        if batch:
+            data_storage.save_player_events_batch(batch)
+    finally:
+        if events == 'sqlite':
+            data_storage.set_database_path()
+
+    date = captured.strftime('%Y-%m-%d')
+    with open(os.path.join(output_dir, 'detailed_players.json'), 'w', encoding='utf-8') as f:
+        json.dump({'players': detailed, 'date': date, 'count': len(detailed)}, f, ensure_ascii=False, indent=2)
+    summary = {
+        player_id: {'id': player_id, 'name': record['ln'], 'teamId': record['tid'],
+                    'position': record['pos'], 'marketValue': record['mv'],
+                    'averagePoints': record.get('ap', 0), 'totalPoints': record.get('tp', 0)}
+        for player_id, record in detailed.items()
+    }
+    with open(os.path.join(output_dir, 'all_players.json'), 'w', encoding='utf-8') as f:
+        json.dump({'players': summary, 'valid_team_ids': [int(tid) for tid in team_ids], 'date': date},
+                  f, ensure_ascii=False, indent=2)
+    return {'players': len(detailed), 'teams': team_count, 'days': days, 'event_payloads': payloads}
+
+
+def generate(players=1000, days=34, seasons=1, output_dir=DEFAULT_OUTPUT_DIR, teams=None,
+             events='sqlite', seed=0, events_dir=EVENTS_DIR):
+    """Generates every season below `output_dir`.
+
+    Args:
+        players (int): Players in the league
+        days (int): Matchdays per season
+        seasons (int): Number of seasons
+        teams (int, optional): Number of teams (default: one per PLAYERS_PER_TEAM players);
+            with an odd count one team has a bye each matchday
+        events (str): 'sqlite', 'json' or 'none'
+        seed (int): Random seed; the output depends only on the arguments
+
+    Returns:
+        dict: {"season_<k>": counts} per season
+    """
+    if teams is not None and teams < 2:
+        raise ValueError(f"A league needs at least 2 teams, got {teams}")
+    rng = np.random.default_rng(seed)
+    profile = load_event_profile(events_dir)
+    team_count = teams or max(2, round(players / PLAYERS_PER_TEAM))
+    league = create_players(rng, players, team_count)
+
+    report = {}
+    for season in range(1, seasons + 1):
+        if season > 1:
+            transfer_players(rng, league, team_count)
+        season_dir = os.path.join(output_dir, f"season_{season}")
+        report[f"season_{season}"] = generate_season(rng, profile, league, team_count, days,
+                                                     season, season_dir, events)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic Kickbase data for scale testing")
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=34, help="Matchdays per season")
+    parser.add_argument("--seasons", type=int, default=1)
+    parser.add_argument("--teams", type=int, default=None,
+                        help=f"Number of teams (default: one per {PLAYERS_PER_TEAM} players)")
+    parser.add_argument("--events", choices=["sqlite", "json", "none"], default="sqlite",
+                        help="Where to put the playercenter payloads (default: events.sqlite)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default=DEFAULT_OUTPUT_DIR)
+    args = parser.parse_args()
+
+    print(f"🧪 Generating {args.players} players x {args.days} days x {args.seasons} seasons "
+          f"into {args.output} (seed {args.seed})")
+    report = generate(args.players, args.days, args.seasons, args.output, args.teams, args.events, args.seed)
+    for season, counts in report.items():
+        print(f"✅ {season}: {counts['players']} players, {counts['teams']} teams, "
+              f"{counts['days']} days, {counts['event_payloads']} event payloads")
@@ -0,0 +1,223 @@
+"""
+Request and stage metrics for the Kickbase crawlers.
+
+kickbase_client reports every HTTP attempt here: endpoint, status code (or
+exception), latency, bytes received, retries, and the time spent waiting for
+the rate limiter, split into pacing and 429 backoff. The crawlers time their
+stages (fetch, checkpoint save, final save, ...) with `stage()`. Stages may
+nest; each one reports its exclusive time, so a checkpoint save inside the
+fetch loop is not counted twice and the stages add up to at most wall time.
+
+`build_report()` turns everything into a JSON-friendly dict. `markdown_summary()`
+renders it for $GITHUB_STEP_SUMMARY. getDetailedPlayers.py writes both
+(crawl_metrics.json and crawl_metrics.md) at the end of every run:
+
+    python getDetailedPlayers.py --metrics crawl_metrics.json
+    python telemetry.py summary crawl_metrics.json >> $GITHUB_STEP_SUMMARY
+"""
+
+import argparse
+import bisect
+import contextlib
+import datetime
+import json
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+
+METRICS_FILE = 'crawl_metrics.json'
+# Upper bounds of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+SLEEP_PACING, SLEEP_BACKOFF = 'pacing', 'backoff'
+
+_ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+_lock = threading.Lock()
+_stack = threading.local()  # per thread: [seconds spent in nested stages] of each open stage
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers (None if empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def endpoint_name(method, url):
+    """'GET /v4/competitions/{id}/players/{id}': the URL path with numeric IDs folded."""
+    return f"{method.upper()} {_ID_SEGMENT.sub('/{id}', urlsplit(url).path)}"
+
+
+def _new_endpoint():
+    return {'latencies': [], 'statuses': Counter(), 'bytes': 0}
+
+
+def reset():
+    """Forgets everything recorded so far (the start time becomes now)."""
+    global _started, _endpoints, _retries, _sleep, _stages
+    with _lock:
+        _started = time.time()
+        _endpoints = defaultdict(_new_endpoint)
+        _retries = 0
+        _sleep = Counter()
+        _stages = defaultdict(lambda: {'seconds': 0.0, 'calls': 0})
+
+
+reset()
+
+
+def record_attempt(method, url, status, seconds, bytes_received=0):
+    """Records one HTTP attempt.
+
+    Args:
+        status (int or str): HTTP status code, or the exception name for network errors
+        seconds (float): Time from sending the request to having the body
+        bytes_received (int): Size of the response body
+    """
+    with _lock:
+        endpoint = _endpoints[endpoint_name(method, url)]
+        endpoint['latencies'].append(seconds)
+        endpoint['statuses'][str(status)] += 1
+        endpoint['bytes'] += bytes_received
+
+
+def record_retry():
+    global _retries
+    with _lock:
+        _retries += 1
+
+
+def record_sleep(kind, seconds):
+    """Adds time spent waiting before a request (SLEEP_PACING or SLEEP_BACKOFF)."""
+    if seconds:
+        with _lock:
+            _sleep[kind] += seconds
+
+
+@contextlib.contextmanager
+def stage(name):
+    """Adds the time spent in the `with` block to stage `name`, minus nested stages."""
+    open_stages = _stack.__dict__.setdefault('open', [])
+    open_stages.append(0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        nested = open_stages.pop()
+        if open_stages:
+            open_stages[-1] += elapsed
+        with _lock:
+            _stages[name]['seconds'] += elapsed - nested
+            _stages[name]['calls'] += 1
+
+
+def latency_histogram(latencies):
+    """Counts per bucket, keyed '<=25ms' ... '>10000ms'."""
+    counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    for seconds in latencies:
+        counts[bisect.bisect_left(LATENCY_BUCKETS_MS, seconds * 1000)] += 1
+    labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+    return dict(zip(labels, counts))
+
+
+def _latency_summary(latencies):
+    summary = {'count': len(latencies)}
+    for name, pct in (('p50_ms', 50), ('p90_ms', 90), ('p99_ms', 99), ('max_ms', 100)):
+        value = percentile(latencies, pct)
+        summary[name] = round(value * 1000, 1) if value is not None else None
+    return summary
+
+
+def build_report():
+    """Everything recorded so far, ready for json.dump."""
+    with _lock:
+        endpoints = {name: {'latencies': list(data['latencies']), 'statuses': Counter(data['statuses']),
+                            'bytes': data['bytes']} for name, data in _endpoints.items()}
+        retries, sleep = _retries, dict(_sleep)
+        stages = {name: dict(data) for name, data in _stages.items()}
+        started = _started
+
+    all_latencies = [seconds for data in endpoints.values() for seconds in data['latencies']]
+    statuses = sum((data['statuses'] for data in endpoints.values()), Counter())
+    return {
+        'started': datetime.datetime.fromtimestamp(started, datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'wall_seconds': round(time.time() - started, 3),
+        'requests': len(all_latencies),
+        'retries': retries,
+        'bytes_received': sum(data['bytes'] for data in endpoints.values()),
+        'status_counts': dict(sorted(statuses.items())),
+        'sleep_seconds': {kind: round(sleep.get(kind, 0.0), 3) for kind in (SLEEP_PACING, SLEEP_BACKOFF)},
+        'latency': _latency_summary(all_latencies),
+        'latency_histogram': latency_histogram(all_latencies),
+        'endpoints': {
+            name: {**_latency_summary(data['latencies']), 'bytes_received': data['bytes'],
+                   'status_counts': dict(sorted(data['statuses'].items())),
+                   'latency_histogram': latency_histogram(data['latencies'])}
+            for name, data in sorted(endpoints.items())
+        },
+        'stages': {name: {'seconds': round(data['seconds'], 3), 'calls': data['calls']}
+                   for name, data in stages.items()},
+    }
+
+
+def write_report(path=METRICS_FILE, markdown_path=None):
+    """Writes build_report() as JSON (and optionally its Markdown summary) and returns it."""
+    report = build_report()
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    if markdown_path:
+        with open(markdown_path, 'w', encoding='utf-8') as f:
+            f.write(markdown_summary(report))
+    return report
+
+
+def _ms(value):
+    return f"{value:.0f} ms" if value is not None else "-"
+
+
+def markdown_summary(report):
+    """GitHub-flavoured Markdown summary of a report."""
+    sleep = report['sleep_seconds']
+    latency = report['latency']
+    lines = [
+        "## 📡 Crawl Metrics",
+        "",
+        f"- **Wall time:** {report['wall_seconds']:.1f} s",
+        f"- **Requests:** {report['requests']} ({report['retries']} retries), "
+        f"{report['bytes_received'] / 1e6:.2f} MB received",
+        f"- **Status codes:** " + (", ".join(f"{status}: {count}" for status, count in report['status_counts'].items())
+                                  or "-"),
+        f"- **Latency:** p50 {_ms(latency['p50_ms'])}, p90 {_ms(latency['p90_ms'])}, "
+        f"p99 {_ms(latency['p99_ms'])}, max {_ms(latency['max_ms'])}",
+        f"- **Sleeping** (summed over workers): {sleep[SLEEP_PACING]:.1f} s rate-limit pacing, "
+        f"{sleep[SLEEP_BACKOFF]:.1f} s 429 backoff",
+    ]
+    if report['stages']:
+        lines += ["", "| Stage | Seconds | Calls |", "| --- | ---: | ---: |"]
+        lines += [f"| {name} | {data['seconds']:.2f} | {data['calls']} |" for name, data in report['stages'].items()]
+    if report['endpoints']:
+        lines += ["", "| Endpoint | Requests | p50 | p99 | MB | Status codes |",
+                  "| --- | ---: | ---: | ---: | ---: | --- |"]
+        lines += [f"| `{name}` | {data['count']} | {_ms(data['p50_ms'])} | {_ms(data['p99_ms'])} | "
+                  f"{data['bytes_received'] / 1e6:.2f} | "
+                  + ", ".join(f"{status}: {count}" for status, count in data['status_counts'].items()) + " |"
+                  for name, data in report['endpoints'].items()]
+        histogram = {label: count for label, count in report['latency_histogram'].items() if count}
+        lines += ["", "Latency histogram: " + ", ".join(f"{label}: {count}" for label, count in histogram.items())]
+    return "\n".join(lines) + "\n"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render a crawl metrics report")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    summary_parser = subparsers.add_parser("summary", help="Print the Markdown summary of a JSON report")
+    summary_parser.add_argument("path", nargs="?", default=METRICS_FILE)
+    args = parser.parse_args()
+
+    with open(args.path, 'r', encoding='utf-8') as f:
+        print(markdown_summary(json.load(f)), end="")
@@ -0,0 +1,58 @@
+import random
+
+import pandas as pd
+import pytest
+
+from pointsAnalysis import data_storage
+from pointsAnalysis.analysis import aggregate_events, events_frame_from_days
+from pointsAnalysis.mappings import EVENT_ID_TO_NAME
+
+UNKNOWN_ETI = 99_999
+
+
+def _league(seed=4, players=5, days=12):
+    rng = random.Random(seed)
+    etis = rng.sample(sorted(EVENT_ID_TO_NAME), 40) + [UNKNOWN_ETI]
+    return {str(1000 + player): {'days': {
+        str(day): {'events': [{'eti': rng.choice(etis), 'p': rng.randint(-50, 100)} for _ in range(rng.randint(0, 15))]}
+        for day in range(1, days + 1)}} for player in range(players)}
+
+
+def _naive(league, by):
+    rows = [{'player_id': player_id, 'day': int(day),
+             'event': EVENT_ID_TO_NAME.get(event['eti'], f"Unknown Event ({event['eti']})"), 'p': event['p']}
+            for player_id, all_days in league.items()
+            for day, day_data in all_days['days'].items() for event in day_data['events']]
+    grouped = pd.DataFrame(rows).groupby(list(by) + ['event'])['p'].agg(['size', 'sum'])
+    return {key: (count, points) for key, count, points in
+            zip(grouped.index, grouped['size'], grouped['sum'])}
+
+
+@pytest.mark.parametrize('by', [('player_id', 'day'), ('player_id',), ()])
+def test_aggregate_events_matches_naive_groupby(by):
+    league = _league()
+    events = pd.concat([events_frame_from_days(all_days, player_id) for player_id, all_days in league.items()],
+                       ignore_index=True)
+    result = aggregate_events(events, by=by)
+
+    expected = _naive(league, by)
+    assert {key: (count, points) for key, count, points in
+            zip(result.index, result['count'], result['points'])} == expected
+
+
+def test_aggregate_player_stats_matches_naive_sum(tmp_path):
+    league = _league(players=2, days=20)
+    data_storage.set_database_path(tmp_path / 'events.sqlite')
+    try:
+        data_storage.save_player_events_batch([(player_id, int(day), day_data)
+                                               for player_id, all_days in league.items()
+                                               for day, day_data in all_days['days'].items()])
+        for player_id, all_days in league.items():
+            stats = data_storage.aggregate_player_stats(player_id, 4, 15)
+            window = {player_id: {'days': {day: day_data for day, day_data in all_days['days'].items()
+                                           if 4 <= int(day) <= 15}}}
+            expected = {event: points for event, (_, points) in _naive(window, ()).items()}
+            assert stats.days_processed == list(range(4, 16))
+            assert stats.total_points == expected
+    finally:
+        data_storage.set_database_path()
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from benchmark import MIN_REPEAT, _noise, compare, load_baselines, save_baselines
+
+
+def _result(relative, peak_mb=1.0, repeat=MIN_REPEAT, noise=0.0):
+    return {'seconds': relative * 0.05, 'relative': relative, 'noise': noise, 'peak_mb': peak_mb, 'repeat': repeat}
+
+
+def test_compare_uses_relative_times():
+    baselines = {'stage@1x': {'relative': 1.0, 'peak_mb': 1.0, 'repeat': MIN_REPEAT}}
+    (_, _, _, time_ratio, _, regressed), = compare({'stage@1x': _result(1.5)}, baselines)
+    assert time_ratio == pytest.approx(1.5)
+    assert regressed
+
+
+def test_compare_does_not_flag_too_few_runs():
+    baselines = {'stage@1x': {'relative': 1.0, 'peak_mb': 1.0, 'repeat': MIN_REPEAT}}
+    (*_, regressed), = compare({'stage@1x': _result(3.0, peak_mb=3.0, repeat=1)}, baselines)
+    assert not regressed
+
+
+def test_compare_allows_measured_noise():
+    baselines = {'stage@1x': {'relative': 1.0, 'noise': 0.1, 'peak_mb': 1.0, 'repeat': MIN_REPEAT}}
+    (*_, regressed), = compare({'stage@1x': _result(1.5, noise=0.3)}, baselines)
+    assert not regressed
+    (*_, regressed), = compare({'stage@1x': _result(1.6, noise=0.3)}, baselines)
+    assert regressed
+    (*_, regressed), = compare({'stage@1x': _result(1.0, peak_mb=1.3, noise=0.3)}, baselines)
+    assert regressed
+
+
+def test_noise_is_relative_interquartile_range():
+    assert _noise([1.0]) == 0.0
+    assert _noise([1.0, 1.0, 1.0]) == 0.0
+    assert _noise([0.8, 0.9, 1.0, 1.1, 1.2]) == pytest.approx(0.3)
+
+
+def test_save_baselines_needs_min_repeat(tmp_path):
+    path = tmp_path / 'baselines.json'
+    with pytest.raises(ValueError):
+        save_baselines({'stage@1x': _result(1.0, repeat=MIN_REPEAT - 1)}, path)
+
+    save_baselines({'stage@1x': _result(1.0)}, path)
+    assert load_baselines(path) == {'stage@1x': {'relative': 1.0, 'noise': 0.0, 'peak_mb': 1.0,
+                                                 'repeat': MIN_REPEAT}}
+
+
+def test_absolute_only_baselines_are_ignored(tmp_path):
+    path = tmp_path / 'baselines.json'
+    path.write_text(json.dumps({'results': {'stage@1x': {'seconds': 0.1, 'peak_mb': 1.0}}}))
+    assert load_baselines(path) == {}
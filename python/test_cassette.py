@@ -0,0 +1,77 @@
+import pytest
+import requests
+
+import kickbase_client
+from cassette import MISSING_STATUS, RECORD, REPLAY, Cassette, request_key
+from rate_limiter import RateLimiter
+
+URL = 'https://api.kickbase.com/v4/competitions/1/players/7226/performance'
+
+
+def _response(status, body=b'{}', headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers.update(headers or {})
+    return response
+
+
+@pytest.fixture
+def cassette_path(tmp_path):
+    yield str(tmp_path / 'cassette.sqlite')
+    kickbase_client.use_cassette()
+
+
+def test_request_key_ignores_host_and_parameter_order():
+    assert request_key('get', 'http://localhost:8000/v4/leagues/1/ranking?b=2&a=1', {'c': 3}) == \
+        request_key('GET', 'https://api.kickbase.com/v4/leagues/1/ranking?a=1', {'c': '3', 'b': 2}) == \
+        'GET /v4/leagues/1/ranking?a=1&b=2&c=3'
+
+
+def test_record_then_replay_round_trip(cassette_path):
+    cassette = Cassette(cassette_path, RECORD)
+    assert cassette.record('GET', URL + '?x=1', {'day': 3},
+                           _response(200, '{"n": "Müller"}'.encode('utf-8'), {'Content-Type': 'application/json'}))
+    assert not cassette.record('POST', URL, None, _response(200))
+    for status in (401, 429, 503):
+        assert not cassette.record('GET', URL, {'day': status}, _response(status))
+    cassette.close()
+
+    cassette = Cassette(cassette_path, REPLAY)
+    response = cassette.replay('GET', URL, {'x': '1', 'day': '3'})
+    assert (response.status_code, response.json(), response.headers['Content-Type']) == \
+        (200, {'n': 'Müller'}, 'application/json')
+    assert cassette.replay('GET', URL, {'day': 401}).status_code == MISSING_STATUS
+    assert (cassette.hits, cassette.misses) == (1, 1)
+    assert cassette.stats()['responses'] == 1
+    cassette.close()
+
+
+def test_replaying_a_missing_cassette_fails(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        Cassette(str(tmp_path / 'missing.sqlite'), REPLAY)
+
+
+def test_client_records_the_final_response_and_replays_it_offline(monkeypatch, cassette_path):
+    monkeypatch.setattr(kickbase_client, 'kickbase_limiter', RateLimiter(rate=1000, max_rate=1000))
+    responses = iter([_response(429, headers={'Retry-After': '0'}),
+                      _response(200, b'{"it": [1]}', {'Content-Type': 'application/json'})])
+    monkeypatch.setattr(kickbase_client, '_timed_send', lambda method, url, **kwargs: next(responses))
+    kickbase_client.use_cassette(cassette_path, RECORD)
+    assert kickbase_client.get(URL, params={'day': 3}).json() == {'it': [1]}
+
+    monkeypatch.setattr(kickbase_client, '_timed_send', lambda *args, **kwargs: pytest.fail('sent while replaying'))
+    kickbase_client.use_cassette(cassette_path, REPLAY)
+    assert kickbase_client.replaying()
+    response = kickbase_client.get(URL, params={'day': 3})
+    assert (response.status_code, response.json()) == (200, {'it': [1]})
+    assert kickbase_client.get(URL, params={'day': 4}).status_code == MISSING_STATUS
+
+
+def test_client_does_not_record_rate_limited_responses(monkeypatch, cassette_path):
+    monkeypatch.setattr(kickbase_client, 'kickbase_limiter', RateLimiter(rate=1000, max_rate=1000))
+    monkeypatch.setattr(kickbase_client, '_timed_send',
+                        lambda method, url, **kwargs: _response(429, headers={'Retry-After': '0'}))
+    kickbase_client.use_cassette(cassette_path, RECORD)
+    assert kickbase_client.get(URL).status_code == 429
+    assert kickbase_client.use_cassette(cassette_path, REPLAY).keys() == []
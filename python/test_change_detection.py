@@ -0,0 +1,34 @@
+import json
+
+from change_detection import diff_hashes, load_snapshot_hashes, player_hash, snapshot_hashes
+
+PLAYER = {'i': '7226', 'fn': 'Leon', 'mv': 12_500_000, 'ts': '2026-10-10T08:00:00Z', 'mdsum': [{'day': 7}]}
+
+
+def test_player_hash_ignores_ts_and_key_order():
+    reordered = dict(reversed(list(PLAYER.items())))
+    assert player_hash({**PLAYER, 'ts': '2026-10-17T08:00:00Z'}) == player_hash(PLAYER)
+    assert player_hash({key: value for key, value in PLAYER.items() if key != 'ts'}) == player_hash(PLAYER)
+    assert player_hash(reordered) == player_hash(PLAYER)
+
+
+def test_player_hash_sees_real_changes():
+    assert player_hash({**PLAYER, 'mv': 12_600_000}) != player_hash(PLAYER)
+    assert player_hash({**PLAYER, 'mdsum': [{'day': 8}]}) != player_hash(PLAYER)
+
+
+def test_diff_hashes():
+    old = {'1': 'a', '2': 'b', '3': 'c'}
+    new = {'2': 'b', '3': 'x', '5': 'e', '4': 'd'}
+    assert diff_hashes(old, new) == {'has_changes': True, 'added': ['4', '5'], 'removed': ['1'],
+                                     'changed': ['3'], 'unchanged': 1}
+    assert diff_hashes(old, dict(old)) == {'has_changes': False, 'added': [], 'removed': [], 'changed': [],
+                                           'unchanged': 3}
+
+
+def test_load_snapshot_hashes_matches_snapshot_hashes(tmp_path):
+    players = {'7226': PLAYER, '1001': {**PLAYER, 'i': '1001', 'mv': 1}}
+    path = tmp_path / 'detailed_players.json'
+    path.write_text(json.dumps({'players': players, 'date': '2026-10-17'}), encoding='utf-8')
+    assert load_snapshot_hashes(str(path)) == snapshot_hashes(players)
+    assert load_snapshot_hashes(str(tmp_path / 'missing.json')) == {}
@@ -0,0 +1,38 @@
+from checkpoint import CheckpointJournal, run_key
+
+
+def _write_run(path, run, records):
+    journal = CheckpointJournal(path, run)
+    for record_id, data in records:
+        journal.append(record_id, data)
+    journal.close()
+
+
+def test_same_run_resumes(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    run = run_key('2026-10-17', ['1', '2'])
+    _write_run(path, run, [('1', {'mv': 1}), ('2', {'mv': 2}), ('1', {'mv': 3})])
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"id": "2", "da')  # torn last line
+
+    journal = CheckpointJournal(path, run)
+    assert journal.load() == {'1': {'mv': 3}, '2': {'mv': 2}}
+    journal.append('3', {'mv': 4})
+    journal.close()
+    assert CheckpointJournal(path, run).load() == {'1': {'mv': 3}, '2': {'mv': 2}, '3': {'mv': 4}}
+
+
+def test_other_run_is_discarded(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    for run in (run_key('2026-10-17', ['1', '2']), run_key('2026-10-10', ['1', '2', '3'])):
+        _write_run(path, run_key('2026-10-10', ['1', '2']), [('1', {'mv': 1})])
+        journal = CheckpointJournal(path, run)
+        assert journal.load() == {}
+        assert not path.exists()
+
+
+def test_journal_without_header_is_discarded(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    path.write_text('{"id": "1", "data": {"mv": 1}}\n', encoding='utf-8')
+    assert CheckpointJournal(path, run_key('2026-10-17', ['1'])).load() == {}
+    assert not path.exists()
@@ -0,0 +1,24 @@
+import pytest
+
+pa = pytest.importorskip('pyarrow')
+
+from columnar_snapshot import MDSUM_TABLE, PH_TABLE, PLAYERS_TABLE, load_table, write_snapshot
+
+
+def test_heterogeneous_rows_are_written(tmp_path):
+    players = {
+        '1': {'i': '1', 'mv': 1_000_000, 'st': 1, 'ph': [{'day': 1, 'p': 80}], 'mdsum': [{'day': 2, 't1': 4}]},
+        '2': {'i': '2', 'mv': 2.5, 'st': 'injured', 'ph': [{'day': 1, 'p': '-'}], 'opl': [3, 4]},
+        '3': {'i': '3', 'st': True, 'ph': None},
+    }
+    assert write_snapshot(players, str(tmp_path), '2026-10-18')
+
+    table = load_table(PLAYERS_TABLE, snapshot_dir=str(tmp_path))
+    columns = table.to_pydict()
+    assert columns['player_id'] == ['1', '2', '3']
+    assert table.schema.field('mv').type == pa.float64()
+    assert columns['st'] == ['1', 'injured', 'true']
+    assert columns['opl'] == [None, '[3, 4]', None]
+    assert load_table(PH_TABLE, snapshot_dir=str(tmp_path)).to_pydict()['p'] == ['80', '-']
+    assert load_table(MDSUM_TABLE, snapshot_dir=str(tmp_path)).num_rows == 1
+    assert table.schema.metadata[b'date'] == b'2026-10-18'
@@ -0,0 +1,60 @@
+import random
+import threading
+from collections import Counter
+
+import pytest
+
+from pointsAnalysis import data_storage
+
+ETIS = [2, 3, 10, 13, 18, 44]
+
+
+@pytest.fixture
+def store(tmp_path):
+    data_storage.set_database_path(tmp_path / 'events.sqlite')
+    yield
+    data_storage.set_database_path()
+
+
+def _random_days(rng, days=34):
+    return {day: [{'eti': rng.choice(ETIS), 'p': rng.randint(-40, 120)} for _ in range(rng.randint(0, 6))]
+            for day in range(1, days + 1) if rng.random() < 0.8}
+
+
+def _brute_force(days, day_start, day_end):
+    counts, points = Counter(), Counter()
+    for day, events in days.items():
+        if day_start <= day <= day_end:
+            for event in events:
+                counts[event['eti']] += 1
+                points[event['eti']] += event['p']
+    return {eti: (counts[eti], points[eti]) for eti in counts}
+
+
+def test_event_totals_range_matches_brute_force(store):
+    rng = random.Random(9)
+    players = {str(player_id): _random_days(rng) for player_id in (7226, 1001, 1002)}
+    data_storage.save_player_events_batch([(player_id, day, {'events': events})
+                                           for player_id, days in players.items() for day, events in days.items()])
+    # Replacing a stored day has to update the running totals too
+    players['7226'][5] = [{'eti': 18, 'p': 77}]
+    data_storage.save_player_events_batch([('7226', 5, {'events': players['7226'][5]})])
+
+    for _ in range(200):
+        player_id = rng.choice(list(players))
+        day_start = rng.randint(0, 36)
+        day_end = rng.randint(day_start, 36)
+        assert data_storage.event_totals_range(player_id, day_start, day_end) == \
+            _brute_force(players[player_id], day_start, day_end), (player_id, day_start, day_end)
+
+
+def test_close_reaches_every_thread(store):
+    data_storage.stored_player_days()
+    worker = threading.Thread(target=data_storage.stored_player_days)
+    worker.start()
+    worker.join()
+    assert len(data_storage._connections) == 2
+
+    data_storage.close()
+    assert data_storage._connections == []
+    assert data_storage.stored_player_days() == set()  # reconnects after close()
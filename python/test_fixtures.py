@@ -0,0 +1,36 @@
+import json
+import os
+
+from fixtures import REFERENCE_KEY, load_normalized, normalize_players, player_fixtures, write_normalized
+
+PLAYERS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'detailed_players.json')
+
+
+def _players():
+    with open(PLAYERS_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)['players']
+
+
+def test_round_trip_of_checked_in_players(tmp_path):
+    with open(PLAYERS_FILE, 'r', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    path = str(tmp_path / 'normalized.json')
+    document = write_normalized(snapshot, path)
+
+    assert sum(REFERENCE_KEY in player for player in document['players'].values()) > len(snapshot['players']) / 2
+    assert load_normalized(path) == snapshot
+    player_id = next(iter(snapshot['players']))
+    assert player_fixtures(load_normalized(path, rehydrate=False), player_id) == \
+        snapshot['players'][player_id].get('mdsum')
+
+
+def test_diverging_fixture_list_stays_inline():
+    players = _players()
+    team = [player_id for player_id, player in players.items()
+            if player.get('mdsum') and player['tid'] == players['7226']['tid']]
+    first, second = team[0], team[1]
+    players[second] = {**players[second], 'mdsum': players[second]['mdsum'][:-1]}
+
+    normalized = normalize_players(players)
+    assert REFERENCE_KEY in normalized['players'][first]
+    assert normalized['players'][second] == players[second]
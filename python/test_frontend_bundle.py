@@ -0,0 +1,72 @@
+import copy
+import json
+import os
+
+import frontend_bundle
+from fixtures import rehydrate_players
+
+PLAYERS = {
+    '1': {'i': '1', 'tid': '2', 'pos': 4, 'mv': 100, 'ts': '2026-01-05T21:00:00Z'},
+    '2': {'i': '2', 'tid': '2', 'pos': 2, 'mv': 200, 'ts': '2026-01-05T21:00:01Z'},
+    '3': {'i': '3', 'tid': '7', 'pos': 4, 'mv': 300, 'ts': '2026-01-05T21:00:02Z'},
+}
+
+
+def _files(manifest):
+    files = {f"{kind}/{key}": entry['file'] for kind, shards in manifest['shards'].items()
+             for key, entry in shards.items()}
+    files.update({f"player/{player_id}": entry['file'] for player_id, entry in manifest['players'].items()})
+    files['fixtures'] = manifest['fixtures']['file']
+    return files
+
+
+def test_new_ts_keeps_every_shard(tmp_path):
+    first = _files(frontend_bundle.write_bundle(PLAYERS, str(tmp_path), '2026-01-05'))
+    mtimes = {name: os.stat(tmp_path / name).st_mtime_ns for name in first.values()}
+
+    recrawled = copy.deepcopy(PLAYERS)
+    for player in recrawled.values():
+        player['ts'] = '2026-01-12T21:00:00Z'
+    second = _files(frontend_bundle.write_bundle(recrawled, str(tmp_path), '2026-01-12'))
+
+    assert second == first
+    assert {name: os.stat(tmp_path / name).st_mtime_ns for name in second.values()} == mtimes
+
+
+def test_changed_player_renames_only_its_shards(tmp_path):
+    first = _files(frontend_bundle.write_bundle(PLAYERS, str(tmp_path), '2026-01-05'))
+    changed = copy.deepcopy(PLAYERS)
+    changed['3']['mv'] = 350
+    second = _files(frontend_bundle.write_bundle(changed, str(tmp_path), '2026-01-12'))
+
+    assert {key for key in first if first[key] != second[key]} == {'team/7', 'position/4', 'player/3'}
+    # The old shards were pruned
+    assert not (tmp_path / first['player/3']).exists()
+    assert (tmp_path / second['player/3']).exists()
+
+
+def test_plain_bundle_prunes_precompressed_and_unreferenced_files(tmp_path):
+    frontend_bundle.write_bundle(PLAYERS, str(tmp_path), '2026-01-05', precompress=True)
+    assert (tmp_path / 'manifest.json.gz').exists()
+    (tmp_path / 'player' / '99.0123456789ab.json').write_text('{}')
+
+    manifest = frontend_bundle.write_bundle(PLAYERS, str(tmp_path), '2026-01-05')
+    files = sorted(str(path.relative_to(tmp_path)) for path in tmp_path.rglob('*') if path.is_file())
+    assert files == sorted(['manifest.json', *_files(manifest).values()])
+    assert manifest['encodings'] == []
+
+
+def test_shards_reference_fixtures_stored_once(tmp_path):
+    fixtures = [{'day': 8, 't1': '2', 't2': '7', 'mdst': 0}, {'day': 9, 't1': '7', 't2': '2', 'mdst': 0}]
+    players = copy.deepcopy(PLAYERS)
+    for player in players.values():
+        player['mdsum'] = copy.deepcopy(fixtures)
+    manifest = frontend_bundle.write_bundle(players, str(tmp_path), '2026-01-05')
+
+    team = json.loads((tmp_path / manifest['shards']['team']['2']['file']).read_text())['players']
+    assert all('mdsum' not in player and player['mdref'] == '2' for player in team.values())
+    stored = json.loads((tmp_path / manifest['fixtures']['file']).read_text())
+    assert manifest['fixtures']['matches'] == 2
+    shards = {player_id: json.loads((tmp_path / entry['file']).read_text())
+              for player_id, entry in manifest['players'].items()}
+    assert rehydrate_players({'players': shards, **stored}) == players
@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+
+import kickbase_client
+from pointsAnalysis import data_storage, getAllPlayersEvents
+from pointsAnalysis.data_storage import MATCH_FINISHED
+from pointsAnalysis.kickbase_api import MissingTokenError
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    data_storage.set_database_path(tmp_path / 'events.sqlite')
+    monkeypatch.setattr(kickbase_client, 'configure', lambda **kwargs: None)
+    yield
+    data_storage.set_database_path()
+
+
+def _stub_fetcher(monkeypatch, failing=()):
+    fetched = []
+    lock = threading.Lock()
+
+    def get_player_events(player_id, day, competition_id):
+        with lock:
+            fetched.append((player_id, day))
+        if (player_id, day) in failing:
+            return None
+        return {'mst': MATCH_FINISHED, 'events': [{'eti': 2, 'p': day}]}
+
+    monkeypatch.setattr(getAllPlayersEvents, 'get_player_events', get_player_events)
+    return fetched
+
+
+def test_finished_cells_are_skipped_and_unfinished_ones_refetched(store, monkeypatch):
+    data_storage.save_player_events_batch([
+        ('1', 1, {'mst': MATCH_FINISHED, 'events': [{'eti': 2, 'p': 50}]}),
+        ('1', 2, {'mst': 1, 'events': [{'eti': 2, 'p': 5}]}),
+        ('2', 1, {'mst': 0, 'events': []}),
+        ('2', 2, {'events': []}),
+    ])
+    fetched = _stub_fetcher(monkeypatch, failing={('2', 3)})
+
+    saved, failed, skipped = getAllPlayersEvents.fetch_league_events(['1', '2'], 1, 3, 1, concurrency=2)
+
+    assert sorted(fetched) == [('1', 2), ('1', 3), ('2', 1), ('2', 2), ('2', 3)]
+    assert (saved, failed, skipped) == (4, 1, 1)
+    assert data_storage.stored_player_days(finished_only=True) == {('1', 1), ('1', 2), ('1', 3), ('2', 1), ('2', 2)}
+    # The refetched day replaced the events stored mid-match; the finished one was left alone
+    assert data_storage.event_totals_range('1', 1, 2) == {2: (2, 52)}
+
+    fetched.clear()
+    assert getAllPlayersEvents.fetch_league_events(['1', '2'], 1, 3, 1) == (0, 1, 5)
+    assert fetched == [('2', 3)]
+
+
+def test_missing_token_stops_the_crawl(store, monkeypatch):
+    def get_player_events(player_id, day, competition_id):
+        raise MissingTokenError("no token")
+
+    monkeypatch.setattr(getAllPlayersEvents, 'get_player_events', get_player_events)
+    with pytest.raises(MissingTokenError):
+        getAllPlayersEvents.fetch_league_events(['1', '2'], 1, 5, 1)
+    assert data_storage.stored_player_days() == set()
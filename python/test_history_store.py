@@ -0,0 +1,48 @@
+import pytest
+
+from history_store import (append_snapshot, field_history, import_snapshot_file, market_value_history, players_at,
+                           snapshot_dates)
+
+
+def _players(mv):
+    return {'173': {'i': '173', 'n': 'Kane', 'mv': mv, 'tfhmvt': mv // 100, 'tp': 120, 'pos': 4, 'ph': [{'p': 7}]},
+            '7226': {'i': '7226', 'n': 'Wirtz', 'mv': mv * 2, 'tp': None, 'pos': 3, 'st': 'fit'}}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'history.sqlite')
+
+
+def test_appended_snapshots_are_read_back(db_path):
+    for date, mv in (('2026-10-10', 1_000), ('2026-10-03', 900), ('2026-10-17', 1_100)):
+        assert append_snapshot(_players(mv), date, db_path) == 2
+
+    assert snapshot_dates(db_path) == ['2026-10-03', '2026-10-10', '2026-10-17']
+    assert market_value_history('173', db_path=db_path) == [('2026-10-03', 900, 9), ('2026-10-10', 1_000, 10),
+                                                            ('2026-10-17', 1_100, 11)]
+    assert market_value_history(173, last_n=1, db_path=db_path) == [('2026-10-17', 1_100, 11)]
+    assert field_history('7226', ['mv', 'tp', 'st'], db_path) == [
+        {'snapshot_date': date, 'mv': mv * 2, 'tp': None, 'st': None}
+        for date, mv in (('2026-10-03', 900), ('2026-10-10', 1_000), ('2026-10-17', 1_100))]
+    with pytest.raises(ValueError):
+        field_history('173', ['n'], db_path)
+
+
+def test_players_at_returns_the_latest_snapshot_on_or_before_a_date(db_path):
+    append_snapshot(_players(900), '2026-10-03', db_path)
+    append_snapshot(_players(1_000), '2026-10-10', db_path)
+
+    assert players_at('2026-10-12', db_path) == ('2026-10-10', _players(1_000))
+    assert players_at('2026-10-03', db_path) == ('2026-10-03', _players(900))
+    assert players_at('2026-10-01', db_path) == (None, {})
+
+
+def test_same_date_is_replaced(db_path, tmp_path):
+    append_snapshot(_players(900), '2026-10-17', db_path)
+    path = tmp_path / 'detailed_players.json'
+    path.write_text('{"date": "2026-10-17", "players": {"173": {"mv": 950}}}', encoding='utf-8')
+    assert import_snapshot_file(str(path), db_path) == 1
+
+    assert market_value_history('173', db_path=db_path) == [('2026-10-17', 950, None)]
+    assert players_at('2026-10-17', db_path)[1]['7226'] == _players(900)['7226']
@@ -0,0 +1,11 @@
+import pytest
+
+from pointsAnalysis import kickbase_api
+
+
+def test_missing_token_raises_instead_of_using_a_stale_one(monkeypatch):
+    monkeypatch.setattr(kickbase_api, 'get_token', lambda: None)
+    monkeypatch.setattr(kickbase_api.kickbase_client, 'get',
+                        lambda *args, **kwargs: pytest.fail("no request without a token"))
+    with pytest.raises(kickbase_api.MissingTokenError):
+        kickbase_api.get_player_events('7226', 1, '1')
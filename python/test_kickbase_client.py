@@ -0,0 +1,54 @@
+import pytest
+import requests
+
+import kickbase_client
+import telemetry
+from rate_limiter import MAX_RETRIES, RateLimiter
+
+URL = 'https://api.kickbase.com/v4/competitions/1/players/7226/performance'
+
+
+def _response(status, body=b'{}', headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers.update(headers or {})
+    return response
+
+
+@pytest.fixture(autouse=True)
+def offline_client(monkeypatch):
+    monkeypatch.setattr(kickbase_client, 'kickbase_limiter', RateLimiter(rate=1000, max_rate=1000))
+    telemetry.reset()
+    yield
+    telemetry.reset()
+
+
+def _serve(monkeypatch, responses):
+    sent = []
+
+    def send(method, url, **kwargs):
+        sent.append((method, url, kwargs))
+        return responses[len(sent) - 1]
+
+    monkeypatch.setattr(kickbase_client, '_timed_send', send)
+    return sent
+
+
+def test_rate_limited_requests_are_retried(monkeypatch):
+    sent = _serve(monkeypatch, [_response(429, headers={'Retry-After': '0'}),
+                                _response(429, headers={'Retry-After': '0'}), _response(200, b'{"it": []}')])
+
+    response = kickbase_client.get(URL, params={'day': 3})
+    assert response.status_code == 200
+    assert len(sent) == 3
+    assert all(kwargs == {'params': {'day': 3}, 'timeout': kickbase_client.DEFAULT_TIMEOUT}
+               for _, _, kwargs in sent)
+    assert telemetry.build_report()['retries'] == 2
+
+
+def test_gives_up_after_max_retries(monkeypatch):
+    sent = _serve(monkeypatch, [_response(429, headers={'Retry-After': '0'})] * MAX_RETRIES)
+
+    assert kickbase_client.get(URL).status_code == 429
+    assert len(sent) == MAX_RETRIES
@@ -0,0 +1,60 @@
+import itertools
+import json
+
+import pytest
+
+import player_stream
+from player_stream import iter_players, read_player_ids, read_value
+
+DOCUMENT = {
+    'date': '2026-10-17',
+    'skipped': {'players': {'0': {'i': '0'}}, 'nested': [1, {'a': 'b'}]},
+    'players': {
+        str(100 + index): {'i': str(100 + index), 'n': f"Spieler ü{index}", 'mv': 1_000_000 + index,
+                           'tp': index * 1.5, 'ph': [{'day': day, 'p': -day} for day in range(3)], 'st': None}
+        for index in range(40)
+    },
+    'valid_team_ids': ['2', '3'],
+}
+
+
+@pytest.fixture(params=['fallback', 'ijson'])
+def backend(request, monkeypatch):
+    if request.param == 'fallback':
+        monkeypatch.setattr(player_stream, 'ijson', None)
+        # Tiny chunks put tokens, strings and numbers across chunk boundaries
+        monkeypatch.setattr(player_stream, 'CHUNK_SIZE', 7)
+    elif player_stream.ijson is None:
+        pytest.skip('ijson is not installed')
+    return request.param
+
+
+@pytest.fixture
+def players_file(tmp_path):
+    path = tmp_path / 'players.json'
+    path.write_text(json.dumps(DOCUMENT, indent=1, ensure_ascii=False), encoding='utf-8')
+    return str(path)
+
+
+def test_iter_players_matches_json_load(backend, players_file):
+    assert dict(iter_players(players_file)) == DOCUMENT['players']
+    assert dict(iter_players(players_file, fields=('mv', 'missing'))) == {
+        player_id: {'mv': player['mv']} for player_id, player in DOCUMENT['players'].items()}
+
+
+def test_read_player_ids_and_values(backend, players_file):
+    assert read_player_ids(players_file) == list(DOCUMENT['players'])
+    assert read_value(players_file, 'valid_team_ids') == ['2', '3']
+    assert read_value(players_file, 'missing', default='x') == 'x'
+
+
+def test_stopping_early(backend, players_file):
+    first = list(itertools.islice(iter_players(players_file, fields=('i',)), 2))
+    assert first == [('100', {'i': '100'}), ('101', {'i': '101'})]
+
+
+def test_invalid_json_raises_value_error(backend, tmp_path):
+    path = tmp_path / 'broken.json'
+    path.write_text('{"players": {"1": {"i": "1"}, "2": {"i": ', encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(iter_players(str(path)))
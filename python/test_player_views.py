@@ -0,0 +1,22 @@
+import player_views
+
+
+def test_mistyped_fields_are_dropped_not_fatal():
+    player = {'i': '1', 'fn': 'Max', 'ln': 'Muster', 'mv': '4000000', 'ap': 60, 'tp': None,
+              'ph': [{'hp': True, 'p': 12}, {'hp': 'yes', 'p': 3}, 'broken'], 'mdsum': {'day': 1}}
+    dropped = []
+    market = player_views.project_player(player, 'market', dropped)
+    assert market == {'i': '1', 'fn': 'Max', 'ln': 'Muster', 'ap': 60, 'tp': None}
+    assert dropped == ['market:1.mv']
+
+    card = player_views.project_player(player, 'card', dropped)
+    assert card['ph'] == [{'hp': True, 'p': 12}, {'p': 3}]
+    assert player_views.project_player(player, 'fixtures', dropped) == {'i': '1'}
+    assert dropped[1:] == ['card:1.mv', 'card:1.ph[].hp', 'card:1.ph[]', 'fixtures:1.mdsum']
+
+
+def test_write_views_reports_dropped_fields(tmp_path):
+    players = {'1': {'i': '1', 'mv': 'n/a'}, '2': {'i': '2', 'mv': 5}}
+    report = player_views.write_views(players, str(tmp_path), date='2026-01-01', views=['market'])
+    assert report['market']['dropped_fields'] == 1
+    assert (tmp_path / 'market.json').exists()
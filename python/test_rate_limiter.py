@@ -0,0 +1,63 @@
+import email.utils
+import time
+
+import pytest
+
+from rate_limiter import RateLimiter, parse_retry_after
+
+
+@pytest.mark.parametrize('value, expected', [('120', 120.0), (' 1.5 ', 1.5), ('-3', 0.0), ('', None), (None, None),
+                                             ('soon', None)])
+def test_parse_retry_after_seconds(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    value = email.utils.formatdate(time.time() + 90, usegmt=True)
+    assert 85 <= parse_retry_after(value) <= 90
+    assert parse_retry_after(email.utils.formatdate(time.time() - 90, usegmt=True)) == 0.0
+
+
+def test_retry_after_is_not_capped():
+    limiter = RateLimiter(max_backoff=60)
+    assert limiter.on_rate_limited(retry_after=300) >= 300
+
+
+def test_computed_backoff_is_capped():
+    limiter = RateLimiter(base_backoff=50, max_backoff=60)
+    limiter.on_rate_limited()
+    limiter._blocked_until = 0.0  # the next 429 is a new burst
+    assert limiter.on_rate_limited() <= 60 * 1.25
+
+
+def test_isolated_limits_trim_the_rate_and_consecutive_ones_cut_deeper():
+    limiter = RateLimiter(rate=10, decrease=0.75, min_rate=0.1)
+    limiter.on_rate_limited(retry_after=0)
+    assert limiter.rate == pytest.approx(7.5)
+    limiter.on_success()
+    limiter.on_rate_limited(retry_after=0)
+    assert limiter.rate == pytest.approx(7.5 * 0.75)
+
+    limiter._blocked_until = 0.0
+    limiter.on_rate_limited(retry_after=0)
+    assert limiter.rate == pytest.approx(7.5 * 0.75 ** 3)
+
+
+def test_workers_reporting_the_same_burst_lower_the_rate_once():
+    limiter = RateLimiter(rate=10, decrease=0.75)
+    first = limiter.on_rate_limited(retry_after=5)
+    for _ in range(7):
+        assert 0 < limiter.on_rate_limited(retry_after=5) <= first
+    assert limiter.rate == pytest.approx(7.5)
+
+
+def test_healthy_window_raises_the_rate_up_to_the_cap():
+    limiter = RateLimiter(rate=5, max_rate=6, increase=1.0, healthy_window=10)
+    for _ in range(9):
+        limiter.on_success()
+    assert limiter.rate == 5
+    limiter.on_success()
+    assert limiter.rate == 6
+    for _ in range(20):
+        limiter.on_success()
+    assert limiter.rate == 6
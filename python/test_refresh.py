@@ -0,0 +1,43 @@
+import datetime
+
+from refresh import (REASON_DAY_BEHIND, REASON_NEW, REASON_NO_TIMESTAMP, REASON_OUTDATED, REASON_PRIORITY,
+                     plan_refresh)
+
+NOW = datetime.datetime(2026, 10, 17, 12, tzinfo=datetime.timezone.utc)
+
+
+def _ts(hours_ago):
+    return (NOW - datetime.timedelta(hours=hours_ago)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+BASELINE = {
+    'fresh': {'day': 8, 'ts': _ts(1), 'mv': 1_000_000},
+    'behind': {'day': 7, 'ts': _ts(1), 'mv': 1_000_000},
+    'no_ts': {'day': 8, 'mv': 1_000_000},
+    'old_slow': {'day': 8, 'ts': _ts(200), 'mv': 10_000_000, 'tfhmvt': 10_000},
+    'old_fast': {'day': 8, 'ts': _ts(100), 'mv': 1_000_000, 'tfhmvt': -100_000},
+    'older_slow': {'day': 8, 'ts': _ts(300), 'mv': 10_000_000, 'tfhmvt': 10_000},
+    'priority_fresh': {'day': 8, 'ts': _ts(1), 'mv': 1_000_000},
+}
+PLAYER_IDS = ['fresh', 'old_slow', 'older_slow', 'old_fast', 'no_ts', 'behind', 'new', 'priority_fresh']
+
+
+def test_plan_refresh_orders_by_reason_then_volatility_then_age():
+    to_fetch, deferred, reasons = plan_refresh(PLAYER_IDS, BASELINE, priority_ids=['priority_fresh'], now=NOW)
+
+    assert to_fetch == ['priority_fresh', 'new', 'behind', 'no_ts', 'old_fast', 'older_slow', 'old_slow']
+    assert deferred == []
+    assert reasons == {'priority_fresh': REASON_PRIORITY, 'new': REASON_NEW, 'behind': REASON_DAY_BEHIND,
+                       'no_ts': REASON_NO_TIMESTAMP, 'old_fast': REASON_OUTDATED,
+                       'older_slow': REASON_OUTDATED, 'old_slow': REASON_OUTDATED}
+
+
+def test_plan_refresh_defers_beyond_max_players():
+    to_fetch, deferred, _ = plan_refresh(PLAYER_IDS, BASELINE, max_players=3, now=NOW)
+    assert to_fetch == ['new', 'behind', 'no_ts']
+    assert deferred == ['old_fast', 'older_slow', 'old_slow']
+
+
+def test_plan_refresh_respects_max_age():
+    to_fetch, _, _ = plan_refresh(['fresh', 'old_fast', 'old_slow'], BASELINE, max_age_hours=150, now=NOW)
+    assert to_fetch == ['old_slow']
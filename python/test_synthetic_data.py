@@ -0,0 +1,72 @@
+import json
+from collections import Counter
+
+import pytest
+
+import synthetic_data
+
+
+@pytest.mark.parametrize('team_count', [3, 9])
+def test_round_robin_odd_team_count_gives_one_bye_per_day(team_count):
+    team_ids = [str(team) for team in range(1, team_count + 1)]
+    schedule = synthetic_data.round_robin(team_ids, 2 * team_count)
+    for pairs in schedule:
+        playing = [team for pair in pairs for team in pair]
+        assert len(playing) == len(set(playing)) == team_count - 1
+    # Double round robin: every pairing once each way
+    assert Counter(schedule_pair for pairs in schedule for schedule_pair in pairs) == Counter(
+        (home, away) for home in team_ids for away in team_ids if home != away)
+
+
+@pytest.mark.parametrize('players, teams', [(75, None), (90, 9)])
+def test_generate_with_odd_team_count(tmp_path, players, teams):
+    days = 6
+    report = synthetic_data.generate(players=players, days=days, output_dir=str(tmp_path), teams=teams,
+                                     events='json', seed=1)
+    team_count = report['season_1']['teams']
+    assert team_count % 2 == 1
+
+    team_ids = [str(team) for team in range(1, team_count + 1)]
+    byes = {day: (set(team_ids) - {team for pair in pairs for team in pair}).pop()
+            for day, pairs in enumerate(synthetic_data.round_robin(team_ids, days), start=1)}
+    with open(tmp_path / 'season_1' / 'detailed_players.json', 'r', encoding='utf-8') as f:
+        detailed = json.load(f)['players']
+    events_dir = tmp_path / 'season_1' / 'events'
+    for player_id, record in detailed.items():
+        bye_days = {day for day, team in byes.items() if team == record['tid']}
+        written = {int(path.stem[len('day_'):]) for path in (events_dir / f"player_{player_id}").glob('day_*.json')}
+        assert written == set(range(1, days + 1)) - bye_days
+        assert all(record['tid'] in (fixture['t1'], fixture['t2']) for fixture in record['mdsum'])
+        assert {fixture['day'] for fixture in record['mdsum']}.isdisjoint(bye_days)
+    assert report['season_1']['event_payloads'] == sum(
+        days - sum(team == record['tid'] for team in byes.values()) for record in detailed.values())
+
+
+def test_generated_values_have_the_real_shapes(tmp_path):
+    synthetic_data.generate(players=40, days=4, output_dir=str(tmp_path), events='json', seed=2)
+    season_dir = tmp_path / 'season_1'
+    with open(season_dir / 'detailed_players.json', 'r', encoding='utf-8') as f:
+        detailed = json.load(f)['players']
+    with open(season_dir / 'all_players.json', 'r', encoding='utf-8') as f:
+        summary = json.load(f)['players']
+    assert {player_id: player['totalPoints'] for player_id, player in summary.items()} == \
+        {player_id: record.get('tp', 0) for player_id, record in detailed.items()}
+    assert any(player['totalPoints'] for player in summary.values())
+
+    observed = synthetic_data.load_event_profile()['highlights']
+    highlights = []
+    for path in (season_dir / 'events').glob('player_*/day_*.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        assert isinstance(payload['k'], list) and all(isinstance(value, int) for value in payload['k'])
+        if payload['st'] == synthetic_data.STATUS_NOT_PLAYED:
+            assert payload['k'] == []
+        else:
+            assert payload['k'] in observed
+        highlights.extend(payload['k'])
+    assert highlights
+
+
+def test_generate_rejects_single_team(tmp_path):
+    with pytest.raises(ValueError):
+        synthetic_data.generate(players=10, days=2, output_dir=str(tmp_path), teams=1, events='none')
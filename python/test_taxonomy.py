@@ -0,0 +1,53 @@
+import glob
+import json
+import os
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from pointsAnalysis.mappings import EVENT_ID_TO_NAME
+from pointsAnalysis.taxonomy import (CATEGORY_IS_NEGATIVE, CATEGORY_NAMES, UNKNOWN_CATEGORY, categorize,
+                                     points_by_category)
+
+EVENTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pointsAnalysis', 'data', 'player_7226')
+
+
+def _scored_events():
+    events = []
+    for path in sorted(glob.glob(os.path.join(EVENTS_DIR, 'day_*.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            events.extend(event for event in json.load(f).get('events') or [] if event.get('p'))
+    return events
+
+
+def test_negative_flags_match_observed_points():
+    signs = defaultdict(Counter)
+    for event in _scored_events():
+        signs[int(categorize([event['eti']])[0])][event['p'] > 0] += 1
+    assert signs, "no scored events in the sample"
+
+    mismatches = {CATEGORY_NAMES[category]: dict(counts) for category, counts in signs.items()
+                  if category != UNKNOWN_CATEGORY
+                  and CATEGORY_IS_NEGATIVE[category] != (counts[False] > counts[True])}
+    assert not mismatches
+
+
+def test_every_mapped_code_has_a_category():
+    codes = np.array(sorted(EVENT_ID_TO_NAME))
+    categories = categorize(codes)
+    assert (categories != UNKNOWN_CATEGORY).all()
+    assert [CATEGORY_NAMES[category] for category in categories] == [EVENT_ID_TO_NAME[eti] for eti in codes]
+    assert categorize([max(EVENT_ID_TO_NAME) + 1, min(EVENT_ID_TO_NAME) - 1]).tolist() == [UNKNOWN_CATEGORY] * 2
+
+
+def test_points_by_category_matches_plain_sums():
+    events = _scored_events()
+    counts, sums = points_by_category([event['eti'] for event in events], [event['p'] for event in events])
+    expected_counts, expected_sums = Counter(), Counter()
+    for event in events:
+        name = EVENT_ID_TO_NAME.get(event['eti'], CATEGORY_NAMES[UNKNOWN_CATEGORY])
+        expected_counts[name] += 1
+        expected_sums[name] += event['p']
+    for category, name in enumerate(CATEGORY_NAMES):
+        assert counts[category] == expected_counts[name]
+        assert sums[category] == expected_sums[name]
@@ -0,0 +1,47 @@
+import threading
+import time
+
+import pytest
+
+import telemetry
+
+
+@pytest.fixture(autouse=True)
+def fresh_telemetry():
+    telemetry.reset()
+    yield
+    telemetry.reset()
+
+
+def test_nested_stages_report_exclusive_time():
+    with telemetry.stage('fetch'):
+        time.sleep(0.05)
+        for _ in range(2):
+            with telemetry.stage('checkpoint_save'):
+                time.sleep(0.05)
+    stages = telemetry.build_report()['stages']
+    assert stages['checkpoint_save']['calls'] == 2
+    assert stages['checkpoint_save']['seconds'] == pytest.approx(0.1, abs=0.04)
+    assert stages['fetch']['seconds'] == pytest.approx(0.05, abs=0.04)
+
+
+def test_stages_on_other_threads_do_not_nest():
+    def worker():
+        with telemetry.stage('worker'):
+            time.sleep(0.05)
+
+    with telemetry.stage('main'):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+    stages = telemetry.build_report()['stages']
+    assert stages['main']['seconds'] >= 0.04
+    assert stages['worker']['seconds'] >= 0.04
+
+
+def test_percentile_and_endpoint_names():
+    assert telemetry.percentile([], 50) is None
+    assert telemetry.percentile([3, 1, 2, 4], 50) == 2
+    assert telemetry.percentile([3, 1, 2, 4], 100) == 4
+    assert telemetry.endpoint_name('get', 'https://x/v4/competitions/1/players/173?leagueId=5') == \
+        'GET /v4/competitions/{id}/players/{id}'
@@ -0,0 +1,78 @@
+import json
+import os
+import stat
+import time
+
+import pytest
+
+import kickbase_client
+import token_cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(token_cache, 'TOKEN_CACHE_FILE', str(tmp_path / 'token.json'))
+    monkeypatch.setattr(token_cache, '_current', None)
+    monkeypatch.delenv('BEARER_TOKEN', raising=False)
+    logins = []
+
+    def login_with_expiry():
+        logins.append(time.time())
+        return f"login-{len(logins)}", time.time() + 3600
+
+    monkeypatch.setattr(token_cache, 'login_with_expiry', login_with_expiry)
+    return logins
+
+
+def _write_cache(token, expires_at):
+    with open(token_cache.TOKEN_CACHE_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'token': token, 'expires_at': expires_at}, f)
+
+
+def test_login_writes_an_owner_only_cache_file(isolated_cache):
+    assert token_cache.get_token() == 'login-1'
+    assert stat.S_IMODE(os.stat(token_cache.TOKEN_CACHE_FILE).st_mode) == 0o600
+    with open(token_cache.TOKEN_CACHE_FILE, 'r', encoding='utf-8') as f:
+        assert json.load(f)['token'] == 'login-1'
+
+    assert token_cache.get_token() == 'login-1'
+    assert len(isolated_cache) == 1
+
+
+def test_lookup_order_is_memory_environment_file_login(monkeypatch, isolated_cache):
+    _write_cache('cached', time.time() + 3600)
+    monkeypatch.setenv('BEARER_TOKEN', 'from-env')
+    monkeypatch.setattr(token_cache, '_current', {'token': 'in-memory', 'expires_at': time.time() + 3600})
+    assert token_cache.get_token() == 'in-memory'
+
+    monkeypatch.setattr(token_cache, '_current', None)
+    assert token_cache.get_token() == 'from-env'
+
+    monkeypatch.setattr(token_cache, '_current', None)
+    monkeypatch.delenv('BEARER_TOKEN')
+    assert token_cache.get_token() == 'cached'
+
+    monkeypatch.setattr(token_cache, '_current', None)
+    _write_cache('cached', time.time() + token_cache.REFRESH_MARGIN - 1)
+    assert token_cache.get_token() == 'login-1'
+    assert len(isolated_cache) == 1
+
+
+def test_unreadable_cache_falls_back_to_login(isolated_cache):
+    with open(token_cache.TOKEN_CACHE_FILE, 'w', encoding='utf-8') as f:
+        f.write('{"token": ')
+    assert token_cache.get_token() == 'login-1'
+
+
+def test_refresh_logs_in_once_for_the_same_rejected_token(isolated_cache):
+    rejected = token_cache.get_token()
+    assert token_cache.refresh_token(rejected) == 'login-2'
+    assert token_cache.refresh_token(rejected) == 'login-2'
+    assert len(isolated_cache) == 2
+
+
+def test_replay_needs_no_credentials(monkeypatch, isolated_cache):
+    monkeypatch.setattr(kickbase_client, 'replaying', lambda: True)
+    assert token_cache.get_token() == token_cache.REPLAY_TOKEN
+    assert not isolated_cache
+    assert not os.path.exists(token_cache.TOKEN_CACHE_FILE)
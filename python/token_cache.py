@@ -0,0 +1,140 @@
+"""
+Bearer token cache for the Kickbase API.
+
+Persists the token together with its expiry so a new process can reuse it
+instead of logging in again, refreshes it shortly before it expires, and
+lets long crawls swap in a fresh token when a request comes back 401.
+"""
+
+import base64
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+
+import kickbase_client
+from login import login_with_expiry
+
+TOKEN_CACHE_FILE = os.getenv(
+    'KICKBASE_TOKEN_CACHE', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.kickbase_token.json'))
+REFRESH_MARGIN = 10 * 60  # seconds before expiry at which a token counts as expired
+REPLAY_TOKEN = 'replay'  # sent while replaying a cassette, which needs no credentials
+
+_lock = threading.Lock()
+_current = None  # {"token": str, "expires_at": float or None}
+
+
+def _parse_expiry(value):
+    """Converts a 'tknex' value (ISO 8601 string or epoch seconds) to epoch seconds."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+def _jwt_expiry(token):
+    """Reads the 'exp' claim of a JWT without verifying it."""
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))['exp'])
+    except (IndexError, KeyError, ValueError, TypeError):
+        return None
+
+
+def _entry(token, expiry=None):
+    return {"token": token, "expires_at": _parse_expiry(expiry) or _jwt_expiry(token)}
+
+
+def _is_fresh(entry):
+    if not entry or not entry.get('token'):
+        return False
+    expires_at = entry.get('expires_at')
+    # Tokens without a known expiry are used until the API rejects them
+    return expires_at is None or expires_at - REFRESH_MARGIN > time.time()
+
+
+def _load_cache():
+    if not os.path.exists(TOKEN_CACHE_FILE):
+        return None
+    try:
+        with open(TOKEN_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError) as e:
+        logging.warning(f"Ignoring unreadable token cache {TOKEN_CACHE_FILE}: {e}")
+        return None
+
+
+def _save_cache(entry):
+    try:
+        # Owner-only permissions, the file holds a live credential
+        fd = os.open(TOKEN_CACHE_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+    except OSError as e:
+        logging.warning(f"Could not write token cache {TOKEN_CACHE_FILE}: {e}")
+
+
+def _login_locked():
+    global _current
+    token, expiry = login_with_expiry()
+    if not token:
+        return None
+    _current = _entry(token, expiry)
+    _save_cache(_current)
+    return token
+
+
+def get_token():
+    """Returns a valid bearer token, logging in only when no fresh one is available.
+
+    Checked in order: the token already in use by this process, BEARER_TOKEN
+    from the environment, the on-disk cache, and finally a new login.
+    While a cassette is replayed no credentials are needed and a
+    placeholder is returned.
+
+    Returns:
+        str: Bearer token, or None if no token could be obtained
+    """
+    global _current
+    if kickbase_client.replaying():
+        return REPLAY_TOKEN
+    with _lock:
+        if _is_fresh(_current):
+            return _current['token']
+
+        candidates = []
+        if os.getenv('BEARER_TOKEN'):
+            candidates.append(_entry(os.getenv('BEARER_TOKEN')))
+        candidates.append(_load_cache())
+        for candidate in candidates:
+            if _is_fresh(candidate):
+                _current = candidate
+                return _current['token']
+
+        return _login_locked()
+
+
+def refresh_token(rejected_token):
+    """Replaces a token the API rejected (401) and returns the new one.
+
+    When several threads hit a 401 at once only the first logs in again;
+    the others receive the token it obtained.
+
+    Args:
+        rejected_token (str): The token that was sent with the failed request
+
+    Returns:
+        str: New bearer token, or None if the login failed
+    """
+    with _lock:
+        if _current and _current['token'] != rejected_token and _is_fresh(_current):
+            return _current['token']
+        logging.info("Bearer token rejected, logging in again")
+        return _login_locked()